@@ -2,10 +2,15 @@
 # SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
 
 import argparse
+import os
 import sys
 
 from beman_tidy.lib.utils.git import get_repo_info, load_beman_standard_config
-from beman_tidy.lib.pipeline import run_checks_pipeline
+from beman_tidy.lib.pipeline import PIPELINE_ARG_DEFAULTS, run_checks_pipeline
+from beman_tidy.lib.batch import find_repositories, run_batch
+from beman_tidy.lib.watch import run_watch
+from beman_tidy.lib.server import get_default_socket_path, send_request, serve
+from beman_tidy.lib.utils.profile import enable_tracer, get_tracer
 
 
 def parse_args():
@@ -14,46 +19,251 @@ def parse_args():
     """
 
     parser = argparse.ArgumentParser()
-    parser.add_argument("repo_path", help="path to the repository to check", type=str)
+    parser.add_argument(
+        "repo_paths",
+        help="path(s) to the repository(ies) to check",
+        type=str,
+        nargs="*",
+    )
+    parser.add_argument(
+        "--repos-dir",
+        help="directory of repository checkouts to check in batch mode (e.g., all Beman libraries)",
+        type=str,
+        default=None,
+    )
     parser.add_argument(
         "--fix-inplace",
         help="Try to automatically fix found issues",
         action=argparse.BooleanOptionalAction,
-        default=False,
+        default=PIPELINE_ARG_DEFAULTS["fix_inplace"],
+    )
+    parser.add_argument(
+        "--fix-dry-run",
+        help="try to automatically fix found issues, but print the fixes as a unified diff instead of writing them",
+        action=argparse.BooleanOptionalAction,
+        default=PIPELINE_ARG_DEFAULTS["fix_dry_run"],
     )
     parser.add_argument(
         "--verbose",
         help="print verbose output for each check",
         action=argparse.BooleanOptionalAction,
-        default=False,
+        default=PIPELINE_ARG_DEFAULTS["verbose"],
     )
     parser.add_argument(
         "--require-all",
         help="all checks are required regardless of their type (e.g., all RECOMMENDATIONs become REQUIREMENTs)",
         action=argparse.BooleanOptionalAction,
-        default=False,
+        default=PIPELINE_ARG_DEFAULTS["require_all"],
     )
     parser.add_argument(
         "--checks", help="array of checks to run", type=str, default=None
     )
+    parser.add_argument(
+        "--fail-fast",
+        help="run the cheapest checks first and stop as soon as a requirement fails (any check with --require-all), with a partial summary (e.g., for CI gating)",
+        action=argparse.BooleanOptionalAction,
+        default=PIPELINE_ARG_DEFAULTS["fail_fast"],
+    )
+    parser.add_argument(
+        "--output",
+        help="output format: colored text, or one JSON record per check as soon as it finishes, then a summary record (default: text)",
+        choices=["text", "ndjson"],
+        default=PIPELINE_ARG_DEFAULTS["output"],
+    )
+    parser.add_argument(
+        "--since",
+        help="only run the checks affected by the changes between the given git revision and the working tree (e.g., origin/main)",
+        type=str,
+        default=PIPELINE_ARG_DEFAULTS["since"],
+    )
+    parser.add_argument(
+        "--rev",
+        help="check the tree of the given commit (e.g., a release tag), read from the git object database instead of the working tree - also works on bare repositories (e.g., mirrors)",
+        type=str,
+        default=PIPELINE_ARG_DEFAULTS["rev"],
+    )
+    parser.add_argument(
+        "--watch",
+        help="keep running and re-run the checks affected by each filesystem change",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+    )
+    parser.add_argument(
+        "--connect",
+        help="send the request to a running daemon (see: beman-tidy serve) listening on the given socket",
+        type=str,
+        nargs="?",
+        const=str(get_default_socket_path()),
+        default=None,
+        metavar="SOCKET",
+    )
+    parser.add_argument(
+        "--cache",
+        help="reuse the results of previous runs for checks whose inputs did not change - files are compared by stat signature (mtime, size), not by content (default: false)",
+        action=argparse.BooleanOptionalAction,
+        default=PIPELINE_ARG_DEFAULTS["cache"],
+    )
+    parser.add_argument(
+        "--tracked-files",
+        help="only check the files git tracks or would track - i.e., skip .git, ignored build trees and dependency checkouts (default: true)",
+        action=argparse.BooleanOptionalAction,
+        default=PIPELINE_ARG_DEFAULTS["tracked_files"],
+    )
+    parser.add_argument(
+        "--profile",
+        help="print the cost of each check after the summary: wall / CPU time per phase, files stat'd / opened, bytes read, directories walked and git subprocesses",
+        action=argparse.BooleanOptionalAction,
+        default=PIPELINE_ARG_DEFAULTS["profile"],
+    )
+    parser.add_argument(
+        "--memory-profile",
+        help="print the peak and retained memory of each check after the summary, with the top allocation sites (checks run serially)",
+        action=argparse.BooleanOptionalAction,
+        default=PIPELINE_ARG_DEFAULTS["memory_profile"],
+    )
+    parser.add_argument(
+        "--trace",
+        help="write a timeline of the run (config loading, git calls, filesystem walks, check phases) to the given file, in the Chrome trace event format (e.g., for https://ui.perfetto.dev or chrome://tracing)",
+        type=str,
+        default=None,
+        metavar="TRACE_FILE",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        help="number of checks (or repositories, in batch mode) to run in parallel (default: 1)",
+        type=int,
+        default=PIPELINE_ARG_DEFAULTS["jobs"],
+    )
     args = parser.parse_args()
 
-    args.repo_info = get_repo_info(args.repo_path)
+    if args.repos_dir is not None:
+        args.repo_paths.extend(
+            str(path)
+            for path in find_repositories(args.repos_dir, bare=args.rev is not None)
+        )
+    if len(args.repo_paths) == 0:
+        parser.error("at least one repository path (or --repos-dir) is required")
+
+    # Batch mode: multiple repositories are checked in the same beman-tidy process.
+    args.batch = args.repos_dir is not None or len(args.repo_paths) > 1
+    if args.fix_inplace and args.fix_dry_run:
+        parser.error("--fix-inplace cannot be used with --fix-dry-run")
+    if args.watch and (
+        args.batch or args.fix_inplace or args.fix_dry_run or args.since
+    ):
+        parser.error(
+            "--watch cannot be used with multiple repositories, --fix-inplace, --fix-dry-run or --since"
+        )
+    if args.rev is not None and (
+        args.fix_inplace or args.fix_dry_run or args.watch or args.since or args.connect
+    ):
+        parser.error(
+            "--rev cannot be used with --fix-inplace, --fix-dry-run, --watch, --since or --connect"
+        )
+    if args.connect and (
+        args.batch or args.watch or args.since or not args.tracked_files
+    ):
+        parser.error(
+            "--connect cannot be used with multiple repositories, --watch, --since or --no-tracked-files"
+        )
+    if args.trace and (args.connect or (args.batch and args.jobs > 1)):
+        parser.error(
+            "--trace cannot be used with --connect or with parallel batch mode"
+        )
+    if args.trace:
+        # Start tracing before the repository is inspected.
+        enable_tracer()
+    if args.connect:
+        # The daemon gets the repository info itself.
+        args.repo_path = os.path.abspath(args.repo_paths[0])
+    elif not args.batch:
+        args.repo_path = args.repo_paths[0]
+        args.repo_info = get_repo_info(args.repo_path, args.rev)
     args.checks = args.checks.split(",") if args.checks else None
 
     return args
 
 
+def parse_serve_args(argv):
+    """
+    Parse the CLI arguments of "beman-tidy serve".
+    """
+
+    parser = argparse.ArgumentParser(
+        prog="beman-tidy serve",
+        description="run beman-tidy as a daemon, which keeps the repositories state warm between requests",
+    )
+    parser.add_argument(
+        "--socket",
+        help=f"path of the Unix domain socket to listen on (default: {get_default_socket_path()})",
+        type=str,
+        default=None,
+    )
+    return parser.parse_args(argv)
+
+
+def run_client(args):
+    """
+    Send the lint request to the daemon, print its output and return its exit status.
+    """
+    try:
+        response = send_request(
+            args.connect,
+            {
+                "command": "lint",
+                "repo_path": args.repo_path,
+                "checks": args.checks,
+                "fix_inplace": args.fix_inplace,
+                "fix_dry_run": args.fix_dry_run,
+                "verbose": args.verbose,
+                "require_all": args.require_all,
+                "output": args.output,
+                "fail_fast": args.fail_fast,
+            },
+        )
+    except OSError as e:
+        print(f"Cannot connect to the beman-tidy daemon at '{args.connect}': {e}")
+        return 1
+
+    if response["status"] != "ok":
+        print(response["error"])
+        return 1
+    print(response["output"], end="")
+    return response["exit_status"]
+
+
 def main():
     """
     The beman-tidy main entry point.
     """
+    if sys.argv[1:2] == ["serve"]:
+        serve_args = parse_serve_args(sys.argv[2:])
+        sys.exit(serve(serve_args.socket))
+
     args = parse_args()
+    if args.connect:
+        sys.exit(run_client(args))
 
+    try:
+        exit_status = run(args)
+    finally:
+        tracer = get_tracer()
+        if tracer is not None:
+            tracer.write(args.trace)
+    sys.exit(exit_status)
+
+
+def run(args):
+    """
+    Run beman-tidy for the parsed CLI arguments: single repository, batch or watch mode.
+
+    @return: The exit status.
+    """
     beman_standard_check_config = load_beman_standard_config()
     if not beman_standard_check_config or len(beman_standard_check_config) == 0:
         print("Failed to download the beman standard. STOP.")
-        return
+        return 0
 
     checks_to_run = (
         [check for check in beman_standard_check_config]
@@ -61,10 +271,15 @@ def main():
         else args.checks
     )
 
-    failed_checks = run_checks_pipeline(
-        checks_to_run, args, beman_standard_check_config
-    )
-    sys.exit(failed_checks)
+    if args.batch:
+        return run_batch(
+            args.repo_paths, checks_to_run, args, beman_standard_check_config
+        )
+
+    if args.watch:
+        return run_watch(checks_to_run, args, beman_standard_check_config)
+
+    return run_checks_pipeline(checks_to_run, args, beman_standard_check_config)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+from pathlib import Path
+
+from .pipeline import run_checks_pipeline, calculate_coverage_color
+from .utils.cache import clear_file_content_cache
+from .utils.filesystem import clear_repository_snapshots
+from .utils.git import get_repo_info, is_bare_repository
+from .utils.string import no_color
+
+
+def find_repositories(repos_dir, bare=False):
+    """
+    Find all the repository checkouts (direct subdirectories with a .git entry) in repos_dir.
+    If bare is True, bare repositories (e.g., mirrors, for --rev) are found too.
+    """
+    return sorted(
+        path
+        for path in Path(repos_dir).iterdir()
+        if path.is_dir()
+        and ((path / ".git").exists() or (bare and is_bare_repository(path)))
+    )
+
+
+def lint_repository(
+    repo_path, checks_to_run, args, beman_standard_check_config, stream=False
+):
+    """
+    Run the checks pipeline for a single repository from a batch.
+    The output is captured, so repositories linted in parallel do not interleave.
+    If stream is True (serial batch with --output ndjson), the pipeline output is written directly instead.
+
+    @return: A dictionary with the repository path, exit status, output and summary.
+    """
+    summary = {}
+    output = io.StringIO()
+    stdout = sys.stdout
+    with contextlib.redirect_stdout(output):
+        try:
+            repo_args = argparse.Namespace(**vars(args))
+            repo_args.repo_path = str(repo_path)
+            repo_args.repo_info = get_repo_info(repo_path, args.rev)
+            try:
+                with contextlib.redirect_stdout(stdout if stream else output):
+                    exit_status = run_checks_pipeline(
+                        checks_to_run, repo_args, beman_standard_check_config, summary
+                    )
+            finally:
+                # Runs only drop the state of their own repository: do not keep every snapshot of the batch.
+                clear_repository_snapshots(repo_args.repo_info["top_level"])
+                clear_file_content_cache(repo_args.repo_info["top_level"])
+        except SystemExit as e:
+            # e.g., get_repo_info() stops on invalid repositories.
+            exit_status = e.code if isinstance(e.code, int) else 1
+        except Exception as e:
+            print(f"An error occurred while linting {repo_path}: {e}")
+            exit_status = 1
+
+    return {
+        "repo_path": str(repo_path),
+        "name": Path(repo_path).name,
+        "exit_status": exit_status,
+        "output": output.getvalue(),
+        "summary": summary,
+    }
+
+
+def run_batch(repo_paths, checks_to_run, args, beman_standard_check_config):
+    """
+    Run the checks pipeline for many repositories in one beman-tidy process.
+    The Beman Standard config is parsed once (by the caller) and shared with all workers.
+    Up to args.jobs repositories are linted in parallel, on a process pool.
+
+    Each repository gets its own output, summary and exit status,
+    followed by one aggregate compliance table.
+
+    @return: The number of repositories with failed checks.
+    """
+    # Checks inside a repository run serially - the parallelism is across repositories.
+    repo_args = argparse.Namespace(**vars(args))
+    repo_args.jobs = 1
+    ndjson = args.output == "ndjson"
+
+    if args.jobs <= 1:
+        # With --output ndjson, the records are streamed: no output is kept in memory.
+        results = [
+            lint_repository(
+                repo_path,
+                checks_to_run,
+                repo_args,
+                beman_standard_check_config,
+                stream=ndjson,
+            )
+            for repo_path in repo_paths
+        ]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+            futures = [
+                executor.submit(
+                    lint_repository,
+                    repo_path,
+                    checks_to_run,
+                    repo_args,
+                    beman_standard_check_config,
+                )
+                for repo_path in repo_paths
+            ]
+            results = [future.result() for future in futures]
+
+    if ndjson:
+        write_batch_records(results)
+        return len([result for result in results if result["exit_status"] != 0])
+
+    for result in results:
+        print(f"==> {result['repo_path']} (exit status: {result['exit_status']})")
+        print(result["output"])
+
+    print_compliance_table(results)
+    sys.stdout.flush()
+
+    return len([result for result in results if result["exit_status"] != 0])
+
+
+def print_compliance_table(results):
+    """
+    Print one compliance table for all the linted repositories.
+    """
+    name_width = max([len("Repository")] + [len(r["name"]) for r in results])
+    print(
+        f"{'Repository':<{name_width}} | Status | Requirement | Recommendation |   TOTAL | Failed"
+    )
+    print(
+        f"{'-' * name_width}-|--------|-------------|----------------|---------|-------"
+    )
+
+    total_passed = 0
+    total_implemented = 0
+    cnt_partial_repos = 0
+    for result in results:
+        summary = result["summary"]
+        status = "passed" if result["exit_status"] == 0 else "failed"
+        if not summary:
+            print(f"{result['name']:<{name_width}} | {status:<6} | (no summary)")
+            continue
+
+        if summary["partial"]:
+            # Partial run (--since, --fail-fast): no coverage, and not counted in the organization coverage.
+            print(
+                f"{result['name']:<{name_width}} | {status:<6} | "
+                f"{'partial':>11} | {'partial':>14} | {'partial':>7} | {summary['total_failed']:6}"
+            )
+            cnt_partial_repos += 1
+            continue
+
+        coverage = summary["coverage"]
+        total_passed += summary["total_passed"]
+        total_implemented += summary["total_implemented"]
+        print(
+            f"{calculate_coverage_color(coverage['TOTAL'])}"
+            f"{result['name']:<{name_width}} | {status:<6} | "
+            f"{coverage['Requirement']:10.2f}% | {coverage['Recommendation']:13.2f}% | "
+            f"{coverage['TOTAL']:6.2f}% | {summary['total_failed']:6}{no_color}"
+        )
+
+    total_coverage = (
+        round(total_passed / total_implemented * 100, 2) if total_implemented else 0
+    )
+    cnt_failed_repos = len([r for r in results if r["exit_status"] != 0])
+    print(
+        f"\n{calculate_coverage_color(total_coverage)}Coverage ORGANIZATION: {total_coverage:{6}.2f}% "
+        f"({total_passed}/{total_implemented} checks passed, "
+        f"{cnt_failed_repos}/{len(results)} repositories failed"
+        f"{f', {cnt_partial_repos} partial repositories excluded' if cnt_partial_repos else ''}).{no_color}"
+    )
+
+
+def write_batch_records(results):
+    """
+    Write the JSON records of a batch (--output ndjson): the captured records of each repository
+    (or an error record for repositories which could not be linted), then one batch record.
+    """
+    total_passed = 0
+    total_implemented = 0
+    cnt_partial_repos = 0
+    for result in results:
+        if not result["summary"]:
+            print(
+                json.dumps(
+                    {
+                        "record": "error",
+                        "repository": os.path.abspath(result["repo_path"]),
+                        "message": result["output"].strip(),
+                    }
+                )
+            )
+            continue
+
+        print(result["output"], end="")
+        if result["summary"]["partial"]:
+            cnt_partial_repos += 1
+            continue
+        total_passed += result["summary"]["total_passed"]
+        total_implemented += result["summary"]["total_implemented"]
+
+    print(
+        json.dumps(
+            {
+                "record": "batch",
+                "repositories": {
+                    os.path.abspath(result["repo_path"]): result["exit_status"]
+                    for result in results
+                },
+                "total_passed": total_passed,
+                "total_implemented": total_implemented,
+                "coverage": round(total_passed / total_implemented * 100, 2)
+                if total_implemented
+                else 0,
+                "partial_repositories": cnt_partial_repos,
+                "failed_repositories": len(
+                    [result for result in results if result["exit_status"] != 0]
+                ),
+            }
+        )
+    )
+    sys.stdout.flush()
@@ -1,10 +1,18 @@
 #!/usr/bin/env python3
 # SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
 
+import fnmatch
+import hashlib
+import json
 from abc import ABC
 from pathlib import Path
+from typing import NamedTuple, Optional, Tuple
 
 from ..system.registry import get_beman_standard_check_name_by_class
+from ...utils.filesystem import get_repository_snapshot
+from ...utils.git import RepositoryInfo
+from ...utils.overlay import get_fix_overlay
+from ...utils.profile import PROFILE_PHASES, profile_phase
 from ...utils.string import (
     red_color,
     yellow_color,
@@ -13,6 +21,57 @@ from ...utils.string import (
 )
 
 
+class CheckInputs(NamedTuple):
+    """
+    The inputs a check result depends on.
+    e.g., CheckInputs(files=(Path("README.md"),), globs=(("*.md", None),), repo_info=("name",))
+
+    - files: paths (files or directories) read or tested for existence.
+    - globs: (pattern, subtree) pairs - all entries matching the pattern (basename) inside the subtree.
+      A None subtree is the whole repository.
+    - repo_info: repository information fields - e.g., "default_branch".
+    """
+
+    files: Tuple[Path, ...] = ()
+    globs: Tuple[Tuple[str, Optional[Path]], ...] = ()
+    repo_info: Tuple[str, ...] = ()
+
+    def merge(self, files=(), globs=(), repo_info=()):
+        """
+        Returns new inputs with the given files, globs and repo_info fields added.
+        """
+        return CheckInputs(
+            self.files + tuple(files),
+            self.globs + tuple(globs),
+            self.repo_info + tuple(repo_info),
+        )
+
+    def covers(self, path, repo_path):
+        """
+        Check if a change of the given path (e.g., added, modified or deleted) may affect the inputs.
+        e.g., "README.md" covers files=("README.md",); "docs/intro.md" covers globs=(("*.md", None),).
+        """
+        for file in self.files:
+            if path == file or file in path.parents or path in file.parents:
+                return True
+
+        for pattern, subtree in self.globs:
+            subtree = subtree if subtree is not None else repo_path
+            if path == subtree or path in subtree.parents:
+                # e.g., the whole tree changed (lost watch events).
+                return True
+            if subtree not in path.parents:
+                continue
+            # Globs match directories too - e.g., "*test*" matches "tests/" for "tests/CMakeLists.txt".
+            if any(
+                fnmatch.fnmatchcase(part, pattern)
+                for part in path.relative_to(subtree).parts
+            ):
+                return True
+
+        return False
+
+
 class BaseCheck(ABC):
     """
     Base class for checks.
@@ -24,6 +83,22 @@ class BaseCheck(ABC):
     thus an implementation is not required in the derived class.
     """
 
+    # Names of the checks that must pass before this one (see register_beman_standard_check()).
+    depends_on = ()
+
+    def __init_subclass__(cls, **kwargs):
+        """
+        Hook the phases (should_skip(), pre_check(), check(), fix()) of every derived class,
+        so they are measured by --profile without any change in the checks.
+        """
+        super().__init_subclass__(**kwargs)
+        for phase in PROFILE_PHASES:
+            method = getattr(cls, phase)
+            if not getattr(method, "__profiled__", False):
+                wrapper = profile_phase(phase, method)
+                wrapper.__profiled__ = True
+                setattr(cls, phase, wrapper)
+
     def __init__(self, repo_info, beman_standard_check_config, name=None):
         """
         Create a new check instance.
@@ -64,6 +139,11 @@ class BaseCheck(ABC):
         )
         assert self.full_text_body is not None
 
+        # set log buffer - e.g. None (print directly) or a list (collect logs for ordered output)
+        self.log_buffer = None
+        # set log format - e.g. False (colored lines) or True (records: {"level": ..., "message": ...})
+        self.log_structured = False
+
         # set log level - e.g. "error" or "warning" or "skipped"
         self.log_enabled = False
         self.log_level = (
@@ -92,6 +172,85 @@ class BaseCheck(ABC):
         assert len(beman_library_maturity_model["values"]) == 4
         self.beman_library_maturity_model = beman_library_maturity_model["values"]
 
+    @property
+    def snapshot(self):
+        """
+        The repository snapshot shared by all checks in the current run.
+        """
+        return get_repository_snapshot(self.repo_path)
+
+    @property
+    def fix_overlay(self):
+        """
+        The fix overlay shared by all checks in the current run (see FixOverlay), or None if the run does not fix.
+        """
+        return get_fix_overlay(self.repo_path)
+
+    def inputs(self):
+        """
+        Declares the inputs of the check (see CheckInputs). Override it in derived classes
+        to add the files, globs and repo_info fields the check reads.
+        Note: If the inputs did not change, the pipeline may reuse the previous result.
+        """
+        return CheckInputs(repo_info=("name", "top_level"))
+
+    def estimated_cost(self):
+        """
+        Returns a rough, relative cost of the check, estimated from its inputs (without running it):
+        files are cheap, globs over a subtree cost more, globs over the whole repository even more,
+        and repository information from git subprocesses (e.g., status) the most.
+        e.g., with --fail-fast, the cheapest checks run first, so failures show up quickly.
+        """
+        inputs = self.inputs()
+        cost = len(inputs.files)
+        for _, subtree in inputs.globs:
+            cost += 10 if subtree is not None else 100
+        for field in inputs.repo_info:
+            cost += 1000 if field in RepositoryInfo.subprocess_fields else 1
+        return cost
+
+    def is_affected_by(self, changed_paths):
+        """
+        Check if any of the changed paths (absolute) may affect the result of the check.
+        Repository information other than the name / top level is not tracked by paths, so it always counts as changed.
+        """
+        inputs = self.inputs()
+        if set(inputs.repo_info) - {"name", "top_level"}:
+            return True
+        return any(inputs.covers(path, self.repo_path) for path in changed_paths)
+
+    def fingerprint(self):
+        """
+        Returns a digest of the check config and of the current state of the check inputs.
+        Files are fingerprinted by their stat signature (or object id, with --rev), not by content,
+        and globs by the matching paths.
+        """
+        inputs = self.inputs()
+        digest = hashlib.sha256()
+
+        def update(value):
+            digest.update(repr(value).encode())
+            digest.update(b"\0")
+
+        update((self.name, self.type))
+        # Derived data (e.g., the compiled matchers) is fully determined by the rest of the config.
+        update(
+            json.dumps(
+                {k: v for k, v in (self.config or {}).items() if k != "matcher"},
+                sort_keys=True,
+                default=str,
+            )
+        )
+        for path in inputs.files:
+            update((str(path), *self.snapshot.signature(path)))
+        for pattern, subtree in inputs.globs:
+            update((pattern, str(subtree)))
+            update(sorted(str(p) for p in self.snapshot.glob(pattern, subtree=subtree)))
+        for field in inputs.repo_info:
+            update((field, str(self.repo_info[field])))
+
+        return digest.hexdigest()
+
     def should_skip(self):
         """
         Returns True if the check should be skipped.
@@ -165,6 +324,10 @@ class BaseCheck(ABC):
 
         if self.log_enabled and enabled:
             log_level = log_level if log_level else self.log_level
+            if self.log_structured and self.log_buffer is not None:
+                self.log_buffer.append({"level": log_level, "message": message})
+                return
+
             color = (
                 red_color
                 if log_level == "error"
@@ -175,4 +338,8 @@ class BaseCheck(ABC):
                 else no_color
             )
 
-            print(f"[{color}{log_level:<15}{no_color}][{self.name:<25}]: {message}")
+            line = f"[{color}{log_level:<15}{no_color}][{self.name:<25}]: {message}"
+            if self.log_buffer is not None:
+                self.log_buffer.append(line)
+            else:
+                print(line)
@@ -30,7 +30,7 @@ class DirectoryBaseCheck(BaseCheck):
             self.log("The path is not set.")
             return False
 
-        if not self.path.exists():
+        if not self.exists():
             self.log(f"The directory '{self.path}' does not exist.")
             return False
 
@@ -40,6 +40,17 @@ class DirectoryBaseCheck(BaseCheck):
 
         return True
 
+    def inputs(self, entries=True):
+        """
+        Override.
+        The directory and (unless entries is False - e.g., the check only tests if it exists) all its entries.
+        """
+        return (
+            super()
+            .inputs()
+            .merge(files=[self.path], globs=[("*", self.path)] if entries else [])
+        )
+
     @abstractmethod
     def check(self):
         """
@@ -54,15 +65,27 @@ class DirectoryBaseCheck(BaseCheck):
         """
         pass
 
+    def exists(self):
+        """
+        Check if the directory exists.
+        """
+        return self.snapshot.exists(self.path)
+
     def read(self) -> list[Path]:
         """
         Read the directory content.
         """
         try:
-            return list(self.path.iterdir())
+            return self.snapshot.iterdir(self.path)
         except Exception:
             return []
 
+    def glob(self, pattern) -> list[Path]:
+        """
+        Find all entries inside the directory matching the pattern (similar to Path.rglob()).
+        """
+        return self.snapshot.glob(pattern, subtree=self.path)
+
     def is_empty(self):
         """
         Check if the directory is empty.
@@ -2,9 +2,12 @@
 # SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
 
 from abc import abstractmethod
+import io
 import re
 
 from .base_check import BaseCheck
+from ...utils.cache import get_file_content_cache
+from ...utils.overlay import write_file_atomically
 
 
 class FileBaseCheck(BaseCheck):
@@ -30,7 +33,7 @@ class FileBaseCheck(BaseCheck):
             self.log("The path is not set.")
             return False
 
-        if not self.path.exists():
+        if not self.exists():
             self.log(f"The file '{self.path}' does not exist.")
             return False
 
@@ -40,6 +43,13 @@ class FileBaseCheck(BaseCheck):
 
         return True
 
+    def inputs(self):
+        """
+        Override.
+        The file itself.
+        """
+        return super().inputs().merge(files=[self.path])
+
     @abstractmethod
     def check(self):
         """
@@ -54,13 +64,26 @@ class FileBaseCheck(BaseCheck):
         """
         pass
 
+    def exists(self):
+        """
+        Check if the file exists (or was created by a fix of the current run).
+        """
+        overlay = self.fix_overlay
+        return (overlay is not None and self.path in overlay) or self.snapshot.exists(
+            self.path
+        )
+
     def read(self):
         """
-        Read the file content.
+        Read the file content (from the working tree, or from the commit with --rev),
+        including the fixes of the current run.
         """
         try:
-            with open(self.path, "r") as file:
-                return file.read()
+            overlay = self.fix_overlay
+            content = overlay.read(self.path) if overlay is not None else None
+            if content is not None:
+                return content
+            return self.snapshot.read_text(self.path)
         except Exception:
             return ""
 
@@ -68,11 +91,7 @@ class FileBaseCheck(BaseCheck):
         """
         Read the file content as lines.
         """
-        try:
-            with open(self.path, "r") as file:
-                return file.readlines()
-        except Exception:
-            return []
+        return io.StringIO(self.read()).readlines()
 
     def read_lines_strip(self):
         """
@@ -80,35 +99,65 @@ class FileBaseCheck(BaseCheck):
         """
         return [line.strip() for line in self.read_lines()]
 
-    def write(self, content):
+    def edit(self, operation):
         """
-        Write the content to the file.
+        Apply an edit operation (content -> new content) to the file.
+        In a fixing run, the edit goes to the fix overlay, written once at the end of the run (or reported
+        as a diff with --fix-dry-run). Otherwise, the file is replaced atomically.
+
+        @return: True on success. Errors are logged.
         """
         try:
-            with open(self.path, "w") as file:
-                file.write(content)
+            overlay = self.fix_overlay
+            if overlay is not None:
+                overlay.edit(self.path, operation)
+            else:
+                write_file_atomically(self.path, operation(self.read()))
+                get_file_content_cache().invalidate(self.path)
+                self.snapshot.add_file(self.path)
+            return True
         except Exception as e:
             self.log(f"Error writing the file '{self.path}': {e}")
+            return False
+
+    def write(self, content):
+        """
+        Write the content to the file (see edit()).
+        """
+        return self.edit(lambda _: content)
 
     def write_lines(self, lines):
         """
         Write the lines to the file.
         """
-        self.write("\n".join(lines))
+        return self.write("\n".join(lines))
 
     def replace_line(self, line_number, new_line):
         """
-        Replace the line at the given line number with the new line.
+        Replace the line at the given line number with the new line (see edit()).
+        The line ending of the replaced line is kept.
         """
-        lines = self.read_lines()
-        lines[line_number] = new_line
-        self.write_lines(lines)
+
+        def replace(content):
+            lines = io.StringIO(content).readlines()
+            line = lines[line_number]
+            lines[line_number] = new_line + line[len(line.rstrip("\n")) :]
+            return "".join(lines)
+
+        return self.edit(replace)
 
     def is_empty(self):
         """
         Check if the file is empty.
+        Note: Answered from the file size, without reading the file.
         """
-        return len(self.read()) == 0
+        overlay = self.fix_overlay
+        if overlay is not None and self.path in overlay:
+            return overlay.read(self.path) == ""
+        try:
+            return self.snapshot.size(self.path) == 0
+        except OSError:
+            return True
 
     def has_content(self, content_to_match):
         """
@@ -3,6 +3,7 @@
 
 from ..base.directory_base_check import DirectoryBaseCheck
 from ..system.registry import register_beman_standard_check
+from ...utils.filesystem import get_exclude_rules
 
 
 # [directory.*] checks category.
@@ -45,9 +46,22 @@ class DirectorySourcesCheck(BemanTreeDirectoryCheck):
     Example for a repo named "exemplar": src/beman/exemplar
     """
 
+    # Known source locations, other than src/beman/<short_name>.
+    forbidden_source_locations = ["source/", "sources/", "lib/", "library/"]
+
     def __init__(self, repo_info, beman_standard_check_config):
         super().__init__(repo_info, beman_standard_check_config, "src")
 
+    def inputs(self):
+        return (
+            super()
+            .inputs()
+            .merge(
+                files=[self.repo_path / "src/"]
+                + [self.repo_path / p for p in self.forbidden_source_locations]
+            )
+        )
+
     def pre_check(self):
         # Need to override this, because directory.sources is conditional
         # (a repo without any source files location is still valid - header only libraries)
@@ -56,17 +70,16 @@ class DirectorySourcesCheck(BemanTreeDirectoryCheck):
     def check(self):
         # TODO: This is a temporary implementation. Use CMakeLists.txt to actually get the source files location.
         # Should not allow other known source locations.
-        forbidden_source_locations = ["source/", "sources/", "lib/", "library/"]
-        for forbidden_prefix in forbidden_source_locations:
+        for forbidden_prefix in self.forbidden_source_locations:
             forbidden_prefix = self.repo_path / forbidden_prefix
-            if forbidden_prefix.exists():
+            if self.snapshot.exists(forbidden_prefix):
                 self.log(
                     f"Please move source files from {forbidden_prefix} to src/beman/{self.repo_name}. See https://github.com/bemanproject/beman/blob/main/docs/beman_standard.md#directorysources for more information."
                 )
                 return False
 
         # If `src/` exists, src/beman/<short_name> also should exist.
-        if (self.repo_path / "src/").exists() and not self.path.exists():
+        if self.snapshot.exists(self.repo_path / "src/") and not self.exists():
             self.log(
                 f"Please use the required source files location: src/beman/{self.repo_name}. See https://github.com/bemanproject/beman/blob/main/docs/beman_standard.md#directorysources for more information."
             )
@@ -113,6 +126,10 @@ class DirectoryTestsCheck(BemanTreeDirectoryCheck):
     def __init__(self, repo_info, beman_standard_check_config):
         super().__init__(repo_info, beman_standard_check_config, "tests")
 
+    def inputs(self):
+        # Test files anywhere in the repository.
+        return super().inputs().merge(globs=[("*test*", None)])
+
     def check(self):
         # Exclude directories that are not part of the tests.
         exclude_dirs = [".github", "tests"]
@@ -120,10 +137,9 @@ class DirectoryTestsCheck(BemanTreeDirectoryCheck):
             exclude_dirs.extend(["cookiecutter", "infra"])
 
         # Find all test files in the repository outside the excluded directories.
-        misplaced_test_files = []
-        for p in self.repo_path.rglob("*test*"):
-            if not any(excluded in str(p) for excluded in exclude_dirs):
-                misplaced_test_files.append(p)
+        misplaced_test_files = self.snapshot.glob(
+            "*test*", exclude=get_exclude_rules(tuple(exclude_dirs))
+        )
 
         # Check if any test files are misplaced outside the excluded directories.
         if len(misplaced_test_files) > 0:
@@ -137,8 +153,8 @@ class DirectoryTestsCheck(BemanTreeDirectoryCheck):
             return False
 
         # Check if the repository has at least one relevant test inside tests/beman/<short_name>.
-        relevant_test_files = list(self.path.rglob("*.test.*"))
-        relevant_cmake_files = list(self.path.rglob("CMakeLists.txt"))
+        relevant_test_files = self.glob("*.test.*")
+        relevant_cmake_files = self.glob("CMakeLists.txt")
 
         if len(relevant_test_files) == 0 or len(relevant_cmake_files) == 0:
             self.log(
@@ -172,14 +188,14 @@ class DirectoryExamplesCheck(DirectoryBaseCheck):
         └── identity_direct_usage.cpp
         """
         # Check if the examples/ directory contains at least one relevant example.
-        if len(list(self.path.glob("**/*.cpp"))) == 0:
+        if len(self.glob("*.cpp")) == 0:
             self.log(
                 "Missing one relevant example - cannot find examples/**/*.cpp. "
                 "See https://github.com/bemanproject/beman/blob/main/docs/beman_standard.md#directoryexamples for more information."
             )
             return False
 
-        if len(list(self.path.glob("**/*CMakeLists.txt"))) == 0:
+        if len(self.glob("*CMakeLists.txt")) == 0:
             self.log(
                 "Missing CMakeLists.txt for examples - cannot find examples/**/*CMakeLists.txt. "
                 "See https://github.com/bemanproject/beman/blob/main/docs/beman_standard.md#directoryexamples for more information."
@@ -206,6 +222,10 @@ class DirectoryDocsCheck(DirectoryBaseCheck):
     def __init__(self, repo_info, beman_standard_check_config):
         super().__init__(repo_info, beman_standard_check_config, "docs")
 
+    def inputs(self):
+        # The docs/ directory and the MD files anywhere in the repository.
+        return super().inputs(entries=False).merge(globs=[("*.md", None)])
+
     def pre_check(self):
         # Need to override this, because directory.docs is conditional
         # (a repo without any documentation is still valid).
@@ -214,19 +234,18 @@ class DirectoryDocsCheck(DirectoryBaseCheck):
     def check(self):
         # Exclude directories that are not part of the documentation.
         exclude_dirs = ["src", "papers", "examples", ".github"]
-        if self.path.exists():
+        if self.exists():
             exclude_dirs.append("docs")
         if self.repo_name == "exemplar":
             exclude_dirs.extend(["cookiecutter", "infra"])
 
-        # Find all MD files in the repository.
+        # Find all MD files in the repository outside the excluded directories.
         misplaced_md_files = [
             p
-            for p in self.repo_path.rglob("*.md")
-            if not any(
-                excluded in p.parts for excluded in exclude_dirs
-            )  # exclude files in excluded directories
-            and p != self.repo_path / "README.md"  # exclude root README.md
+            for p in self.snapshot.find_by_extension(
+                ".md", exclude=get_exclude_rules(tuple(exclude_dirs))
+            )
+            if p != self.repo_path / "README.md"  # exclude root README.md
         ]
 
         # Check if any MD files are misplaced.
@@ -257,9 +276,44 @@ class DirectoryPapersCheck(DirectoryBaseCheck):
     Check if the all paper related files reside within papers/ directory.
     """
 
+    # File extensions that are considered "paper-related"
+    paper_extensions = [
+        ".md",
+        ".bib",
+        ".bst",
+        ".tex",
+        ".sty",
+        ".cls",
+        ".pdf",
+        ".docx",
+        ".org",
+        ".html",
+        ".css",
+        ".js",
+        ".asciidoc",
+        ".asc",
+        ".ad",
+        ".ascdoc",
+        ".rst",
+        ".wip",
+        ".draft",
+        ".proposal",
+        ".standard",
+    ]
+
     def __init__(self, repo_info, beman_standard_check_config):
         super().__init__(repo_info, beman_standard_check_config, "papers")
 
+    def inputs(self):
+        # The papers/ directory and the paper-related files anywhere in the repository.
+        return (
+            super()
+            .inputs(entries=False)
+            .merge(
+                globs=[(f"*{extension}", None) for extension in self.paper_extensions],
+            )
+        )
+
     def pre_check(self):
         # Need to override this, because directory.papers is conditional
         # (a repo without any paper files is still valid - no papers/ directory required)
@@ -277,45 +331,17 @@ class DirectoryPapersCheck(DirectoryBaseCheck):
         """
         # Exclude directories that are not part of the papers/ directory.
         exclude_dirs = ["src", "docs", "examples", ".github"]
-        if self.path.exists():
+        if self.exists():
             exclude_dirs.append("papers")
         if self.repo_name == "exemplar":
             exclude_dirs.extend(["cookiecutter", "infra"])
 
-        # File extensions that are considered "paper-related"
-        paper_extensions = [
-            ".md",
-            ".bib",
-            ".bst",
-            ".tex",
-            ".sty",
-            ".cls",
-            ".pdf",
-            ".docx",
-            ".org",
-            ".html",
-            ".css",
-            ".js",
-            ".asciidoc",
-            ".asc",
-            ".ad",
-            ".ascdoc",
-            ".rst",
-            ".wip",
-            ".draft",
-            ".proposal",
-            ".standard",
-        ]
-
         # Find all misplaced paper-related files in the repository.
+        exclude = get_exclude_rules(tuple(exclude_dirs))
         misplaced_paper_files = []
-        for extension in paper_extensions:
-            for p in self.repo_path.rglob(f"*{extension}"):
-                # Exclude files that are already in excluded directories.
-                if (
-                    not any(excluded in str(p) for excluded in exclude_dirs)
-                    and p != self.repo_path / "README.md"
-                ):
+        for extension in self.paper_extensions:
+            for p in self.snapshot.find_by_extension(extension, exclude=exclude):
+                if p != self.repo_path / "README.md":
                     misplaced_paper_files.append(p)
 
         if len(misplaced_paper_files) > 0:
@@ -5,11 +5,7 @@ import re
 
 from ..base.file_base_check import FileBaseCheck, BaseCheck
 from ..system.registry import register_beman_standard_check
-from beman_tidy.lib.utils.string import (
-    match_apache_license_v2_with_llvm_exceptions,
-    match_boost_software_license_v1_0,
-    match_the_mit_license,
-)
+from beman_tidy.lib.utils.license import classify_license
 
 
 # [readme.*] checks category.
@@ -35,7 +31,7 @@ class ReadmePurposeCheck(BaseCheck):
         return True
 
 
-@register_beman_standard_check("readme.title")
+@register_beman_standard_check("readme.title", depends_on=["toplevel.readme"])
 class ReadmeTitleCheck(ReadmeBaseCheck):
     def __init__(self, repo_info, beman_standard_check_config):
         super().__init__(repo_info, beman_standard_check_config)
@@ -59,11 +55,10 @@ class ReadmeTitleCheck(ReadmeBaseCheck):
         Fix the issue if the Beman Standard is not applied.
         """
         new_title_line = f"# {self.library_name}: TODO Short Description"
-        self.replace_line(0, new_title_line)
-        return True
+        return self.replace_line(0, new_title_line)
 
 
-@register_beman_standard_check("readme.badges")
+@register_beman_standard_check("readme.badges", depends_on=["toplevel.readme"])
 class ReadmeBadgesCheck(ReadmeBaseCheck):
     def __init__(self, repo_info, beman_standard_check_config):
         super().__init__(repo_info, beman_standard_check_config)
@@ -82,8 +77,8 @@ class ReadmeBadgesCheck(ReadmeBaseCheck):
                     len(badges) == 2
                 )  # The number of standard targets specified in the Beman Standard.
 
-        def count_badges(badges):
-            return len([badge for badge in badges if self.has_content(badge)])
+        # Count the badges of all categories in a single pass over the file.
+        badge_counts = self.config["matcher"].count(self.read())
 
         count_failed = 0
         for category_data in self.config["values"]:
@@ -91,7 +86,7 @@ class ReadmeBadgesCheck(ReadmeBaseCheck):
             badges = category_data[category]
             validate_badges(category, badges)
 
-            if count_badges(badges) != 1:
+            if badge_counts[category] != 1:
                 self.log(
                     f"The file '{self.path}' does not contain exactly one required badge of category '{category}'."
                 )
@@ -106,7 +101,7 @@ class ReadmeBadgesCheck(ReadmeBaseCheck):
         return True
 
 
-@register_beman_standard_check("readme.implements")
+@register_beman_standard_check("readme.implements", depends_on=["toplevel.readme"])
 class ReadmeImplementsCheck(ReadmeBaseCheck):
     def __init__(self, repo_info, beman_standard_check_config):
         super().__init__(repo_info, beman_standard_check_config)
@@ -144,7 +139,7 @@ class ReadmeImplementsCheck(ReadmeBaseCheck):
         return True
 
 
-@register_beman_standard_check("readme.library_status")
+@register_beman_standard_check("readme.library_status", depends_on=["toplevel.readme"])
 class ReadmeLibraryStatusCheck(ReadmeBaseCheck):
     def __init__(self, repo_info, beman_standard_check_config):
         super().__init__(repo_info, beman_standard_check_config)
@@ -157,7 +152,8 @@ class ReadmeLibraryStatusCheck(ReadmeBaseCheck):
         assert len(statuses) == len(self.beman_library_maturity_model)
 
         # Check if at least one of the required status values is present.
-        status_count = len([status for status in statuses if self.has_content(status)])
+        # All statuses are counted in a single pass over the file.
+        status_count = self.config["matcher"].count(self.read())["values"]
         if status_count != 1:
             self.log(
                 f"The file '{self.path}' does not contain exactly one of the required statuses from {statuses}"
@@ -173,7 +169,7 @@ class ReadmeLibraryStatusCheck(ReadmeBaseCheck):
         return True
 
 
-@register_beman_standard_check("readme.license")
+@register_beman_standard_check("readme.license", depends_on=["toplevel.readme"])
 class ReadmeLicenseCheck(ReadmeBaseCheck):
     def __init__(self, repo_info, beman_standard_check_config):
         super().__init__(repo_info, beman_standard_check_config)
@@ -193,11 +189,7 @@ class ReadmeLicenseCheck(ReadmeBaseCheck):
 
         # Check if the license section contains at least one of the required licenses.
         license_text = license_section.group(1).strip()
-        if (
-            not match_apache_license_v2_with_llvm_exceptions(license_text)
-            and not match_boost_software_license_v1_0(license_text)
-            and not match_the_mit_license(license_text)
-        ):
+        if classify_license(license_text) is None:
             self.log(
                 f"The file '{self.path}' does not contain the required license. "
                 "See https://github.com/bemanproject/beman/blob/main/docs/beman_standard.md#readmelicense for the desired format."
@@ -40,7 +40,9 @@ class ReleaseNotesCheck(BaseCheck):
         return True
 
 
-@register_beman_standard_check("release.godbolt_trunk_version")
+@register_beman_standard_check(
+    "release.godbolt_trunk_version", depends_on=["toplevel.readme"]
+)
 class ReleaseGodboltTrunkVersionCheck(ReadmeBaseCheck):
     def __init__(self, repo_info, beman_standard_check_config):
         super().__init__(repo_info, beman_standard_check_config)
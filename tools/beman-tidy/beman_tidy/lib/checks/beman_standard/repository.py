@@ -44,6 +44,9 @@ class RepositoryDefaultBranchCheck(BaseCheck):
     def __init__(self, repo_info, beman_standard_check_config):
         super().__init__(repo_info, beman_standard_check_config)
 
+    def inputs(self):
+        return super().inputs().merge(repo_info=["default_branch"])
+
     def check(self):
         default_branch = self.repo_info["default_branch"]
         if default_branch != "main":
@@ -98,7 +101,7 @@ class RepositoryDisallowGitSubmodulesCheck(FileBaseCheck):
         return True
 
     def check(self):
-        if self.path.exists():
+        if self.exists():
             content = self.read()
 
             # Regex pattern to match "wg21" submodule
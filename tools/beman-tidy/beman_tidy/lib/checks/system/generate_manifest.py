@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+from .registry import (
+    generate_beman_standard_check_manifest,
+    get_beman_standard_check_manifest_path,
+)
+
+
+def main():
+    """
+    Regenerate the check manifest - e.g., after adding a new check:
+    `python -m beman_tidy.lib.checks.system.generate_manifest`.
+    """
+    get_beman_standard_check_manifest_path().write_text(
+        generate_beman_standard_check_manifest()
+    )
+
+
+if __name__ == "__main__":
+    main()
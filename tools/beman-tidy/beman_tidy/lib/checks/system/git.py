@@ -20,7 +20,9 @@ class DisallowFixInplaceAndUnstagedChangesCheck(BaseCheck):
         """
         Should not allow fix if there are unstaged changes.
         """
-        return len(self.repo_info["unstaged_changes"]) == 0
+        # Note: None means that the unstaged changes could not be computed.
+        unstaged_changes = self.repo_info["unstaged_changes"]
+        return unstaged_changes is not None and len(unstaged_changes) == 0
 
     def fix(self):
         """
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+# Generated by `python -m beman_tidy.lib.checks.system.generate_manifest`. DO NOT EDIT.
+# Maps each registered Beman Standard check to the module that implements it.
+BEMAN_STANDARD_CHECK_MODULES = {
+    "directory.docs": "beman_tidy.lib.checks.beman_standard.directory",
+    "directory.examples": "beman_tidy.lib.checks.beman_standard.directory",
+    "directory.papers": "beman_tidy.lib.checks.beman_standard.directory",
+    "directory.sources": "beman_tidy.lib.checks.beman_standard.directory",
+    "directory.tests": "beman_tidy.lib.checks.beman_standard.directory",
+    "library.name": "beman_tidy.lib.checks.beman_standard.general",
+    "license.apache_llvm": "beman_tidy.lib.checks.beman_standard.license",
+    "license.approved": "beman_tidy.lib.checks.beman_standard.license",
+    "license.criteria": "beman_tidy.lib.checks.beman_standard.license",
+    "readme.badges": "beman_tidy.lib.checks.beman_standard.readme",
+    "readme.implements": "beman_tidy.lib.checks.beman_standard.readme",
+    "readme.library_status": "beman_tidy.lib.checks.beman_standard.readme",
+    "readme.license": "beman_tidy.lib.checks.beman_standard.readme",
+    "readme.purpose": "beman_tidy.lib.checks.beman_standard.readme",
+    "readme.title": "beman_tidy.lib.checks.beman_standard.readme",
+    "release.github": "beman_tidy.lib.checks.beman_standard.release",
+    "release.godbolt_trunk_version": "beman_tidy.lib.checks.beman_standard.release",
+    "release.notes": "beman_tidy.lib.checks.beman_standard.release",
+    "repository.code_review_rules": "beman_tidy.lib.checks.beman_standard.repository",
+    "repository.codeowners": "beman_tidy.lib.checks.beman_standard.repository",
+    "repository.default_branch": "beman_tidy.lib.checks.beman_standard.repository",
+    "repository.disallow_git_submodules": "beman_tidy.lib.checks.beman_standard.repository",
+    "repository.name": "beman_tidy.lib.checks.beman_standard.repository",
+    "toplevel.cmake": "beman_tidy.lib.checks.beman_standard.toplevel",
+    "toplevel.license": "beman_tidy.lib.checks.beman_standard.toplevel",
+    "toplevel.readme": "beman_tidy.lib.checks.beman_standard.toplevel",
+}
@@ -1,18 +1,28 @@
 #!/usr/bin/env python3
 # SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
 
+import importlib
+from pathlib import Path
 from typing import Dict, Type, List
 
+from .manifest import BEMAN_STANDARD_CHECK_MODULES
+
 # Registry to store all The Beman Standard check classes.
+# Populated when the check modules are imported (see import_beman_standard_checks()).
 _beman_standard_check_registry: Dict[str, Type] = {}
 
+# Package with all The Beman Standard check modules.
+BEMAN_STANDARD_CHECKS_PACKAGE = "beman_tidy.lib.checks.beman_standard"
+
 
-def register_beman_standard_check(check: str):
+def register_beman_standard_check(check: str, depends_on: List[str] = None):
     """
     Decorator to register a check class with a specific ID.
+    Optional depends_on: the checks that must pass first - e.g., readme.badges needs toplevel.readme.
+    The pipeline runs prerequisites first and fails the dependents of failed prerequisites without running them.
 
     Usage:
-        @register_beman_standard_check("readme.title")
+        @register_beman_standard_check("readme.title", depends_on=["toplevel.readme"])
         class ReadmeTitleCheck(ReadmeBaseCheck):
             ...
 
@@ -22,24 +32,45 @@ def register_beman_standard_check(check: str):
 
     def decorator(check_class: Type) -> Type:
         _beman_standard_check_registry[check] = check_class
+        # Set on each registered class, so dependencies are not inherited.
+        check_class.depends_on = tuple(depends_on or ())
         return check_class
 
     return decorator
 
 
+def import_beman_standard_checks(check_names: List[str] = None):
+    """
+    Import the modules of the given checks (all checks if None), using the manifest.
+    Only the modules of the selected checks are imported - e.g., `--checks=readme.title`
+    does not import the license or directory checks.
+    """
+    if check_names is None:
+        check_names = BEMAN_STANDARD_CHECK_MODULES.keys()
+
+    for module_name in dict.fromkeys(
+        BEMAN_STANDARD_CHECK_MODULES[check_name]
+        for check_name in check_names
+        if check_name in BEMAN_STANDARD_CHECK_MODULES
+    ):
+        importlib.import_module(module_name)
+
+
 def get_registered_beman_standard_checks() -> Dict[str, Type]:
     """Get all registered check classes"""
+    import_beman_standard_checks()
     return _beman_standard_check_registry.copy()
 
 
 def get_beman_standard_check_by_name(check_name: str) -> Type:
     """Get a specific check class by its name"""
+    import_beman_standard_checks([check_name])
     return _beman_standard_check_registry.get(check_name)
 
 
 def get_all_beman_standard_check_names() -> List[str]:
-    """Get all registered check names"""
-    return list(_beman_standard_check_registry.keys())
+    """Get all registered check names (without importing the check modules)"""
+    return list(BEMAN_STANDARD_CHECK_MODULES.keys())
 
 
 def get_beman_standard_check_name_by_class(target_check_class: Type) -> str:
@@ -48,3 +79,33 @@ def get_beman_standard_check_name_by_class(target_check_class: Type) -> str:
         if check_class == target_check_class:
             return check_name
     return None
+
+
+def generate_beman_standard_check_manifest() -> str:
+    """
+    Generate the source of the check manifest: {check name: module name}.
+    Imports all the modules from the beman_standard package to find the registered checks.
+    """
+    import pkgutil
+
+    package = importlib.import_module(BEMAN_STANDARD_CHECKS_PACKAGE)
+    for module_info in pkgutil.iter_modules(package.__path__):
+        importlib.import_module(f"{BEMAN_STANDARD_CHECKS_PACKAGE}.{module_info.name}")
+
+    lines = [
+        "#!/usr/bin/env python3",
+        "# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception",
+        "",
+        "# Generated by `python -m beman_tidy.lib.checks.system.generate_manifest`. DO NOT EDIT.",
+        "# Maps each registered Beman Standard check to the module that implements it.",
+        "BEMAN_STANDARD_CHECK_MODULES = {",
+    ]
+    for check_name, check_class in sorted(_beman_standard_check_registry.items()):
+        lines.append(f'    "{check_name}": "{check_class.__module__}",')
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def get_beman_standard_check_manifest_path() -> Path:
+    """Get the path to the generated check manifest"""
+    return Path(__file__).parent / "manifest.py"
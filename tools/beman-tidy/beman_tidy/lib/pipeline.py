@@ -1,10 +1,24 @@
 #!/usr/bin/env python3
 # SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
 
+import argparse
+import json
 import sys
+import threading
+import time
 
-from .checks.system.registry import get_registered_beman_standard_checks
+from .checks.base.file_base_check import FileBaseCheck
+from .checks.system.registry import (
+    get_all_beman_standard_check_names,
+    get_beman_standard_check_by_name,
+)
 from .checks.system.git import DisallowFixInplaceAndUnstagedChangesCheck
+from .utils.cache import ResultCache, clear_file_content_cache
+from .utils.filesystem import clear_repository_snapshots, get_repository_snapshot
+from .utils.git import get_changed_paths
+from .utils.memory import MemoryProfiler
+from .utils.overlay import start_fix_overlay, stop_fix_overlay
+from .utils.profile import disable_profiler, enable_profiler, trace_span
 from .utils.string import (
     red_color,
     green_color,
@@ -13,83 +27,318 @@ from .utils.string import (
     no_color,
 )
 
-# import all the implemented checks.
-# TODO: Consider removing F403 from ignored lint checks
-from .checks.beman_standard.cmake import *  # noqa: F401, F403
-from .checks.beman_standard.cpp import *  # noqa: F401, F403
-from .checks.beman_standard.directory import *  # noqa: F401, F403
-from .checks.beman_standard.file import *  # noqa: F401, F403
-from .checks.beman_standard.general import *  # noqa: F401, F403
-from .checks.beman_standard.license import *  # noqa: F401, F403
-from .checks.beman_standard.readme import *  # noqa: F401, F403
-from .checks.beman_standard.release import *  # noqa: F401, F403
-from .checks.beman_standard.repository import *  # noqa: F401, F403
-from .checks.beman_standard.toplevel import *  # noqa: F401, F403
-
-
-def run_checks_pipeline(checks_to_run, args, beman_standard_check_config):
+# Defaults of the options read by run_checks_pipeline() - also the defaults of the matching CLI flags.
+PIPELINE_ARG_DEFAULTS = {
+    "fix_inplace": False,
+    "fix_dry_run": False,
+    "verbose": False,
+    "require_all": False,
+    "jobs": 1,
+    "cache": False,
+    "since": None,
+    "output": "text",
+    "profile": False,
+    "memory_profile": False,
+    "tracked_files": True,
+    "fail_fast": False,
+    "rev": None,
+}
+
+
+def get_pipeline_args(repo_info, **overrides):
+    """
+    Get the options of run_checks_pipeline() for the given repository: the CLI defaults,
+    with the given overrides - e.g., get_pipeline_args(repo_info, jobs=4, cache=False).
+    """
+    unknown = set(overrides) - set(PIPELINE_ARG_DEFAULTS)
+    if unknown:
+        raise TypeError(f"Unknown pipeline option(s): {', '.join(sorted(unknown))}")
+    return argparse.Namespace(
+        repo_info=repo_info, **{**PIPELINE_ARG_DEFAULTS, **overrides}
+    )
+
+
+def run_checks_pipeline(
+    checks_to_run,
+    args,
+    beman_standard_check_config,
+    summary=None,
+    changed_paths=None,
+    previous_results=None,
+):
     """
     Run the checks pipeline for The Beman Standard.
     Read-only checks if args.fix_inplace is False, otherwise try to fix the issues in-place.
+    Fixes are collected in a fix overlay (see FixOverlay), seen by the later checks of the run,
+    and written once per file at the end of the run - or printed as a unified diff with args.fix_dry_run.
     Verbosity is controlled by args.verbose.
+    Up to args.jobs checks run in parallel; the output order is the same as a serial run.
+    If summary is a dict, it is filled with the summary counters and the coverage numbers.
+
+    If changed_paths is set (or args.since), only the checks affected by these paths run.
+    If previous_results is a dict (e.g., watch mode), the run is incremental: the repository snapshot
+    is kept, the results are stored in it, and unaffected checks reuse their previous result.
+
+    If args.profile is set, the cost of each check is reported after the summary.
+    If args.memory_profile is set, the memory of each check is reported after the summary (checks run serially).
+    If args.output is "ndjson", no text is printed: one JSON record is written per check as soon as
+    it finishes, followed by one summary record.
+    Checks run after their prerequisites (see register_beman_standard_check(depends_on=...)):
+    if a prerequisite failed, its dependents fail without running.
+    If args.fail_fast is set, the cheapest checks run first and no new check starts after a requirement
+    failed (any check under args.require_all): the summary only counts the checks that ran.
 
     @return: The number of failed checks.
     """
 
+    ndjson = args.output == "ndjson"
+    fixing = args.fix_inplace or args.fix_dry_run
+    profiler = enable_profiler() if args.profile else None
+    memory_profiler = MemoryProfiler() if args.memory_profile else None
+    records_lock = threading.Lock()
+    # Set as soon as a requirement failed (--fail-fast): no new check starts.
+    stop = threading.Event() if args.fail_fast else None
+
     def log(msg):
         """
         Helper function to log messages.
         """
-        if args.verbose:
+        if args.verbose and not ndjson:
             print(msg)
 
-    def run_check(check_class, log_enabled=args.verbose, require_all=args.require_all):
+    def write_record(record):
+        """
+        Helper function to write a JSON record (--output ndjson), flushed so consumers get it immediately.
+        """
+        line = json.dumps(record)
+        with records_lock:
+            print(line, flush=True)
+
+    def write_check_record(check_instance, result, started):
+        """
+        Helper function to write the record of a finished check (--output ndjson).
+        """
+        check_type, status, messages = result
+        write_record(
+            {
+                "record": "check",
+                "repository": str(args.repo_info["top_level"]),
+                "name": check_instance.name,
+                "type": check_type,
+                "status": status,
+                "messages": messages,
+                "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+            }
+        )
+
+    def run_check(
+        check_instance,
+        log_enabled=args.verbose or ndjson,
+        require_all=args.require_all,
+        output=None,
+        failed_prerequisites=(),
+    ):
         """
         Helper function to run a check.
-        @param check_class: The check class type to run.
+        @param check_instance: The check instance to run.
         @param log_enabled: Whether to log the check result.
-        @return: True if the check passed, False otherwise.
+        @param output: Optional list to collect the logs into (instead of printing them).
+        With --output ndjson, the logs are collected as records: {"level": ..., "message": ...}.
+        @param failed_prerequisites: Names of the failed prerequisites: the check fails without running.
+        @return: The check type, the check status and the collected logs.
         """
-        check_instance = check_class(args.repo_info, beman_standard_check_config)
+
+        def check_log(msg):
+            """
+            Helper function to log messages for the current check.
+            """
+            if not args.verbose or ndjson:
+                return
+            if output is not None:
+                output.append(msg)
+            else:
+                print(msg)
+
+        check_instance.log_buffer = output
+        check_instance.log_structured = ndjson
 
         # Check if the check should be skipped, with logging disabled (by default).
         if check_instance.should_skip():
-            log(f"Running check [{check_instance.type}][{check_instance.name}] ... ")
+            check_log(
+                f"Running check [{check_instance.type}][{check_instance.name}] ... "
+            )
             check_instance.log_enabled = log_enabled
             check_instance.should_skip()  # Run should_skip() again, with logging enabled.
-            log(
+            check_log(
                 f"Running check [{check_instance.type}][{check_instance.name}] ... {gray_color}skipped{no_color}\n"
             )
-            return check_instance.type, "skipped"
+            return check_instance.type, "skipped", output
         elif require_all and check_instance.type == "Recommendation":
             # Convert the check to a requirement because --require-all is set.
             check_instance.convert_to_requirement()
 
         # Run the check on normal mode.
-        log(f"Running check [{check_instance.type}][{check_instance.name}] ... ")
+        check_log(f"Running check [{check_instance.type}][{check_instance.name}] ... ")
         check_instance.log_enabled = log_enabled
-        if (check_instance.pre_check() and check_instance.check()) or (
+        if failed_prerequisites:
+            # Do not repeat the I/O (and the report) of the failed prerequisites.
+            check_instance.log(
+                f"Prerequisite check(s) failed: {', '.join(failed_prerequisites)}."
+            )
+        elif (check_instance.pre_check() and check_instance.check()) or (
             args.fix_inplace and check_instance.fix()
         ):
-            log(
+            check_log(
                 f"\tcheck [{check_instance.type}][{check_instance.name}] ... {green_color}passed{no_color}\n"
             )
-            return check_instance.type, "passed"
-        else:
-            log(
-                f"\tcheck [{check_instance.type}][{check_instance.name}] ... {red_color}failed{no_color}\n"
+            return check_instance.type, "passed", output
+        elif args.fix_dry_run and check_instance.fix():
+            # The fix is only printed: the files on disk still fail the check.
+            check_log(
+                f"\tcheck [{check_instance.type}][{check_instance.name}] ... {red_color}failed (fixable){no_color}\n"
             )
-            return check_instance.type, "failed"
+            return check_instance.type, "failed", output
+
+        check_log(
+            f"\tcheck [{check_instance.type}][{check_instance.name}] ... {red_color}failed{no_color}\n"
+        )
+        return check_instance.type, "failed", output
+
+    # Paths changed since args.since (None: all checks are affected).
+    if changed_paths is None and args.since:
+        changed_paths = get_changed_paths(args.repo_info, args.since)
+
+    # Results of previous runs (opt-in: --cache), reused for checks whose inputs did not change.
+    # Not used with --fix-inplace / --fix-dry-run: fixes change the inputs while the checks run.
+    # Runs on a commit (--rev) and on the working tree are cached separately.
+    result_cache = (
+        ResultCache(
+            args.repo_info["top_level"],
+            options=(args.verbose, args.require_all, args.output, args.rev is not None),
+        )
+        if args.cache and not fixing
+        else None
+    )
+
+    def report_unchanged(check_instance, output):
+        """
+        Helper function to report a check as unchanged, without running it.
+        """
+        if args.require_all and check_instance.type == "Recommendation":
+            check_instance.convert_to_requirement()
+        if args.verbose and not ndjson:
+            output.append(
+                f"Running check [{check_instance.type}][{check_instance.name}] ... {gray_color}unchanged{no_color}\n"
+            )
+        return check_instance.type, "unchanged", output
+
+    def run_check_buffered(check_instance):
+        """
+        Helper function to run a check, collecting its logs for ordered output.
+        The result is reused from the result cache if the check inputs did not change.
+        With --since, checks not affected by the changed paths are reported as unchanged.
+        With --output ndjson, the record of the check is written as soon as it finishes.
+        """
+        started = time.perf_counter()
+        with trace_span(check_instance.name, "pipeline"):
+            if memory_profiler is None:
+                result = get_check_result(check_instance)
+            else:
+                with memory_profiler.measure(check_instance.name):
+                    result = get_check_result(check_instance)
+        if stop is not None and result[:2] == ("Requirement", "failed"):
+            stop.set()
+        if ndjson:
+            write_check_record(check_instance, result, started)
+        return result
+
+    def get_check_result(check_instance):
+        """
+        Helper function to get the result of a check: reused, cached or from a new run.
+        """
+        if changed_paths is not None and not check_instance.is_affected_by(
+            changed_paths
+        ):
+            if previous_results is None:
+                return report_unchanged(check_instance, output=[])
+            if check_instance.name in previous_results:
+                check_type, status, output = previous_results[check_instance.name]
+                return check_type, status, list(output)
+            # Incremental run, but no previous result (e.g., newly selected check): run it.
+
+        # Prerequisites ran before (in the same lane): fail without running if any of them failed.
+        failed_prerequisites = [
+            prerequisite
+            for prerequisite in check_instance.depends_on
+            if prerequisite in check_results
+            and check_results[prerequisite][1] == "failed"
+        ]
+        if failed_prerequisites:
+            result = run_check(
+                check_instance,
+                output=[],
+                failed_prerequisites=failed_prerequisites,
+            )
+        elif result_cache is None:
+            result = run_check(check_instance, output=[])
+        else:
+            fingerprint = check_instance.fingerprint()
+            result = result_cache.get(check_instance.name, fingerprint)
+            if result is None:
+                result = run_check(check_instance, output=[])
+                result_cache.put(check_instance.name, fingerprint, result)
+
+        if previous_results is not None:
+            previous_results[check_instance.name] = result
+        check_results[check_instance.name] = result
+        return result
+
+    # Check name -> result of the checks of this run, for their dependents.
+    check_results = {}
+
+    def fix_lane(check_instance):
+        """
+        Helper function to get the lane of a check: checks from the same lane run sequentially.
+        With --fix-inplace / --fix-dry-run, all checks on the same file share a lane, so its edits are applied in order.
+        """
+        if fixing and isinstance(check_instance, FileBaseCheck):
+            return str(check_instance.path)
+        return id(check_instance)
 
     def run_pipeline_helper():
         """
         Helper function to run the pipeline.
         """
+        # Walk the repository tree once - all checks share the same snapshot
+        # and the same file content cache.
+        # Incremental runs keep them warm (the caller refreshes the changed paths).
+        # Only the state of this repository is dropped: the daemon keeps the other repositories warm.
+        if changed_paths is None or previous_results is None:
+            clear_repository_snapshots(args.repo_info["top_level"])
+            clear_file_content_cache(args.repo_info["top_level"])
+        # With --rev, the tree of the commit is read from the object database instead.
+        get_repository_snapshot(
+            args.repo_info["top_level"],
+            args.tracked_files,
+            args.repo_info["commit_hash"] if args.rev is not None else None,
+        )
+        if fixing:
+            start_fix_overlay(args.repo_info["top_level"])
+
         # Internal checks
         if args.fix_inplace:
-            run_check(DisallowFixInplaceAndUnstagedChangesCheck, log_enabled=True)
+            internal_check = DisallowFixInplaceAndUnstagedChangesCheck(
+                args.repo_info, beman_standard_check_config
+            )
+            if ndjson:
+                started = time.perf_counter()
+                result = run_check(internal_check, output=[])
+                write_check_record(internal_check, result, started)
+            else:
+                run_check(internal_check, log_enabled=True)
 
-        implemented_checks = get_registered_beman_standard_checks()
+        # Implemented checks, from the manifest: only the modules of the checks to run are imported.
+        implemented_checks = get_all_beman_standard_check_names()
         all_checks = beman_standard_check_config
 
         # All checks from the Beman Standard.
@@ -123,19 +372,60 @@ def run_checks_pipeline(checks_to_run, args, beman_standard_check_config):
             "Requirement": 0,
             "Recommendation": 0,
         }
+        # All implemented checks that were not affected by the changes (--since).
+        cnt_unchanged_checks = {
+            "Requirement": 0,
+            "Recommendation": 0,
+        }
+        # All implemented checks that were not run because a requirement failed before (--fail-fast).
+        cnt_cancelled_checks = {
+            "Requirement": 0,
+            "Recommendation": 0,
+        }
 
         # Run the checks.
-        for check_name in checks_to_run:
-            if check_name not in implemented_checks:
+        check_instances = [
+            get_beman_standard_check_by_name(check_name)(
+                args.repo_info, beman_standard_check_config
+            )
+            for check_name in checks_to_run
+            if check_name in implemented_checks
+        ]
+        if stop is not None:
+            # Cheapest checks first, so failures show up quickly (stable: same cost, same order).
+            check_instances.sort(
+                key=lambda check_instance: check_instance.estimated_cost()
+            )
+        check_instances = order_by_dependencies(check_instances)
+        lane = dependency_lanes(check_instances, fix_lane)
+        # With --memory-profile, checks run one at a time: tracemalloc traces the whole process.
+        jobs = args.jobs if memory_profiler is None else 1
+        for check_instance, result in zip(
+            check_instances,
+            run_checks_concurrently(
+                check_instances, run_check_buffered, jobs, lane, stop
+            ),
+        ):
+            if result is None:
+                check_type = "Requirement" if args.require_all else check_instance.type
+                cnt_cancelled_checks[check_type] += 1
                 continue
 
-            check_type, status = run_check(implemented_checks[check_name])
+            check_type, status, output = result
+            # Print the logs in the same order as a serial run.
+            # With --output ndjson, the records were already written.
+            if not ndjson:
+                for line in output:
+                    print(line)
+
             if status == "passed":
                 cnt_passed_checks[check_type] += 1
             elif status == "failed":
                 cnt_failed_checks[check_type] += 1
             elif status == "skipped":
                 cnt_skipped_checks[check_type] += 1
+            elif status == "unchanged":
+                cnt_unchanged_checks[check_type] += 1
             else:
                 raise ValueError(f"Invalid status: {status}")
 
@@ -157,31 +447,61 @@ def run_checks_pipeline(checks_to_run, args, beman_standard_check_config):
             cnt_passed_checks,
             cnt_failed_checks,
             cnt_skipped_checks,
+            cnt_unchanged_checks,
+            cnt_cancelled_checks,
             cnt_all_beman_standard_checks,
             cnt_implemented_checks,
             cnt_not_implemented_checks,
         )
 
     log("beman-tidy pipeline started ...\n")
-    (
-        cnt_passed_checks,
-        cnt_failed_checks,
-        cnt_skipped_checks,
-        cnt_all_beman_standard_checks,
-        cnt_implemented_checks,
-        cnt_not_implemented_checks,
-    ) = run_pipeline_helper()
+    if memory_profiler is not None:
+        memory_profiler.start()
+    with trace_span(
+        "run_checks_pipeline", "pipeline", repository=str(args.repo_info["top_level"])
+    ):
+        try:
+            (
+                cnt_passed_checks,
+                cnt_failed_checks,
+                cnt_skipped_checks,
+                cnt_unchanged_checks,
+                cnt_cancelled_checks,
+                cnt_all_beman_standard_checks,
+                cnt_implemented_checks,
+                cnt_not_implemented_checks,
+            ) = run_pipeline_helper()
+        except BaseException:
+            # e.g., sys.exit() from a check: the fixes of the run are dropped,
+            # so they do not leak into the next run of the process (e.g., the daemon).
+            stop_fix_overlay(args.repo_info["top_level"])
+            raise
+    if memory_profiler is not None:
+        memory_profiler.stop()
     log("\nbeman-tidy pipeline finished.\n")
 
-    # Always print the summary.
-    print(
-        f"Summary    Requirement: {green_color} {cnt_passed_checks['Requirement']} checks passed{no_color}, {red_color}{cnt_failed_checks['Requirement']} checks failed{no_color}, {gray_color}{cnt_skipped_checks['Requirement']} checks skipped, {no_color} {cnt_not_implemented_checks['Requirement']} checks not implemented."
-    )
-    print(
-        f"Summary Recommendation: {green_color} {cnt_passed_checks['Recommendation']} checks passed{no_color}, {red_color}{cnt_failed_checks['Recommendation']} checks failed{no_color}, {gray_color}{cnt_skipped_checks['Recommendation']} checks skipped, {no_color} {cnt_not_implemented_checks['Recommendation']} checks not implemented."
-    )
+    # Apply the fixes, once per file - or only print them with --fix-dry-run.
+    fix_overlay = stop_fix_overlay(args.repo_info["top_level"])
+    if fix_overlay is not None and args.fix_dry_run:
+        fix_diff = fix_overlay.diff()
+        if ndjson:
+            write_record(
+                {
+                    "record": "diff",
+                    "repository": str(args.repo_info["top_level"]),
+                    "diff": fix_diff,
+                }
+            )
+        elif fix_diff:
+            print(fix_diff)
+    elif fix_overlay is not None:
+        try:
+            fix_overlay.flush()
+        except OSError as e:
+            print(f"Cannot write the fixes: {e}")
+            sys.exit(1)
 
-    # Always print the coverage.
+    # Compute the coverage.
     cnt_passed_requirement = (
         cnt_passed_checks["Requirement"] + cnt_skipped_checks["Requirement"]
         if not args.require_all
@@ -223,25 +543,232 @@ def run_checks_pipeline(checks_to_run, args, beman_standard_check_config):
     )
     total_implemented = total_implemented_requirement + total_implemented_recommendation
     total_coverage = round((total_passed) / (total_implemented) * 100, 2)
-    print(
-        f"\n{calculate_coverage_color(coverage_requirement)}Coverage    Requirement: {coverage_requirement:{6}.2f}% ({cnt_passed_requirement}/{total_implemented_requirement} checks passed).{no_color}"
+    total_cnt_failed = cnt_failed_checks["Requirement"] + (
+        cnt_failed_checks["Recommendation"] if args.require_all else 0
+    )
+
+    # Partial run (checks unchanged with --since, or cancelled with --fail-fast):
+    # the coverage would be misleading, so it is not published.
+    cnt_unchanged = sum(cnt_unchanged_checks.values())
+    cnt_cancelled = sum(cnt_cancelled_checks.values())
+    partial = cnt_unchanged > 0 or cnt_cancelled > 0
+
+    pipeline_summary = {
+        "passed": cnt_passed_checks,
+        "failed": cnt_failed_checks,
+        "skipped": cnt_skipped_checks,
+        "unchanged": cnt_unchanged_checks,
+        "not_implemented": cnt_not_implemented_checks,
+        "partial": partial,
+        "total_passed": total_passed,
+        "total_implemented": total_implemented,
+        "total_failed": total_cnt_failed,
+    }
+    if not partial:
+        pipeline_summary["coverage"] = {
+            "Requirement": coverage_requirement,
+            "Recommendation": coverage_recommendation,
+            "TOTAL": total_coverage,
+        }
+    if args.fail_fast:
+        pipeline_summary["cancelled"] = cnt_cancelled_checks
+    if summary is not None:
+        summary.update(pipeline_summary)
+
+    if ndjson:
+        write_record(
+            {
+                "record": "summary",
+                "repository": str(args.repo_info["top_level"]),
+                **pipeline_summary,
+            }
+        )
+        if profiler is not None:
+            disable_profiler()
+            write_record(
+                {
+                    "record": "profile",
+                    "repository": str(args.repo_info["top_level"]),
+                    "checks": profiler.report(),
+                }
+            )
+        if memory_profiler is not None:
+            write_record(
+                {
+                    "record": "memory_profile",
+                    "repository": str(args.repo_info["top_level"]),
+                    "checks": memory_profiler.report(),
+                }
+            )
+        return total_cnt_failed
+
+    # Always print the summary.
+    # With --since, also print the checks not affected by the changes.
+    unchanged_requirement = (
+        f"{gray_color}{cnt_unchanged_checks['Requirement']} checks unchanged, {no_color}"
+        if args.since
+        else ""
+    )
+    unchanged_recommendation = (
+        f"{gray_color}{cnt_unchanged_checks['Recommendation']} checks unchanged, {no_color}"
+        if args.since
+        else ""
+    )
+    # With --fail-fast, also print the checks cancelled after the first failed requirement.
+    cancelled_requirement = (
+        f"{gray_color}{cnt_cancelled_checks['Requirement']} checks cancelled, {no_color}"
+        if cnt_cancelled > 0
+        else ""
+    )
+    cancelled_recommendation = (
+        f"{gray_color}{cnt_cancelled_checks['Recommendation']} checks cancelled, {no_color}"
+        if cnt_cancelled > 0
+        else ""
     )
     print(
-        f"{calculate_coverage_color(coverage_recommendation, no_color=args.require_all)}Coverage Recommendation: {coverage_recommendation:{6}.2f}% ({cnt_passed_recommendation}/{total_implemented_recommendation} checks passed).{no_color}"
+        f"Summary    Requirement: {green_color} {cnt_passed_checks['Requirement']} checks passed{no_color}, {red_color}{cnt_failed_checks['Requirement']} checks failed{no_color}, {gray_color}{cnt_skipped_checks['Requirement']} checks skipped, {no_color}{unchanged_requirement}{cancelled_requirement} {cnt_not_implemented_checks['Requirement']} checks not implemented."
     )
     print(
-        f"{calculate_coverage_color(total_coverage)}Coverage          TOTAL: {total_coverage:{6}.2f}% ({total_passed}/{total_implemented} checks passed).{no_color}"
+        f"Summary Recommendation: {green_color} {cnt_passed_checks['Recommendation']} checks passed{no_color}, {red_color}{cnt_failed_checks['Recommendation']} checks failed{no_color}, {gray_color}{cnt_skipped_checks['Recommendation']} checks skipped, {no_color}{unchanged_recommendation}{cancelled_recommendation} {cnt_not_implemented_checks['Recommendation']} checks not implemented."
     )
+
+    if cnt_cancelled > 0:
+        # Partial run: the coverage would be misleading.
+        print(
+            f"\n{red_color}Stopped after the first failed requirement (--fail-fast): {cnt_cancelled} checks cancelled.{no_color}"
+        )
+    elif partial:
+        # Partial run: the coverage would be misleading.
+        print(
+            f"\n{gray_color}Partial run (--since): {cnt_unchanged} checks unchanged, coverage not computed.{no_color}"
+        )
+    else:
+        # Always print the coverage (unless the run is partial: --fail-fast, --since).
+        print(
+            f"\n{calculate_coverage_color(coverage_requirement)}Coverage    Requirement: {coverage_requirement:{6}.2f}% ({cnt_passed_requirement}/{total_implemented_requirement} checks passed).{no_color}"
+        )
+        print(
+            f"{calculate_coverage_color(coverage_recommendation, no_color=args.require_all)}Coverage Recommendation: {coverage_recommendation:{6}.2f}% ({cnt_passed_recommendation}/{total_implemented_recommendation} checks passed).{no_color}"
+        )
+        print(
+            f"{calculate_coverage_color(total_coverage)}Coverage          TOTAL: {total_coverage:{6}.2f}% ({total_passed}/{total_implemented} checks passed).{no_color}"
+        )
     # else:
     #     print("Note: RECOMMENDATIONs are not included (--require-all NOT set).")
-    total_cnt_failed = cnt_failed_checks["Requirement"] + (
-        cnt_failed_checks["Recommendation"] if args.require_all else 0
-    )
+
+    # With --profile, print the cost of each check (most expensive first).
+    if profiler is not None:
+        disable_profiler()
+        profiler.print_report()
+    # With --memory-profile, print the memory of each check (largest peak first).
+    if memory_profiler is not None:
+        memory_profiler.print_report()
 
     sys.stdout.flush()
     return total_cnt_failed
 
 
+def order_by_dependencies(check_instances):
+    """
+    Order the checks so that each check comes after its prerequisites (topological order).
+    Otherwise, the original order is kept. Prerequisites which are not part of the run are ignored.
+    """
+    by_name = {
+        check_instance.name: check_instance for check_instance in check_instances
+    }
+    ordered = []
+    # Check name -> True once ordered, False while its prerequisites are being ordered.
+    state = {}
+
+    def visit(check_instance, path):
+        if state.get(check_instance.name) is True:
+            return
+        if state.get(check_instance.name) is False:
+            raise ValueError(
+                f"Dependency cycle between checks: {' -> '.join(path + [check_instance.name])}"
+            )
+        state[check_instance.name] = False
+        for prerequisite in check_instance.depends_on:
+            if prerequisite in by_name:
+                visit(by_name[prerequisite], path + [check_instance.name])
+        state[check_instance.name] = True
+        ordered.append(check_instance)
+
+    for check_instance in check_instances:
+        visit(check_instance, [])
+    return ordered
+
+
+def dependency_lanes(check_instances, lane=id):
+    """
+    Returns a lane function where each check shares the lane of its prerequisites
+    (and of the checks from the same given lane - e.g., the same file with --fix-inplace).
+    Lanes run sequentially in the original order, so prerequisites finish before their dependents.
+    """
+    # Union-find over the checks and the given lanes.
+    parent = {}
+
+    def find(key):
+        while parent.setdefault(key, key) != key:
+            key = parent[key]
+        return key
+
+    def union(a, b):
+        parent[find(a)] = find(b)
+
+    names = {check_instance.name for check_instance in check_instances}
+    for check_instance in check_instances:
+        union(("check", check_instance.name), ("lane", lane(check_instance)))
+        for prerequisite in check_instance.depends_on:
+            if prerequisite in names:
+                union(("check", check_instance.name), ("check", prerequisite))
+
+    return lambda check_instance: find(("check", check_instance.name))
+
+
+def run_checks_concurrently(check_instances, run_check, jobs=1, lane=id, stop=None):
+    """
+    Run the checks on a thread pool of the given size and yield their results
+    in the original order, as soon as all the previous checks are done.
+
+    Checks from the same lane (e.g., lane(check) returns the same file path) run
+    sequentially and in the original order. Checks from different lanes overlap.
+
+    If stop (a threading.Event) is set, no new check starts: the checks already running
+    finish, and None is yielded for each cancelled check.
+    """
+    if jobs <= 1:
+        for check_instance in check_instances:
+            yield (
+                run_check(check_instance) if stop is None or not stop.is_set() else None
+            )
+        return
+
+    # Imported on demand: serial runs (the default) do not need a thread pool.
+    from concurrent.futures import Future, ThreadPoolExecutor
+
+    lanes = {}
+    for index, check_instance in enumerate(check_instances):
+        lanes.setdefault(lane(check_instance), []).append(index)
+    results = [Future() for _ in check_instances]
+
+    def run_lane(indices):
+        for index in indices:
+            if stop is not None and stop.is_set():
+                results[index].set_result(None)
+                continue
+            try:
+                results[index].set_result(run_check(check_instances[index]))
+            except BaseException as e:
+                results[index].set_exception(e)
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        for indices in lanes.values():
+            executor.submit(run_lane, indices)
+        for result in results:
+            yield result.result()
+
+
 def calculate_coverage_color(coverage, no_color=False):
     """
     Returns the colour for the coverage print based on severity
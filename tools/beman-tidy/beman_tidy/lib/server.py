@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import contextlib
+import io
+import json
+import os
+import socket
+from pathlib import Path
+
+from .pipeline import get_pipeline_args, run_checks_pipeline
+from .utils.cache import get_cache_dir, get_file_content_cache
+from .utils.filesystem import get_repository_snapshot
+from .utils.git import get_repo_info, load_beman_standard_config
+from .watch import create_watcher, read_changes
+
+# Protocol version, sent back by "ping". Bump it on incompatible changes of the requests / responses.
+PROTOCOL_VERSION = 1
+
+
+def get_default_socket_path():
+    """
+    Get the default socket path of the beman-tidy daemon:
+    $XDG_RUNTIME_DIR/beman-tidy.sock, or beman-tidy.sock in the cache directory.
+    """
+    if os.environ.get("XDG_RUNTIME_DIR"):
+        return Path(os.environ["XDG_RUNTIME_DIR"]) / "beman-tidy.sock"
+    return get_cache_dir() / "beman-tidy.sock"
+
+
+class RepositoryState:
+    """
+    Warm state of a repository served by the daemon: a filesystem watcher, used to refresh
+    the repository snapshot before each request, and the latest results for each set of options.
+    """
+
+    def __init__(self, top_level):
+        self.top_level = top_level
+        self.watcher = create_watcher(top_level)
+        # (verbose, require_all, output) -> {check name: (type, status, logs)}
+        self.results = {}
+        # (verbose, require_all, output) -> paths changed since these results were computed.
+        self.pending_changes = {}
+
+    def update(self):
+        """
+        Apply the filesystem changes since the previous request to the repository snapshot.
+        Events are queued by the kernel (inotify) or found by a scan (polling), so none is missed.
+        """
+        self.watcher, changed_paths = read_changes(self.watcher, timeout=0)
+        get_repository_snapshot(self.top_level).refresh(*changed_paths)
+        for path in changed_paths:
+            get_file_content_cache().invalidate(path)
+        for pending in self.pending_changes.values():
+            pending.update(changed_paths)
+
+    def reset(self):
+        """
+        Forget all the results - e.g., after fixes.
+        """
+        self.watcher, _ = read_changes(self.watcher, timeout=0)
+        self.results.clear()
+        self.pending_changes.clear()
+
+    def close(self):
+        self.watcher.close()
+
+
+class BemanTidyServer:
+    """
+    The beman-tidy daemon: keeps the config and the per-repository state warm and answers lint requests.
+
+    Protocol: one JSON object per line, on a Unix domain socket. Requests:
+    - {"command": "ping"}
+    - {"command": "lint", "repo_path": "...", "checks": [...] or null,
+       "fix_inplace": false, "fix_dry_run": false, "verbose": false, "require_all": false, "output": "text"}
+    - {"command": "shutdown"}
+    Responses: {"status": "ok", ...} or {"status": "error", "error": "..."}.
+    """
+
+    def __init__(self, socket_path, beman_standard_check_config=None):
+        self.socket_path = Path(socket_path)
+        self.beman_standard_check_config = (
+            beman_standard_check_config
+            if beman_standard_check_config is not None
+            else load_beman_standard_config()
+        )
+        # Top-level directory -> RepositoryState.
+        self.repositories = {}
+        self.running = False
+
+    def handle(self, request):
+        """
+        Handle a single request and return the response.
+        """
+        command = request.get("command")
+        if command == "ping":
+            return {"status": "ok", "protocol_version": PROTOCOL_VERSION}
+        if command == "shutdown":
+            self.running = False
+            return {"status": "ok"}
+        if command == "lint":
+            return self.lint(request)
+        return {"status": "error", "error": f"Unknown command: {command}"}
+
+    def lint(self, request):
+        """
+        Run the checks pipeline for a repository, incrementally if its state is warm.
+        """
+        output = io.StringIO()
+        summary = {}
+        with contextlib.redirect_stdout(output):
+            try:
+                repo_info = get_repo_info(request["repo_path"])
+            except SystemExit:
+                # e.g., not a git repository - the reason was printed.
+                return {"status": "error", "error": output.getvalue().strip()}
+
+            args = get_pipeline_args(
+                repo_info,
+                fix_inplace=request.get("fix_inplace", False),
+                fix_dry_run=request.get("fix_dry_run", False),
+                verbose=request.get("verbose", False),
+                require_all=request.get("require_all", False),
+                output=request.get("output", "text"),
+                fail_fast=request.get("fail_fast", False),
+            )
+            args.repo_path = request["repo_path"]
+            args.checks = request.get("checks")
+            checks_to_run = (
+                list(self.beman_standard_check_config)
+                if args.checks is None
+                else args.checks
+            )
+
+            top_level = str(repo_info["top_level"])
+            state = self.repositories.get(top_level)
+            if state is None:
+                state = self.repositories[top_level] = RepositoryState(top_level)
+            state.update()
+
+            key = (args.verbose, args.require_all, args.output)
+            results = state.results.get(key)
+            fixing = args.fix_inplace or args.fix_dry_run
+            try:
+                if results is None or fixing:
+                    # Cold (or fixing): walk the tree and run all the checks.
+                    results = {}
+                    exit_status = run_checks_pipeline(
+                        checks_to_run,
+                        args,
+                        self.beman_standard_check_config,
+                        summary,
+                        previous_results=results,
+                    )
+                    if fixing:
+                        # Fixes changed the files (or the results, with --fix-dry-run): the next request starts cold.
+                        state.reset()
+                    else:
+                        state.results[key] = results
+                        state.pending_changes[key] = set()
+                else:
+                    # Warm: run only the checks affected by the changes since these results.
+                    changed_paths = sorted(state.pending_changes[key])
+                    state.pending_changes[key] = set()
+                    exit_status = run_checks_pipeline(
+                        checks_to_run,
+                        args,
+                        self.beman_standard_check_config,
+                        summary,
+                        changed_paths=changed_paths,
+                        previous_results=results,
+                    )
+            except SystemExit:
+                # e.g., --fix-inplace with unstaged changes, or fixes that cannot be written: the daemon
+                # keeps running, the reason was printed. The partial results are dropped.
+                state.reset()
+                return {"status": "error", "error": output.getvalue().strip()}
+
+        return {
+            "status": "ok",
+            "exit_status": exit_status,
+            "checks": [
+                {
+                    "name": name,
+                    "type": results[name][0],
+                    "status": results[name][1],
+                    "messages": results[name][2],
+                }
+                for name in checks_to_run
+                if name in results
+            ],
+            "summary": summary,
+            "output": output.getvalue(),
+        }
+
+    def serve_forever(self):
+        """
+        Listen on the socket and answer requests (one connection at a time) until shutdown.
+        """
+        if self.socket_path.exists():
+            try:
+                send_request(self.socket_path, {"command": "ping"})
+                raise RuntimeError(
+                    f"A daemon is already listening on {self.socket_path}"
+                )
+            except OSError:
+                # Stale socket from a previous daemon.
+                self.socket_path.unlink()
+
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server_socket:
+            # Only the current user can connect.
+            umask = os.umask(0o177)
+            try:
+                server_socket.bind(str(self.socket_path))
+            finally:
+                os.umask(umask)
+            server_socket.listen()
+
+            self.running = True
+            try:
+                while self.running:
+                    connection, _ = server_socket.accept()
+                    with connection:
+                        self.handle_connection(connection)
+            finally:
+                self.socket_path.unlink(missing_ok=True)
+                for state in self.repositories.values():
+                    state.close()
+
+    def handle_connection(self, connection):
+        """
+        Answer the requests of a connection, one JSON object per line.
+        """
+        with connection.makefile("rwb") as stream:
+            for line in stream:
+                try:
+                    response = self.handle(json.loads(line))
+                except (Exception, SystemExit) as e:
+                    # A request never stops the daemon (only the shutdown command does).
+                    response = {"status": "error", "error": f"{type(e).__name__}: {e}"}
+                stream.write(json.dumps(response).encode() + b"\n")
+                stream.flush()
+                if not self.running:
+                    break
+
+
+def send_request(socket_path, request):
+    """
+    Send a request to the beman-tidy daemon and return its response.
+    Raises OSError if no daemon is listening.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client_socket:
+        client_socket.connect(str(socket_path))
+        with client_socket.makefile("rwb") as stream:
+            stream.write(json.dumps(request).encode() + b"\n")
+            stream.flush()
+            return json.loads(stream.readline())
+
+
+def serve(socket_path=None):
+    """
+    Run the beman-tidy daemon on the given socket (default: get_default_socket_path()).
+    """
+    socket_path = socket_path if socket_path is not None else get_default_socket_path()
+    print(f"beman-tidy daemon listening on {socket_path} ...", flush=True)
+    try:
+        BemanTidyServer(socket_path).serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import functools
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from .profile import count
+
+# Default byte budget for the file content cache: 64 MiB.
+DEFAULT_FILE_CONTENT_CACHE_BUDGET = 64 * 1024 * 1024
+
+
+class FileContentCache:
+    """
+    LRU cache for file contents, shared by all check instances in a run.
+
+    Entries are keyed by the absolute path plus the stat signature of the file
+    (mtime, size, inode), so a file changed on disk is never served stale.
+    The cache is bounded by a byte budget - least recently used entries are evicted first.
+    """
+
+    def __init__(self, budget=DEFAULT_FILE_CONTENT_CACHE_BUDGET):
+        self.budget = budget
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        # Absolute path -> (stat signature, content, size).
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _signature(stat):
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def read(self, path):
+        """
+        Read the file content (text mode), from the cache if the file did not change.
+        Raises OSError / UnicodeDecodeError like open().read().
+        """
+        key = os.path.abspath(path)
+        count("stats")
+        signature = self._signature(os.stat(key))
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        count("opens")
+        with open(key, "r") as file:
+            content = file.read()
+        count("bytes_read", signature[1])
+
+        with self._lock:
+            self._remove(key)
+            size = signature[1]
+            if size <= self.budget:
+                self._entries[key] = (signature, content, size)
+                self.size += size
+                self._evict()
+
+        return content
+
+    def invalidate(self, path):
+        """
+        Drop the cached content of the given file - e.g., after writing it.
+        """
+        with self._lock:
+            self._remove(os.path.abspath(path))
+
+    def invalidate_tree(self, root):
+        """
+        Drop the cached contents of all the files under the given directory - e.g., a repository at the beginning
+        of a new run, without touching the contents of the other repositories of the process (e.g., the daemon).
+        """
+        prefix = os.path.join(os.path.abspath(root), "")
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                self._remove(key)
+
+    def clear(self):
+        """
+        Drop all cached contents.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+            self.hits = 0
+            self.misses = 0
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry[2]
+
+    def _evict(self):
+        while self.size > self.budget and self._entries:
+            _, (_, _, size) = self._entries.popitem(last=False)
+            self.size -= size
+
+
+# File content cache for the current run.
+_file_content_cache = FileContentCache()
+
+
+def get_file_content_cache():
+    """
+    Get the file content cache shared by all check instances in the current run.
+    """
+    return _file_content_cache
+
+
+def clear_file_content_cache(repo_path=None):
+    """
+    Drop all cached file contents - or only those of the given repository path - e.g., at the beginning of a new run.
+    """
+    if repo_path is None:
+        _file_content_cache.clear()
+    else:
+        _file_content_cache.invalidate_tree(repo_path)
+
+
+def get_cache_dir():
+    """
+    Get the beman-tidy on-disk cache directory:
+    $BEMAN_TIDY_CACHE_DIR, $XDG_CACHE_HOME/beman-tidy or ~/.cache/beman-tidy.
+    """
+    if os.environ.get("BEMAN_TIDY_CACHE_DIR"):
+        return Path(os.environ["BEMAN_TIDY_CACHE_DIR"])
+    if os.environ.get("XDG_CACHE_HOME"):
+        return Path(os.environ["XDG_CACHE_HOME"]) / "beman-tidy"
+    return Path.home() / ".cache" / "beman-tidy"
+
+
+class DiskCache:
+    """
+    On-disk cache of pickled values, shared by all beman-tidy runs.
+    e.g., DiskCache("config").get(key) returns the value stored by a previous run, or None.
+
+    The cache is best effort: unreadable, corrupted or unwritable entries are treated as misses.
+    Entries are written atomically (temporary file + rename), so concurrent runs never read partial entries.
+    """
+
+    def __init__(self, namespace, directory=None):
+        self.directory = Path(directory or get_cache_dir()) / namespace
+
+    def _entry_path(self, key):
+        return self.directory / f"{key}.pickle"
+
+    def get(self, key):
+        """
+        Get the value stored for the given key, or None.
+        """
+        try:
+            with open(self._entry_path(key), "rb") as file:
+                return pickle.load(file)
+        except Exception:
+            return None
+
+    def put(self, key, value):
+        """
+        Store the value for the given key. Returns True if the value was stored.
+        """
+        import tempfile
+
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as file:
+                    pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, self._entry_path(key))
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+            return True
+        except Exception:
+            return False
+
+
+@functools.cache
+def get_beman_tidy_fingerprint():
+    """
+    Get a digest of the beman-tidy sources and data files (e.g., checks, .beman-standard.yml, LICENSE).
+    Cached results are valid only for the same beman-tidy version. Computed once per process.
+    """
+    package_path = Path(__file__).parent.parent.parent
+    digest = hashlib.sha256()
+    for path in sorted(package_path.rglob("*")):
+        if path.is_file() and "__pycache__" not in path.parts:
+            digest.update(str(path.relative_to(package_path)).encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    On-disk cache of check results, keyed by repository and check.
+    Each entry stores the fingerprint of the check inputs (see BaseCheck.fingerprint()) and the result:
+    a result is reused only if the fingerprint did not change since it was stored.
+    """
+
+    def __init__(self, repo_path, options=(), directory=None):
+        self.disk_cache = DiskCache("results", directory)
+        # Everything a result depends on, besides the check inputs - e.g., the CLI options.
+        self.scope = repr(
+            (os.path.abspath(repo_path), tuple(options), get_beman_tidy_fingerprint())
+        )
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, check_name):
+        return hashlib.sha256(f"{self.scope}:{check_name}".encode()).hexdigest()
+
+    def get(self, check_name, fingerprint):
+        """
+        Get the result stored for the check, or None if missing or stale.
+        """
+        entry = self.disk_cache.get(self._key(check_name))
+        if entry is None or entry["fingerprint"] != fingerprint:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry["result"]
+
+    def put(self, check_name, fingerprint, result):
+        """
+        Store the result of the check, for the given fingerprint.
+        """
+        self.disk_cache.put(
+            self._key(check_name), {"fingerprint": fingerprint, "result": result}
+        )
@@ -0,0 +1,698 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import fnmatch
+import functools
+import io
+import os
+import sys
+import threading
+from pathlib import Path
+from stat import S_ISDIR
+
+from .cache import get_file_content_cache
+from .git import GitObjectReader, list_git_files, list_git_tree
+from .profile import count, trace_span
+
+# Per-repository config file (at the top level) - e.g., with additional excluded directories.
+REPOSITORY_CONFIG_FILE = ".beman-tidy.yml"
+
+# Above this number of changed paths, refresh() lists the whole tree again instead of each path.
+REFRESH_RELIST_THRESHOLD = 1000
+
+
+class ExcludeRules:
+    """
+    Directory exclusion rules, as path components compiled once into a prefix trie.
+    e.g., ExcludeRules(["tests", "build/_deps", "/infra"]):
+    - "tests" excludes any directory named tests (but not mytests/), at any depth.
+    - "build/_deps" excludes a _deps directory directly inside a build directory, at any depth.
+    - "/infra" (leading slash) excludes only the top-level infra directory.
+
+    Directories are matched top-down: the verdict (and trie state) of a directory is derived from its parent,
+    so each directory is matched once, in O(1) per component, whatever the number of rules.
+    """
+
+    # Trie key marking the end of a rule.
+    _END = None
+
+    def __init__(self, rules=()):
+        self.rules = list(rules)
+        # Rules anchored at the root, and rules matching at any depth.
+        self._anchored = {}
+        self._floating = {}
+        for rule in self.rules:
+            anchored = rule.startswith("/")
+            components = [c for c in rule.strip("/").split("/") if c]
+            if not components:
+                continue
+            node = self._anchored if anchored else self._floating
+            for component in components:
+                node = node.setdefault(component, {})
+            node[self._END] = True
+
+        # Root-relative POSIX directory -> (trie nodes reached by the directory, excluded).
+        self._directories = {"": ((self._anchored,), False)}
+        self._lock = threading.Lock()
+
+    def __bool__(self):
+        return bool(self._anchored or self._floating)
+
+    def _match(self, relative_dir):
+        state = self._directories.get(relative_dir)
+        if state is not None:
+            return state
+
+        parent, _, name = relative_dir.rpartition("/")
+        parent_nodes, parent_excluded = self._match(parent)
+        if parent_excluded:
+            state = ((), True)
+        else:
+            nodes = tuple(
+                node[name] for node in parent_nodes + (self._floating,) if name in node
+            )
+            state = (nodes, any(self._END in node for node in nodes))
+        with self._lock:
+            self._directories[relative_dir] = state
+        return state
+
+    def excludes(self, relative_dir):
+        """
+        Check if the given root-relative POSIX directory is excluded (by itself or by one of its parents).
+        """
+        return self._match(relative_dir)[1]
+
+
+@functools.cache
+def get_exclude_rules(rules):
+    """
+    Get the compiled rules for the given tuple of rules - e.g., the directories excluded by a check.
+    """
+    return ExcludeRules(rules)
+
+
+def load_repository_config(root):
+    """
+    Load the per-repository config file (root/.beman-tidy.yml), if any - e.g.:
+    exclude_dirs:
+      - third_party
+      - /build
+    Returns {} if the repository has no config file.
+    """
+    path = os.path.join(root, REPOSITORY_CONFIG_FILE)
+    try:
+        with open(path, "rb") as file:
+            content = file.read()
+    except OSError:
+        return {}
+    return parse_repository_config(content, root)
+
+
+def parse_repository_config(content, root):
+    """
+    Parse and validate the content of a per-repository config file (see load_repository_config()).
+    """
+    # Imported on demand: PyYAML is slow to import and most repositories have no config file.
+    import yaml
+
+    try:
+        config = yaml.safe_load(content) or {}
+        exclude_dirs = config.get("exclude_dirs", [])
+        if not isinstance(exclude_dirs, list) or not all(
+            isinstance(rule, str) for rule in exclude_dirs
+        ):
+            raise ValueError("exclude_dirs must be a list of paths")
+    except Exception as error:
+        print(f"Invalid {REPOSITORY_CONFIG_FILE} in {root}: {error}")
+        sys.exit(1)
+    return config
+
+
+class RepositorySnapshot:
+    """
+    In-memory view of a repository tree, built with a single os.scandir() walk.
+    With tracked_only (the default), the view has only the files git tracks or would track,
+    listed from the index by a single `git ls-files` - i.e., no .git directory, no ignored build/ or
+    _deps/ trees. It falls back to the walk if root is not a git top level or git cannot list the files.
+    Directories excluded by the repository config (.beman-tidy.yml: exclude_dirs) are never entered.
+
+    All directory checks query the same snapshot instead of running their own
+    Path.rglob() walks, so the cost of a run scales with one walk of the tree
+    and not with the number of checks.
+
+    Queries accept paths in the same form as self.root (e.g., self.root / "docs")
+    and return paths prefixed with self.root (same shape as Path.rglob() on self.root).
+    Paths outside of self.root are answered from the filesystem.
+    """
+
+    def __init__(self, root, tracked_only=True):
+        self.root = Path(root)
+        self._root_abs = os.path.abspath(self.root)
+        self.tracked_only = tracked_only and os.path.lexists(
+            os.path.join(self._root_abs, ".git")
+        )
+
+        self._lock = threading.Lock()
+        with trace_span("walk", "filesystem", root=self._root_abs):
+            self._build()
+
+    def _reset(self):
+        """
+        Drop all the indexes.
+        """
+        # All entries (files and directories), as root-relative POSIX paths.
+        self._entries = []
+        # Root-relative POSIX path -> True for directories, False for files.
+        self._is_dir = {"": True}
+        # Directory -> list of child names.
+        self._children = {"": []}
+        # Basename -> list of entries.
+        self._by_name = {}
+        # Extension (e.g., ".md") -> list of entries.
+        self._by_extension = {}
+
+    def _build(self):
+        """
+        Build all the indexes, from the git listing (if tracked_only) or from a walk of the tree.
+        """
+        self._reset()
+        self.exclude = ExcludeRules(
+            load_repository_config(self._root_abs).get("exclude_dirs", [])
+        )
+        if self.tracked_only:
+            files = list_git_files(self._root_abs)
+            if files is not None:
+                self._add_git_files(files)
+                return
+            self.tracked_only = False
+        self._walk()
+
+    def _add_git_files(self, files):
+        """
+        Add the files listed by git. Submodules are checkouts of their own: their trees are walked.
+        """
+        for relative_path, is_submodule in files:
+            if self.exclude and self.exclude.excludes(
+                relative_path if is_submodule else relative_path.rpartition("/")[0]
+            ):
+                continue
+            self._add(relative_path, is_submodule)
+            if is_submodule:
+                self._walk(relative_path)
+
+    def _walk(self, relative_root=""):
+        """
+        Walk the tree (or the given subtree) once, iteratively, without following symlinks.
+        Excluded directories are pruned: neither listed nor entered.
+        """
+        stack = [
+            (
+                relative_root,
+                os.path.join(self._root_abs, relative_root)
+                if relative_root
+                else self._root_abs,
+            )
+        ]
+        while stack:
+            relative_dir, absolute_dir = stack.pop()
+            count("dirs_walked")
+            try:
+                with os.scandir(absolute_dir) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+
+            subdirectories = []
+            for entry in entries:
+                relative_path = (
+                    f"{relative_dir}/{entry.name}" if relative_dir else entry.name
+                )
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    is_dir = False
+                if is_dir and self.exclude and self.exclude.excludes(relative_path):
+                    continue
+                self._add(relative_path, is_dir)
+                if is_dir:
+                    subdirectories.append((relative_path, entry.path))
+
+            # Reverse, so subdirectories are popped from the stack in scandir order.
+            stack.extend(reversed(subdirectories))
+
+    def _add(self, relative_path, is_dir):
+        """
+        Add a new entry to all the indexes.
+        """
+        if relative_path in self._is_dir:
+            self._is_dir[relative_path] = is_dir
+            return
+
+        parent, _, name = relative_path.rpartition("/")
+        if parent not in self._is_dir:
+            self._add(parent, True)
+
+        self._entries.append(relative_path)
+        self._is_dir[relative_path] = is_dir
+        self._children.setdefault(parent, []).append(name)
+        if is_dir:
+            self._children.setdefault(relative_path, [])
+        self._by_name.setdefault(name, []).append(relative_path)
+        dot = name.rfind(".")
+        if dot != -1:
+            self._by_extension.setdefault(name[dot:], []).append(relative_path)
+
+    def _remove(self, relative_path):
+        """
+        Remove an entry and all its descendants from all the indexes.
+        """
+        prefix = relative_path + "/"
+        removed = {
+            p for p in self._is_dir if p == relative_path or p.startswith(prefix)
+        }
+        if not removed:
+            return
+
+        self._entries = [p for p in self._entries if p not in removed]
+        for p in removed:
+            del self._is_dir[p]
+            self._children.pop(p, None)
+            name = p.rpartition("/")[2]
+            self._by_name[name].remove(p)
+            dot = name.rfind(".")
+            if dot != -1:
+                self._by_extension[name[dot:]].remove(p)
+
+        parent, _, name = relative_path.rpartition("/")
+        if name in self._children.get(parent, []):
+            self._children[parent].remove(name)
+
+    def _relative(self, path):
+        """
+        Returns the root-relative POSIX path for the given path,
+        or None if the path is outside of the snapshot.
+        """
+        path = os.path.abspath(path)
+        if path == self._root_abs:
+            return ""
+        if not path.startswith(self._root_abs + os.sep):
+            return None
+        return Path(path[len(self._root_abs) + 1 :]).as_posix()
+
+    def _to_path(self, relative_path):
+        return self.root / relative_path
+
+    def _filter_excluded(self, relative_paths, exclude):
+        """
+        Drop the entries in (or being) directories excluded by the given rules.
+        """
+        if not exclude:
+            return relative_paths
+
+        return [
+            p
+            for p in relative_paths
+            if not exclude.excludes(p if self._is_dir[p] else p.rpartition("/")[0])
+        ]
+
+    def _filter_subtree(self, relative_paths, subtree):
+        """
+        Keep only the entries strictly under the given subtree.
+        """
+        if subtree is None:
+            return relative_paths
+
+        relative_subtree = self._relative(subtree)
+        if relative_subtree is None:
+            return []
+        if relative_subtree == "":
+            return relative_paths
+
+        prefix = relative_subtree + "/"
+        return [p for p in relative_paths if p.startswith(prefix)]
+
+    def exists(self, path):
+        """
+        Check if the given path (file or directory) exists.
+        """
+        relative_path = self._relative(path)
+        if relative_path is None:
+            return Path(path).exists()
+        return relative_path in self._is_dir
+
+    def is_dir(self, path):
+        """
+        Check if the given path is a directory.
+        """
+        relative_path = self._relative(path)
+        if relative_path is None:
+            return Path(path).is_dir()
+        return self._is_dir.get(relative_path, False)
+
+    def is_file(self, path):
+        """
+        Check if the given path is a file.
+        """
+        relative_path = self._relative(path)
+        if relative_path is None:
+            return Path(path).is_file()
+        return self._is_dir.get(relative_path, True) is False
+
+    def iterdir(self, path):
+        """
+        List the direct children of the given directory (similar to Path.iterdir()).
+        """
+        relative_path = self._relative(path)
+        if relative_path is None:
+            return list(Path(path).iterdir())
+        if not self._is_dir.get(relative_path, False):
+            return []
+
+        prefix = f"{relative_path}/" if relative_path else ""
+        return [self._to_path(prefix + name) for name in self._children[relative_path]]
+
+    def _query(self, relative_paths, subtree, exclude):
+        return [
+            self._to_path(p)
+            for p in self._filter_excluded(
+                self._filter_subtree(relative_paths, subtree), exclude
+            )
+        ]
+
+    def walk(self, subtree=None, exclude=None):
+        """
+        List all entries (files and directories) under the given subtree.
+        Queries take optional ExcludeRules - e.g., exclude=get_exclude_rules(("tests", ".github")).
+        """
+        return self._query(self._entries, subtree, exclude)
+
+    def glob(self, pattern, subtree=None, exclude=None):
+        """
+        List all entries whose basename matches the pattern (similar to Path.rglob(pattern)).
+        e.g., glob("*test*"), glob("*.test.*", subtree=root / "tests/beman/exemplar")
+        """
+        if pattern == "*":
+            return self.walk(subtree, exclude)
+        if not any(c in pattern for c in "*?["):
+            return self.find_by_name(pattern, subtree, exclude)
+
+        matches = [
+            p
+            for p in self._entries
+            if fnmatch.fnmatchcase(p.rpartition("/")[2], pattern)
+        ]
+        return self._query(matches, subtree, exclude)
+
+    def find_by_extension(self, extension, subtree=None, exclude=None):
+        """
+        List all entries with the given extension (similar to Path.rglob(f"*{extension}")).
+        e.g., find_by_extension(".md")
+        """
+        matches = self._by_extension.get(extension, [])
+        return self._query(matches, subtree, exclude)
+
+    def find_by_name(self, name, subtree=None, exclude=None):
+        """
+        List all entries with the given basename (similar to Path.rglob(name)).
+        e.g., find_by_name("CMakeLists.txt")
+        """
+        matches = self._by_name.get(name, [])
+        return self._query(matches, subtree, exclude)
+
+    def read_text(self, path):
+        """
+        Read the content of the given file (text mode), through the file content cache.
+        Raises OSError / UnicodeDecodeError like open().read().
+        """
+        return get_file_content_cache().read(path)
+
+    def read_bytes(self, path):
+        """
+        Read the content of the given file (binary mode), without caching it.
+        Raises OSError like open().read().
+        """
+        count("opens")
+        with open(path, "rb") as file:
+            content = file.read()
+        count("bytes_read", len(content))
+        return content
+
+    def size(self, path):
+        """
+        Get the size (bytes) of the given file. Raises OSError like os.stat().
+        """
+        count("stats")
+        return os.stat(path).st_size
+
+    def signature(self, path):
+        """
+        Get the signature of the given path, which changes whenever the path does (e.g., for fingerprints):
+        ("dir",) for a directory, (mtime, size) for a file and ("missing",) if there is no such path.
+        """
+        try:
+            count("stats")
+            stat = os.stat(path)
+        except OSError:
+            return ("missing",)
+        if S_ISDIR(stat.st_mode):
+            return ("dir",)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def close(self):
+        """
+        Release the resources held by the snapshot, if any (e.g., at the end of a run).
+        """
+        pass
+
+    def add_file(self, path):
+        """
+        Record a file created during the run (e.g., by --fix-inplace).
+        """
+        relative_path = self._relative(path)
+        if relative_path is None or relative_path == "":
+            return
+        with self._lock:
+            self._add(relative_path, False)
+
+    def refresh(self, *paths):
+        """
+        Update the snapshot for paths changed on disk (created, modified or deleted) - e.g., in watch mode.
+        Only the paths (and their subtrees, for directories) are read again, not the whole tree:
+        with tracked_only, a single `git ls-files` restricted to the paths. A changed .gitignore
+        or repository config (or too many changed paths, or the root itself - e.g., after lost watch events)
+        lists the whole tree again.
+        """
+        relative_paths = [
+            relative_path
+            for relative_path in map(self._relative, paths)
+            if relative_path is not None
+        ]
+        if not relative_paths:
+            return
+
+        with self._lock:
+            if (
+                "" in relative_paths
+                or REPOSITORY_CONFIG_FILE in relative_paths
+                or (
+                    self.tracked_only
+                    and (
+                        len(relative_paths) > REFRESH_RELIST_THRESHOLD
+                        or any(
+                            relative_path.rpartition("/")[2] == ".gitignore"
+                            for relative_path in relative_paths
+                        )
+                    )
+                )
+            ):
+                with trace_span("walk", "filesystem", root=self._root_abs):
+                    self._build()
+                return
+
+            if not self.tracked_only:
+                for relative_path in relative_paths:
+                    self._refresh_from_disk(relative_path)
+                return
+
+            for relative_path in relative_paths:
+                self._remove(relative_path)
+            files = list_git_files(self._root_abs, relative_paths)
+            if files is None:
+                with trace_span("walk", "filesystem", root=self._root_abs):
+                    self._build()
+                return
+            self._add_git_files(files)
+
+    def _refresh_from_disk(self, relative_path):
+        """
+        Read again a path (and its subtree, for directories) from the filesystem.
+        """
+        absolute_path = os.path.join(self._root_abs, relative_path)
+        self._remove(relative_path)
+        if os.path.lexists(absolute_path):
+            is_dir = os.path.isdir(absolute_path) and not os.path.islink(absolute_path)
+            if self.exclude and self.exclude.excludes(
+                relative_path if is_dir else relative_path.rpartition("/")[0]
+            ):
+                return
+            self._add(relative_path, is_dir)
+            if is_dir:
+                with trace_span(
+                    "walk", "filesystem", root=self._root_abs, subtree=relative_path
+                ):
+                    self._walk(relative_path)
+
+
+class RevisionSnapshot(RepositorySnapshot):
+    """
+    Snapshot of the tree of a commit (--rev), read from the git object database instead of the working tree -
+    e.g., a release tag checked from a bare mirror, with no checkout and no file written to disk.
+
+    The tree is listed by a single `git ls-tree`, and files are read through a single long-lived
+    `git cat-file --batch` process. Paths look the same as in a working tree snapshot (prefixed with self.root).
+    Submodules are listed as (empty) directories. The snapshot never changes: refresh() is a no-op.
+    """
+
+    def __init__(self, root, commit):
+        self.commit = commit
+        self._reader = GitObjectReader(os.path.abspath(root))
+        # Root-relative POSIX path -> (object id, size), for files.
+        self._blobs = {}
+        # Object id -> decoded content, for files read during the run.
+        self._contents = {}
+        super().__init__(root, tracked_only=False)
+
+    def _build(self):
+        """
+        Build all the indexes from the tree of the commit.
+        """
+        self._reset()
+        tree = list_git_tree(self._root_abs, self.commit)
+        if tree is None:
+            raise ValueError(
+                f"Cannot list the tree of {self.commit} in {self._root_abs}."
+            )
+
+        self._blobs = {
+            path: (object_id, size)
+            for path, object_type, object_id, size in tree
+            if object_type == "blob"
+        }
+        config = {}
+        if REPOSITORY_CONFIG_FILE in self._blobs:
+            config = parse_repository_config(
+                self._reader.read(self._blobs[REPOSITORY_CONFIG_FILE][0]),
+                f"{self._root_abs}@{self.commit}",
+            )
+        self.exclude = ExcludeRules(config.get("exclude_dirs", []))
+
+        for relative_path, object_type, _, _ in tree:
+            is_dir = object_type != "blob"
+            if self.exclude and self.exclude.excludes(
+                relative_path if is_dir else relative_path.rpartition("/")[0]
+            ):
+                continue
+            self._add(relative_path, is_dir)
+
+    def read_text(self, path):
+        """
+        Read the content of the given file at the commit (text mode, like open().read()).
+        Raises FileNotFoundError if the commit has no such file.
+        """
+        relative_path = self._relative(path)
+        if relative_path is None:
+            return super().read_text(path)
+        if relative_path not in self._blobs:
+            raise FileNotFoundError(f"No such file at {self.commit}: {path}")
+
+        object_id = self._blobs[relative_path][0]
+        content = self._contents.get(object_id)
+        if content is None:
+            content = io.TextIOWrapper(io.BytesIO(self.read_bytes(path))).read()
+            self._contents[object_id] = content
+        return content
+
+    def read_bytes(self, path):
+        """
+        Read the content of the given file at the commit (binary mode).
+        Raises FileNotFoundError if the commit has no such file.
+        """
+        relative_path = self._relative(path)
+        if relative_path is None:
+            return super().read_bytes(path)
+        if relative_path not in self._blobs:
+            raise FileNotFoundError(f"No such file at {self.commit}: {path}")
+
+        count("opens")
+        content = self._reader.read(self._blobs[relative_path][0])
+        count("bytes_read", len(content))
+        return content
+
+    def size(self, path):
+        relative_path = self._relative(path)
+        if relative_path is None:
+            return super().size(path)
+        if relative_path not in self._blobs:
+            raise FileNotFoundError(f"No such file at {self.commit}: {path}")
+        return self._blobs[relative_path][1]
+
+    def signature(self, path):
+        """
+        Get the signature of the given path: ("blob", object id) for a file, ("dir",) or ("missing",).
+        """
+        relative_path = self._relative(path)
+        if relative_path is None:
+            return super().signature(path)
+        if relative_path in self._blobs:
+            return ("blob", self._blobs[relative_path][0])
+        return ("dir",) if self._is_dir.get(relative_path) else ("missing",)
+
+    def close(self):
+        """
+        Stop the git cat-file process.
+        """
+        self._reader.close()
+
+    def add_file(self, path):
+        raise OSError(f"Cannot write to a commit ({self.commit}): {path}")
+
+    def refresh(self, *paths):
+        pass
+
+
+# Snapshots for the current run, keyed by the absolute repository path.
+_repository_snapshots = {}
+_repository_snapshots_lock = threading.Lock()
+
+
+def get_repository_snapshot(repo_path, tracked_only=True, commit=None):
+    """
+    Get the snapshot for the given repository path.
+    The tree is walked only once per run - i.e., on the first call, which also sets tracked_only
+    (or the commit to read the tree from, instead of the working tree - see RevisionSnapshot).
+    """
+    key = os.path.abspath(repo_path)
+    with _repository_snapshots_lock:
+        if key not in _repository_snapshots:
+            _repository_snapshots[key] = (
+                RepositorySnapshot(repo_path, tracked_only)
+                if commit is None
+                else RevisionSnapshot(repo_path, commit)
+            )
+        return _repository_snapshots[key]
+
+
+def clear_repository_snapshots(repo_path=None):
+    """
+    Drop all snapshots - or only the snapshot of the given repository path - e.g., at the beginning of a new run.
+    """
+    with _repository_snapshots_lock:
+        keys = (
+            list(_repository_snapshots)
+            if repo_path is None
+            else [os.path.abspath(repo_path)]
+        )
+        for key in keys:
+            snapshot = _repository_snapshots.pop(key, None)
+            if snapshot is not None:
+                snapshot.close()
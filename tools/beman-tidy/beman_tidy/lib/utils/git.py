@@ -1,68 +1,472 @@
 #!/usr/bin/env python3
 # SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
 
+import hashlib
+import re
+import subprocess
 import sys
-import yaml
+import threading
+import time
+from collections.abc import MutableMapping
 from pathlib import Path
 
-from git import Repo, InvalidGitRepositoryError
+from .cache import DiskCache
+from .gitdir import GitDirectory
+from .profile import count, trace_span
+from .string import LiteralMatcher
 
 
-def get_repo_info(path: str):
+class RepositoryInfo(MutableMapping):
     """
-    Get information about the repository at the given path.
-    Returns data as a dictionary.
+    Lazily evaluated, memoized information about a repository.
+    Behaves like a dictionary: e.g., repo_info["name"], "default_branch" in repo_info.
+
+    Each field is computed only the first time it is read, and its cost (seconds)
+    is recorded in self.costs - e.g., a plain lint run never needs `git status`
+    or `git diff --stat`, so they are never spawned.
+    Branches, commit hash and remotes are read directly from the .git directory.
+    If a field cannot be computed (e.g., no origin remote), its value is None.
+
+    With a revision (--rev), the repository may be bare (e.g., a mirror): its top level is the git directory.
     """
 
-    path: Path = Path(path)
-    try:
-        # Initialize the repository object
-        repo = Repo(path.absolute(), search_parent_directories=True)
+    fields = [
+        "top_level",
+        "name",
+        "remote_url",
+        "current_branch",
+        "default_branch",
+        "commit_hash",
+        "status",
+        "unstaged_changes",
+    ]
+    # Fields always computed by spawning git.
+    subprocess_fields = ["status", "unstaged_changes"]
+
+    def __init__(self, path, rev=None):
+        self.path = Path(path).absolute()
+        self.rev = rev
+        self.costs = {}
+        self._values = {}
+        self._lock = threading.RLock()
+        self._repo = None
+
+        # Metadata (e.g., HEAD, refs, remotes) is read natively from the .git directory, without spawning git.
+        # Unsupported layouts (e.g., reftable, config includes) fall back to GitPython.
+        self.git_directory = (
+            None
+            if rev is not None and is_bare_repository(self.path)
+            else GitDirectory.find(self.path)
+        )
+
+    @property
+    def repo(self):
+        # GitPython repository, created only when needed - e.g., for `git status`.
+        with self._lock:
+            if self._repo is None:
+                # Imported on demand: GitPython is slow to import and most runs never need it.
+                from git import Repo
+
+                with trace_span("git.Repo", "git"):
+                    self._repo = Repo(self.path, search_parent_directories=True)
+            return self._repo
+
+    def validate(self):
+        """
+        Check that the path is inside a valid Git repository, without computing any field.
+        The .git directory is found natively; otherwise, GitPython opens the repository.
+
+        @return: True if the repository is valid, False otherwise.
+        """
+        if self.git_directory is not None:
+            return True
+
+        # Imported on demand: GitPython is slow to import and most runs never need it.
+        from git import InvalidGitRepositoryError
+
+        try:
+            return self.repo is not None
+        except InvalidGitRepositoryError:
+            return False
 
+    def __getitem__(self, field):
+        with self._lock:
+            if field not in self._values:
+                if field not in self.fields:
+                    raise KeyError(field)
+
+                start = time.perf_counter()
+                try:
+                    with trace_span(f"repo_info[{field}]", "git"):
+                        self._values[field] = getattr(self, f"_get_{field}")()
+                except Exception:
+                    self._values[field] = None
+                self.costs[field] = time.perf_counter() - start
+
+            return self._values[field]
+
+    def __setitem__(self, field, value):
+        with self._lock:
+            self._values[field] = value
+
+    def __delitem__(self, field):
+        with self._lock:
+            del self._values[field]
+
+    def __contains__(self, field):
+        # Do not compute the field just to check if it is available.
+        return field in self.fields or field in self._values
+
+    def __iter__(self):
+        return iter(dict.fromkeys(self.fields + list(self._values)))
+
+    def __len__(self):
+        return len(set(self.fields) | set(self._values))
+
+    def __repr__(self):
+        return f"RepositoryInfo({self.path})"
+
+    def _get_top_level(self):
         # Get the top-level directory of the repository
-        top_level_dir = Path(repo.git.rev_parse("--show-toplevel"))
+        if self.git_directory is not None:
+            return self.git_directory.top_level
 
-        # Get the repository name (directory name of the top level)
-        repo_name = top_level_dir.name
+        top_level_dir = self.repo.working_tree_dir
+        if top_level_dir is None:
+            # e.g., bare repository: only checked at a revision
+            return Path(self.repo.git_dir) if self.rev is not None else None
+        return Path(top_level_dir)
 
+    def _get_name(self):
+        # Get the repository name (directory name of the top level, without the .git suffix of a bare repository)
+        name = self["top_level"].name
+        if self.git_directory is None and self.rev is not None and self.repo.bare:
+            return name.removesuffix(".git")
+        return name
+
+    def _get_remote_url(self):
         # Get the remote URL (assuming 'origin' is the remote name)
-        remote_url = None
-        if "origin" in repo.remotes:
-            remote_url = repo.remotes.origin.url
-
-        # Get the current branch
-        current_branch = repo.active_branch.name
-
-        # Get the default branch
-        split_head = repo.git.symbolic_ref("refs/remotes/origin/HEAD").split("/")
-        default_branch = split_head[-1]
-
-        # Get the commit hash
-        commit_hash = repo.head.commit.hexsha
-
-        # Get the status of the repository
-        status = repo.git.status()
-
-        # Get unstaged changes
-        unstaged_changes = repo.git.diff("--stat")
-
-        return {
-            "top_level": top_level_dir,
-            "name": repo_name,
-            "remote_url": remote_url,
-            "current_branch": current_branch,
-            "default_branch": default_branch,
-            "commit_hash": commit_hash,
-            "status": status,
-            "unstaged_changes": unstaged_changes,
-        }
-    except InvalidGitRepositoryError:
-        print(f"The path '{path}' is not inside a valid Git repository.")
-        sys.exit(1)
+        if self.git_directory is not None:
+            return self.git_directory.remote_url("origin")
+
+        if "origin" in self.repo.remotes:
+            return self.repo.remotes.origin.url
+        return None
+
+    def _get_current_branch(self):
+        if self.git_directory is not None:
+            return self.git_directory.current_branch()
+
+        return self.repo.active_branch.name
+
+    def _get_default_branch(self):
+        if self.git_directory is not None:
+            return self.git_directory.default_branch("origin")
+
+        if self.repo.bare:
+            # e.g., mirror: no remote-tracking branches, HEAD is the default branch of the origin
+            return self.repo.active_branch.name
+
+        split_head = run_git_command(
+            self.repo, "symbolic_ref", "refs/remotes/origin/HEAD"
+        ).split("/")
+        return split_head[-1]
+
+    def _get_commit_hash(self):
+        if self.rev is not None:
+            return resolve_revision(self["top_level"], self.rev)
+        if self.git_directory is not None:
+            return self.git_directory.commit_hash()
+
+        return self.repo.head.commit.hexsha
+
+    def _get_status(self):
+        return run_git_command(self.repo, "status")
+
+    def _get_unstaged_changes(self):
+        return run_git_command(self.repo, "diff", "--stat")
+
+
+def run_git_command(repo, command, *args):
+    """
+    Run a git command through GitPython - e.g., run_git_command(repo, "diff", "--stat").
+    Each call spawns one git subprocess (counted by --profile).
+    """
+    count("git_subprocesses")
+    with trace_span(f"git {command}", "git", args=list(args)):
+        return getattr(repo.git, command)(*args)
+
+
+def list_git_files(top_level, pathspecs=()):
+    """
+    List the files git tracks or would track in the working tree at top_level:
+    index entries still on disk, plus untracked files not ignored by .gitignore (e.g., no build/ trees).
+    Git answers from the index (its cached stat data) in a single `git ls-files`, spawned directly
+    without GitPython. Optional pathspecs (root-relative, literal) restrict the listing.
+
+    @return: A list of (root-relative POSIX path, is_submodule), or None if git cannot list the files.
+    """
+    command = [
+        "git",
+        "--literal-pathspecs",
+        "-C",
+        str(top_level),
+        "ls-files",
+        "-z",
+        "-t",
+        "--stage",
+        "--cached",
+        "--deleted",
+        "--others",
+        "--exclude-standard",
+        "--",
+        *pathspecs,
+    ]
+    count("git_subprocesses")
+    with trace_span("git ls-files", "git", pathspecs=list(pathspecs)):
+        try:
+            result = subprocess.run(command, capture_output=True)
+        except OSError:
+            return None
+    if result.returncode != 0:
+        return None
+
+    # Entries: "H <mode> <object> <stage>\t<path>" (cached), "R ..." (deleted), "? <path>" (untracked).
+    # Skip-worktree ("S") entries are not on disk.
+    files = {}
+    deleted = set()
+    for entry in result.stdout.decode("utf-8", "surrogateescape").split("\0"):
+        if not entry:
+            continue
+        tag, info = entry[0], entry[2:]
+        if tag == "?":
+            files[info] = False
+            continue
+        stage, _, path = info.partition("\t")
+        if tag == "R":
+            deleted.add(path)
+        elif tag in "HCM":
+            files[path] = stage.startswith("160000 ")
+
+    return [
+        (path, is_submodule)
+        for path, is_submodule in files.items()
+        if path not in deleted
+    ]
+
+
+def list_git_ignored_directories(top_level):
+    """
+    List the untracked directories ignored by .gitignore in the working tree at top_level (e.g., build/ trees),
+    in a single `git ls-files`. Only the outermost ignored directories are listed, not their subdirectories.
+
+    @return: A set of root-relative POSIX directories, or None if git cannot list them.
+    """
+    command = [
+        "git",
+        "-C",
+        str(top_level),
+        "ls-files",
+        "-z",
+        "--others",
+        "--ignored",
+        "--exclude-standard",
+        "--directory",
+    ]
+    count("git_subprocesses")
+    with trace_span("git ls-files", "git", ignored=True):
+        try:
+            result = subprocess.run(command, capture_output=True)
+        except OSError:
+            return None
+    if result.returncode != 0:
+        return None
+
+    return {
+        entry.rstrip("/")
+        for entry in result.stdout.decode("utf-8", "surrogateescape").split("\0")
+        if entry.endswith("/")
+    }
+
+
+def is_bare_repository(path):
+    """
+    Check if the given path is a bare repository (e.g., a mirror) - i.e., a git directory without a working tree.
+    """
+    path = Path(path)
+    return (
+        not (path / ".git").exists()
+        and (path / "HEAD").is_file()
+        and (path / "objects").is_dir()
+        and (path / "refs").is_dir()
+    )
+
+
+def resolve_revision(top_level, rev):
+    """
+    Resolve the given revision (e.g., a tag, a branch, HEAD~2) to a commit hash, or None if it is not a commit.
+    """
+    command = [
+        "git",
+        "-C",
+        str(top_level),
+        "rev-parse",
+        "--verify",
+        "--quiet",
+        "--end-of-options",
+        f"{rev}^{{commit}}",
+    ]
+    count("git_subprocesses")
+    with trace_span("git rev-parse", "git", rev=rev):
+        try:
+            result = subprocess.run(command, capture_output=True, text=True)
+        except OSError:
+            return None
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip()
+
+
+def list_git_tree(top_level, commit):
+    """
+    List the tree of the given commit, recursively, from the object database (no working tree needed,
+    e.g., in a bare mirror), with a single `git ls-tree` spawned directly without GitPython.
+
+    @return: A list of (root-relative POSIX path, object type, object id, size), in tree order
+    (a directory before its content), or None if git cannot list the tree.
+    Object types are "blob" (file), "tree" (directory) and "commit" (submodule) - sizes are None except for blobs.
+    """
+    command = [
+        "git",
+        "-C",
+        str(top_level),
+        "ls-tree",
+        "-r",
+        "-t",
+        "-l",
+        "-z",
+        "--full-tree",
+        commit,
+    ]
+    count("git_subprocesses")
+    with trace_span("git ls-tree", "git", commit=commit):
+        try:
+            result = subprocess.run(command, capture_output=True)
+        except OSError:
+            return None
+    if result.returncode != 0:
+        return None
+
+    # Entries: "<mode> <type> <object> <size>\t<path>" - size is "-" for trees and submodules.
+    tree = []
+    for entry in result.stdout.decode("utf-8", "surrogateescape").split("\0"):
+        if not entry:
+            continue
+        info, _, path = entry.partition("\t")
+        _, object_type, object_id, size = info.split()
+        tree.append((path, object_type, object_id, int(size) if size != "-" else None))
+    return tree
+
+
+class GitObjectReader:
+    """
+    Reads objects from the object database of a repository through a single long-lived
+    `git cat-file --batch` process (started on the first read) - i.e., one git subprocess
+    for all the file reads of a run, instead of one per file. Thread-safe.
+    """
+
+    def __init__(self, top_level):
+        self.top_level = str(top_level)
+        self._process = None
+        self._lock = threading.Lock()
+
+    def read(self, object_id):
+        """
+        Read the content (bytes) of the given object.
+        Raises FileNotFoundError if the object is missing.
+        """
+        with self._lock, trace_span("git cat-file", "git", object=object_id):
+            if self._process is None:
+                count("git_subprocesses")
+                self._process = subprocess.Popen(
+                    ["git", "-C", self.top_level, "cat-file", "--batch"],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                )
+            self._process.stdin.write(f"{object_id}\n".encode())
+            self._process.stdin.flush()
+
+            # Header: "<object> <type> <size>", or "<object> missing".
+            header = self._process.stdout.readline().split()
+            if len(header) != 3:
+                raise FileNotFoundError(f"Object not found: {object_id}")
+            size = int(header[2])
+            content = self._process.stdout.read(size)
+            # Each object is followed by a newline.
+            self._process.stdout.read(1)
+            return content
+
+    def close(self):
+        """
+        Stop the git process, if any.
+        """
+        with self._lock:
+            if self._process is not None:
+                self._process.stdin.close()
+                self._process.wait()
+                self._process.stdout.close()
+                self._process = None
+
+
+def get_repo_info(path: str, rev=None):
+    """
+    Get information about the repository at the given path.
+    Returns a lazily evaluated RepositoryInfo (dictionary-like).
+    With a revision (--rev), the repository may be bare, and commit_hash is the resolved revision.
+    """
+
+    path: Path = Path(path)
+    with trace_span("get_repo_info", "git", path=str(path)):
+        try:
+            repo_info = RepositoryInfo(path, rev)
+            if not repo_info.validate() or repo_info["top_level"] is None:
+                print(f"The path '{path}' is not inside a valid Git repository.")
+                sys.exit(1)
+
+            if rev is not None and repo_info["commit_hash"] is None:
+                print(
+                    f"The revision '{rev}' is not a commit of the repository at '{path}'."
+                )
+                sys.exit(1)
+
+            return repo_info
+        except Exception:
+            print(
+                f"An error occurred while getting repository information. Check {path}."
+            )
+            sys.exit(1)
+
+
+def get_changed_paths(repo_info, rev):
+    """
+    Get the paths changed between the given revision and the working tree (absolute paths):
+    modified, added, deleted and untracked (not ignored) files.
+    """
+    try:
+        repo = repo_info.repo
+        changed_paths = run_git_command(
+            repo, "diff", "--name-only", "--no-renames", rev
+        ).splitlines()
+        changed_paths += run_git_command(
+            repo, "ls_files", "--others", "--exclude-standard"
+        ).splitlines()
     except Exception:
-        print(f"An error occurred while getting repository information. Check {path}.")
+        print(f"Cannot get the paths changed since '{rev}'. Check the revision.")
         sys.exit(1)
 
+    top_level = Path(repo_info["top_level"])
+    return [top_level / path for path in dict.fromkeys(changed_paths) if path]
+
 
 def get_beman_standard_config_path():
     """
@@ -78,13 +482,43 @@ def get_beman_recommendated_license_path():
     return Path(__file__).parent.parent.parent / "LICENSE"
 
 
+# Version of the compiled Beman Standard config format.
+# Bump it when the compiled form changes (e.g., new keys, matcher internals), to invalidate the on-disk cache.
+BEMAN_STANDARD_CONFIG_FORMAT = 1
+
+
 def load_beman_standard_config(path=get_beman_standard_config_path()):
     """
     Load the Beman Standard YAML configuration file from the given path.
+
+    The compiled config (check configs, literal matchers, regexes) is cached on disk,
+    keyed by the content of the YAML file, so the YAML file is parsed only when it changes.
     """
-    with open(path, "r") as file:
-        beman_standard_yml = yaml.safe_load(file)
+    with trace_span("load_beman_standard_config", "config"):
+        with open(path, "rb") as file:
+            content = file.read()
+
+        key = hashlib.sha256(
+            f"{BEMAN_STANDARD_CONFIG_FORMAT}:{sys.version_info[:2]}:".encode() + content
+        ).hexdigest()
+        cache = DiskCache("config")
+        beman_standard_check_config = cache.get(key)
+        if beman_standard_check_config is None:
+            # Imported on demand: PyYAML is slow to import and only needed when the cache is cold.
+            import yaml
 
+            beman_standard_check_config = compile_beman_standard_config(
+                yaml.safe_load(content)
+            )
+            cache.put(key, beman_standard_check_config)
+
+        return beman_standard_check_config
+
+
+def compile_beman_standard_config(beman_standard_yml):
+    """
+    Compile the parsed Beman Standard YAML into check configs: {check name: check config}.
+    """
     beman_standard_check_config = {}
     for check_name in beman_standard_yml:
         check_config = {
@@ -107,9 +541,11 @@ def load_beman_standard_config(path=get_beman_standard_config_path()):
             # e.g., ["a string value", "another string value"]
             elif "values" in entry:
                 check_config["values"] = entry["values"]
+                # Compiled once: find all the values in a single pass over a file.
+                check_config["matcher"] = LiteralMatcher.from_values(entry["values"])
             elif "regex" in entry:
-                # TODO: Implement the regex check.
-                pass
+                # Compiled once, like the matchers above.
+                check_config["regex"] = re.compile(entry["regex"])
             elif "file_name" in entry:
                 check_config["file_name"] = entry["file_name"]
             elif "directory_name" in entry:
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import os
+import re
+from pathlib import Path
+
+from .profile import count
+
+# Environment variables which change how git finds the repository - i.e., hard cases left to git itself.
+GIT_ENVIRONMENT_OVERRIDES = ["GIT_DIR", "GIT_WORK_TREE", "GIT_COMMON_DIR"]
+
+# Maximum depth of symbolic refs chains - e.g., HEAD -> refs/heads/main.
+MAX_SYMBOLIC_REF_DEPTH = 10
+
+
+class GitDirectory:
+    """
+    Minimal pure-Python reader for the git metadata needed by beman-tidy:
+    HEAD, loose refs, packed-refs and the config file (e.g., remotes).
+    No subprocess is spawned.
+
+    Supports regular checkouts (.git directory), linked worktrees and submodules (.git file).
+    Hard cases (e.g., reftable storage, config includes, core.worktree) are reported as unknown (None),
+    so the caller can fall back to git.
+    """
+
+    def __init__(self, git_dir, common_dir, top_level):
+        # Per-worktree git directory - e.g., HEAD.
+        self.git_dir = Path(git_dir)
+        # Shared git directory - e.g., refs, packed-refs, config.
+        self.common_dir = Path(common_dir)
+        # Top-level directory of the working tree.
+        self.top_level = Path(top_level)
+
+        self._config = None
+        self._packed_refs = None
+
+    @classmethod
+    def find(cls, path):
+        """
+        Find the git directory for the given path (searching parent directories, like git).
+        Returns None if not found or if the layout is not supported natively.
+        """
+        if any(variable in os.environ for variable in GIT_ENVIRONMENT_OVERRIDES):
+            return None
+
+        path = Path(os.path.abspath(path))
+        for directory in [path, *path.parents]:
+            dot_git = directory / ".git"
+            if dot_git.is_dir():
+                git_dir = dot_git
+            elif dot_git.is_file():
+                # e.g., "gitdir: ../.git/worktrees/feature" for linked worktrees and submodules.
+                match = re.match(r"gitdir: (.+)", _read_text(dot_git) or "")
+                if match is None:
+                    return None
+                git_dir = directory / match.group(1).strip()
+            else:
+                continue
+
+            if not (git_dir / "HEAD").is_file():
+                return None
+
+            common_dir = git_dir
+            common_dir_file = _read_text(git_dir / "commondir")
+            if common_dir_file is not None:
+                common_dir = git_dir / common_dir_file.strip()
+
+            git_directory = cls(git_dir.resolve(), common_dir.resolve(), directory)
+            if not git_directory.is_supported():
+                return None
+            return git_directory
+
+        return None
+
+    def is_supported(self):
+        """
+        Check if the repository layout can be read natively.
+        """
+        if (self.common_dir / "reftable").exists():
+            return False
+
+        config = self.config
+        if config is None:
+            return False
+        if config.get("core", {}).get("worktree") is not None:
+            return False
+        if config.get("core", {}).get("bare", "false").lower() == "true":
+            return False
+        if config.get("extensions", {}).get("refstorage") not in [None, "files"]:
+            return False
+        return True
+
+    @property
+    def config(self):
+        """
+        The parsed config file: {section: {key: value}}.
+        e.g., config['remote "origin"']["url"]. Sections and keys are lowercase (except subsections).
+        Returns None if the config cannot be read natively (e.g., it includes other files).
+        """
+        if self._config is None:
+            content = _read_text(self.common_dir / "config")
+            self._config = parse_git_config(content) if content is not None else {}
+        return self._config if "include" not in self._config else None
+
+    @property
+    def packed_refs(self):
+        """
+        The packed refs: {ref name: commit hash}.
+        """
+        if self._packed_refs is None:
+            self._packed_refs = {}
+            for line in (
+                _read_text(self.common_dir / "packed-refs") or ""
+            ).splitlines():
+                # Skip comments (e.g., "# pack-refs with: peeled") and peeled tags ("^<sha>").
+                if not line or line[0] in "#^":
+                    continue
+                commit_hash, _, ref = line.partition(" ")
+                self._packed_refs[ref.strip()] = commit_hash
+        return self._packed_refs
+
+    def _ref_path(self, ref):
+        # Pseudo refs (e.g., HEAD) and per-worktree refs live in git_dir, everything else in common_dir.
+        if "/" not in ref or ref.startswith(("refs/bisect/", "refs/worktree/")):
+            return self.git_dir / ref
+        return self.common_dir / ref
+
+    def read_ref(self, ref):
+        """
+        Read a single ref, without following symbolic refs.
+        Returns ("ref", target) for symbolic refs, ("commit", hash) for direct refs, or None.
+        """
+        content = _read_text(self._ref_path(ref))
+        if content is not None:
+            content = content.strip()
+            if content.startswith("ref:"):
+                return "ref", content[len("ref:") :].strip()
+            if re.fullmatch(r"[0-9a-f]{40}([0-9a-f]{24})?", content):
+                return "commit", content
+            return None
+
+        # Note: packed-refs never contain symbolic refs.
+        if ref in self.packed_refs:
+            return "commit", self.packed_refs[ref]
+        return None
+
+    def read_symbolic_ref(self, ref):
+        """
+        Returns the target of a symbolic ref - e.g., "refs/heads/main" for HEAD, or None.
+        """
+        value = self.read_ref(ref)
+        if value is None or value[0] != "ref":
+            return None
+        return value[1]
+
+    def resolve_ref(self, ref):
+        """
+        Returns the commit hash for a ref, following symbolic refs, or None.
+        """
+        for _ in range(MAX_SYMBOLIC_REF_DEPTH):
+            value = self.read_ref(ref)
+            if value is None:
+                return None
+            kind, ref = value
+            if kind == "commit":
+                return ref
+        return None
+
+    def current_branch(self):
+        """
+        Returns the current branch name - e.g., "main", or None for a detached HEAD.
+        """
+        head = self.read_symbolic_ref("HEAD")
+        if head is None or not head.startswith("refs/heads/"):
+            return None
+        return head[len("refs/heads/") :]
+
+    def default_branch(self, remote="origin"):
+        """
+        Returns the default branch of the remote - e.g., "main" from refs/remotes/origin/HEAD, or None.
+        """
+        head = self.read_symbolic_ref(f"refs/remotes/{remote}/HEAD")
+        if head is None:
+            return None
+        return head.split("/")[-1]
+
+    def commit_hash(self):
+        """
+        Returns the commit hash of HEAD, or None.
+        """
+        return self.resolve_ref("HEAD")
+
+    def remote_url(self, remote="origin"):
+        """
+        Returns the URL of the remote, or None.
+        """
+        config = self.config or {}
+        return config.get(f'remote "{remote}"', {}).get("url")
+
+
+def parse_git_config(content):
+    """
+    Parse a git config file: {section: {key: value}}.
+    e.g., {"core": {"bare": "false"}, 'remote "origin"': {"url": "https://..."}}
+
+    Only the last value of multivalued keys is kept. Include sections are kept as "include"
+    so callers can detect them.
+    """
+    config = {}
+    section = None
+    for line in content.splitlines():
+        line = line.strip()
+        if not line or line[0] in "#;":
+            continue
+
+        match = re.match(
+            r'\[\s*([A-Za-z0-9.-]+)(?:\s+"((?:[^"\\]|\\.)*)")?\s*\](.*)', line
+        )
+        if match is not None:
+            name, subsection, line = match.groups()
+            name = name.lower()
+            if name.startswith("include"):
+                # e.g., [include] or [includeIf "gitdir:..."]
+                config["include"] = {}
+            if subsection is None and "." in name:
+                # Deprecated syntax - e.g., [remote.origin].
+                name, _, subsection = name.partition(".")
+            section = f'{name} "{subsection}"' if subsection is not None else name
+            config.setdefault(section, {})
+            line = line.strip()
+            if not line:
+                continue
+
+        if section is None:
+            continue
+
+        key, _, value = line.partition("=")
+        config[section][key.strip().lower()] = (
+            _parse_git_config_value(value) if _ else "true"
+        )
+
+    return config
+
+
+def _parse_git_config_value(value):
+    """
+    Parse a git config value: strip comments and surrounding whitespace, handle quotes and escapes.
+    """
+    result = []
+    in_quotes = False
+    i = 0
+    value = value.strip()
+    while i < len(value):
+        char = value[i]
+        if char == "\\" and i + 1 < len(value):
+            result.append(
+                {"n": "\n", "t": "\t", "b": "\b"}.get(value[i + 1], value[i + 1])
+            )
+            i += 2
+            continue
+        if char == '"':
+            in_quotes = not in_quotes
+        elif char in "#;" and not in_quotes:
+            break
+        else:
+            result.append(char)
+        i += 1
+    return "".join(result).strip()
+
+
+def _read_text(path):
+    """
+    Read a small metadata file, or None if it does not exist.
+    """
+    try:
+        count("opens")
+        with open(path, "r") as file:
+            content = file.read()
+    except OSError:
+        return None
+    count("bytes_read", len(content))
+    return content
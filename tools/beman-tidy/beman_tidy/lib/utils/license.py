@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import functools
+import hashlib
+import os
+import re
+from typing import Dict, List, NamedTuple, Optional
+
+from .git import get_beman_recommendated_license_path
+from .profile import count
+from .string import LiteralMatcher
+
+# Approved licenses, in priority order.
+# A license family matches if the text contains at least one phrase for each
+# of its requirements (case-insensitive, whitespace-insensitive).
+#
+# e.g., beman/LICENSE contains the following text (multiple lines)
+# - Apache License
+# - Version 2.0
+# - LLVM Exceptions to the Apache 2.0 License
+#
+# We also check for variations.
+APPROVED_LICENSES = {
+    "apache_v2_llvm": {
+        "name": "Apache License - Version 2.0 with LLVM Exceptions",
+        "requirements": {
+            "license": [
+                "Apache License",
+                "Apache License 2.0 with LLVM Exceptions",
+                "Apache License v2.0 with LLVM Exceptions",
+            ],
+            "version": [
+                "Version 2.0",
+                "Version v2.0",
+                "Version 2.0 with LLVM Exceptions",
+                "Version v2.0 with LLVM Exceptions",
+                "Apache License 2.0 with LLVM Exceptions",
+                "Apache License v2.0 with LLVM Exceptions",
+                "Apache 2.0",
+                "Apache v2.0",
+            ],
+            "llvm_exceptions": [
+                "LLVM Exceptions",
+                "Apache License 2.0 with LLVM Exceptions",
+                "Apache License v2.0 with LLVM Exceptions",
+                "LLVM Exceptions to the Apache 2.0 License",
+            ],
+        },
+    },
+    "boost_v1": {
+        "name": "Boost Software License - Version 1.0",
+        "requirements": {
+            "license": [
+                "Boost Software License",
+                "Boost License",
+                "Boost Software License 1.0",
+                "Boost Software License Version 1.0",
+            ],
+            "version": [
+                "Version 1.0",
+                "V1.0",
+                "Boost Software License 1.0",
+                "Boost Software License Version 1.0",
+            ],
+        },
+    },
+    "mit": {
+        "name": "MIT License",
+        "requirements": {
+            "license": [
+                "The MIT License",
+                "MIT License",
+            ],
+        },
+    },
+}
+
+
+class LicenseMatch(NamedTuple):
+    """
+    A license family found in a text, with the evidence found for each requirement.
+    e.g., LicenseMatch("mit", "MIT License", {"license": ["mit license", "the mit license"]})
+    """
+
+    family: str
+    name: str
+    evidence: Dict[str, List[str]]
+
+
+def normalize_license_text(text):
+    """
+    Normalize a license text for matching: case-folded, with all whitespace runs collapsed to one space.
+    """
+    return re.sub(r"\s+", " ", text).casefold()
+
+
+@functools.cache
+def get_license_matcher():
+    """
+    Compile all the phrases of all the approved licenses into a single matcher.
+    Categories are (family, requirement) pairs.
+    """
+    return LiteralMatcher(
+        {
+            (family, requirement): [normalize_license_text(p) for p in phrases]
+            for family, license in APPROVED_LICENSES.items()
+            for requirement, phrases in license["requirements"].items()
+        }
+    )
+
+
+def find_licenses(content):
+    """
+    Find all the approved license families in the text, in priority order.
+    The text is normalized once and scanned once, whatever the number of licenses and phrases.
+    """
+    if not content:
+        return []
+
+    evidence = {}
+    for (family, requirement), phrase in get_license_matcher().find(
+        normalize_license_text(content)
+    ):
+        evidence.setdefault(family, {}).setdefault(requirement, []).append(phrase)
+
+    return [
+        LicenseMatch(
+            family,
+            license["name"],
+            {
+                requirement: sorted(evidence[family][requirement])
+                for requirement in license["requirements"]
+            },
+        )
+        for family, license in APPROVED_LICENSES.items()
+        if family in evidence
+        and all(req in evidence[family] for req in license["requirements"])
+    ]
+
+
+def classify_license(content) -> Optional[LicenseMatch]:
+    """
+    Returns the first approved license family found in the text (in priority order), or None.
+    """
+    matches = find_licenses(content)
+    return matches[0] if matches else None
+
+
+@functools.cache
+def get_beman_recommended_license_digest():
+    """
+    Get the size and SHA-256 digest of the Beman recommended LICENSE file.
+    Computed once per process.
+    """
+    path = get_beman_recommendated_license_path()
+    with open(path, "rb") as file:
+        return os.fstat(file.fileno()).st_size, hashlib.file_digest(
+            file, "sha256"
+        ).hexdigest()
+
+
+def is_beman_recommended_license(path, snapshot=None):
+    """
+    Check if the file at the given path is identical to the Beman recommended LICENSE file.
+    A file with a different size is rejected without being read.
+    With a repository snapshot, the file is read through it (e.g., from a commit with --rev).
+    """
+    size, digest = get_beman_recommended_license_digest()
+    if snapshot is not None:
+        try:
+            if snapshot.size(path) != size:
+                return False
+            return hashlib.sha256(snapshot.read_bytes(path)).hexdigest() == digest
+        except OSError:
+            return False
+
+    try:
+        count("opens")
+        with open(path, "rb") as file:
+            count("stats")
+            if os.fstat(file.fileno()).st_size != size:
+                return False
+            count("bytes_read", size)
+            return hashlib.file_digest(file, "sha256").hexdigest() == digest
+    except OSError:
+        return False
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import contextlib
+import tracemalloc
+
+# Number of allocation sites reported for each check.
+MEMORY_PROFILE_TOP_SITES = 3
+
+# Number of checks (most expensive first) with their allocation sites printed.
+MEMORY_PROFILE_TOP_CHECKS = 5
+
+
+class MemoryProfiler:
+    """
+    Measures the memory of each check with tracemalloc snapshots taken around it:
+    - peak: the highest traced memory while the check runs, above the memory traced before it.
+    - retained: the memory allocated by the check and still alive after it (e.g., cached file contents).
+    - sites: the source lines which retained the most memory.
+
+    Note: tracemalloc traces the whole process, so checks must run one at a time.
+    """
+
+    def __init__(self):
+        # Check name -> {"peak": bytes, "retained": bytes, "sites": [(site, bytes), ...]}.
+        self.checks = {}
+
+    def start(self):
+        self._was_tracing = tracemalloc.is_tracing()
+        if not self._was_tracing:
+            tracemalloc.start()
+
+    def stop(self):
+        if not self._was_tracing:
+            tracemalloc.stop()
+
+    @staticmethod
+    def _snapshot():
+        return tracemalloc.take_snapshot().filter_traces(
+            [
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+            ]
+        )
+
+    @contextlib.contextmanager
+    def measure(self, check_name):
+        """
+        Measure the memory of a check - e.g., with memory_profiler.measure("readme.title"): ...
+        """
+        before = self._snapshot()
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        try:
+            yield
+        finally:
+            _, peak = tracemalloc.get_traced_memory()
+            after = self._snapshot()
+            statistics = after.compare_to(before, "lineno")
+            # Sorted by absolute size_diff: drop the freed memory first, then keep the top sites.
+            retaining = [stat for stat in statistics if stat.size_diff > 0]
+            self.checks[check_name] = {
+                "peak": max(0, peak - baseline),
+                "retained": max(0, sum(stat.size_diff for stat in statistics)),
+                "sites": [
+                    (
+                        f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                        stat.size_diff,
+                    )
+                    for stat in retaining[:MEMORY_PROFILE_TOP_SITES]
+                ],
+            }
+
+    def report(self):
+        """
+        Returns the memory of each check, sorted by decreasing peak:
+        [{"name": ..., "peak_bytes": ..., "retained_bytes": ..., "sites": [{"site": ..., "bytes": ...}]}].
+        """
+        rows = [
+            {
+                "name": check_name,
+                "peak_bytes": entry["peak"],
+                "retained_bytes": entry["retained"],
+                "sites": [
+                    {"site": site, "bytes": size} for site, size in entry["sites"]
+                ],
+            }
+            for check_name, entry in self.checks.items()
+        ]
+        return sorted(rows, key=lambda row: (-row["peak_bytes"], row["name"]))
+
+    def print_report(self):
+        """
+        Print the memory table (most expensive checks first), then the top allocation sites.
+        """
+        rows = self.report()
+        name_width = max([len("Check")] + [len(row["name"]) for row in rows])
+        print(f"\n{'Check':<{name_width}} |    Peak KiB | Retained KiB")
+        print(f"{'-' * name_width}-|-------------|-------------")
+        for row in rows:
+            print(
+                f"{row['name']:<{name_width}} | {row['peak_bytes'] / 1024:11.1f} | {row['retained_bytes'] / 1024:12.1f}"
+            )
+
+        print("\nTop allocation sites:")
+        for row in rows[:MEMORY_PROFILE_TOP_CHECKS]:
+            print(f"  {row['name']}:")
+            for site in row["sites"]:
+                print(f"    {site['bytes'] / 1024:9.1f} KiB  {site['site']}")
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import difflib
+import os
+import stat
+import threading
+import uuid
+from pathlib import Path
+
+from .cache import get_file_content_cache
+from .filesystem import get_repository_snapshot
+from .profile import trace_span
+
+
+class FixOverlay:
+    """
+    In-memory overlay of the files edited by the fixes of a run (--fix-inplace / --fix-dry-run).
+
+    Fixes do not write to disk: each fix applies an edit operation (content -> new content) to the overlay
+    content of its file, on top of the previous edits, and later checks of the same run read the overlay
+    instead of the file on disk. At the end of the run, the overlay is either flushed - once per file, with
+    a write to a temporary file and a rename - or reported as a unified diff (see diff()).
+    """
+
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        # Absolute path -> [original content (None for a new file), edited content].
+        self._files = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, path):
+        return os.path.abspath(path) in self._files
+
+    def read(self, path):
+        """
+        Get the edited content of the given file, or None if no fix edited it.
+        """
+        entry = self._files.get(os.path.abspath(path))
+        return entry[1] if entry is not None else None
+
+    def edit(self, path, operation):
+        """
+        Apply an edit operation (content -> new content) to the given file.
+        The first edit of a file reads its original content (an empty content, for a new file).
+        Raises OSError / UnicodeDecodeError if the original content cannot be read, and whatever the operation raises.
+        """
+        key = os.path.abspath(path)
+        with self._lock:
+            entry = self._files.get(key)
+            if entry is None:
+                try:
+                    original = get_repository_snapshot(self.root).read_text(key)
+                except FileNotFoundError:
+                    original = None
+                entry = [original, original or ""]
+            entry[1] = operation(entry[1])
+            self._files[key] = entry
+
+    def changed_paths(self):
+        """
+        List the files whose edited content differs from the original one (absolute paths, sorted).
+        """
+        return sorted(
+            path
+            for path, (original, content) in self._files.items()
+            if content != original
+        )
+
+    def diff(self):
+        """
+        Get the unified diff of all the edited files, with git-style a/ and b/ paths relative to the root.
+        """
+        chunks = []
+        for path in self.changed_paths():
+            original, content = self._files[path]
+            relative_path = Path(os.path.relpath(path, self.root)).as_posix()
+            for line in difflib.unified_diff(
+                (original or "").splitlines(keepends=True),
+                content.splitlines(keepends=True),
+                fromfile=f"a/{relative_path}" if original is not None else "/dev/null",
+                tofile=f"b/{relative_path}",
+            ):
+                chunks.append(
+                    line
+                    if line.endswith("\n")
+                    else f"{line}\n\\ No newline at end of file\n"
+                )
+        return "".join(chunks)
+
+    def flush(self):
+        """
+        Write the edited files to disk, once per file. All files are first written to temporary files
+        (next to the originals), then renamed over them: an interrupted run never leaves a truncated file,
+        and if a temporary file cannot be written (e.g., disk full), no file is changed.
+        Raises OSError on failure.
+
+        @return: The written paths.
+        """
+        with self._lock, trace_span("flush", "filesystem", root=self.root):
+            paths = self.changed_paths()
+            temporary_paths = []
+            try:
+                for path in paths:
+                    temporary_paths.append(
+                        write_temporary_file(path, self._files[path][1])
+                    )
+            except BaseException:
+                for temporary_path in temporary_paths:
+                    remove_quietly(temporary_path)
+                raise
+
+            for temporary_path, path in zip(temporary_paths, paths):
+                os.replace(temporary_path, path)
+                get_file_content_cache().invalidate(path)
+                get_repository_snapshot(self.root).add_file(path)
+            self._files.clear()
+            return paths
+
+
+def write_temporary_file(path, content):
+    """
+    Write the content (text mode) to a new temporary file in the directory of the given file, flushed to disk,
+    with the permissions of the given file (if it exists). Returns the path of the temporary file.
+    """
+    directory, name = os.path.split(path)
+    temporary_path = os.path.join(directory, f".{name}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        mode = None
+
+    fd = os.open(
+        temporary_path,
+        os.O_WRONLY | os.O_CREAT | os.O_EXCL,
+        0o666 if mode is None else mode,
+    )
+    try:
+        with os.fdopen(fd, "w") as file:
+            file.write(content)
+            file.flush()
+            os.fsync(file.fileno())
+        if mode is not None:
+            # Not reduced by the umask, unlike os.open().
+            os.chmod(temporary_path, mode)
+    except BaseException:
+        remove_quietly(temporary_path)
+        raise
+    return temporary_path
+
+
+def write_file_atomically(path, content):
+    """
+    Replace the content of the given file (text mode) with a write to a temporary file and a rename:
+    readers see either the old or the new content, never a truncated file.
+    """
+    os.replace(write_temporary_file(path, content), path)
+
+
+def remove_quietly(path):
+    """
+    Remove the given file, if possible - e.g., a temporary file after a failed write.
+    """
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+# Fix overlays of the current runs, keyed by the absolute repository path.
+_fix_overlays = {}
+_fix_overlays_lock = threading.Lock()
+
+
+def start_fix_overlay(repo_path):
+    """
+    Start a new (empty) fix overlay for the given repository path - i.e., at the beginning of a fixing run.
+    """
+    key = os.path.abspath(repo_path)
+    with _fix_overlays_lock:
+        _fix_overlays[key] = FixOverlay(repo_path)
+        return _fix_overlays[key]
+
+
+def get_fix_overlay(repo_path):
+    """
+    Get the fix overlay for the given repository path, or None if the current run does not fix.
+    """
+    return _fix_overlays.get(os.path.abspath(repo_path))
+
+
+def stop_fix_overlay(repo_path):
+    """
+    Remove the fix overlay of the given repository path - i.e., at the end of a fixing run - and return it (or None).
+    """
+    with _fix_overlays_lock:
+        return _fix_overlays.pop(os.path.abspath(repo_path), None)
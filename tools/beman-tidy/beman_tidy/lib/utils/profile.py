@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+
+# Check phases measured by the profiler (wall and CPU time).
+PROFILE_PHASES = ["should_skip", "pre_check", "check", "fix"]
+
+# I/O counters collected by the profiler.
+PROFILE_COUNTERS = ["stats", "opens", "bytes_read", "dirs_walked", "git_subprocesses"]
+
+# Name used for the work done outside of the checks - e.g., the repository walk.
+PROFILE_PIPELINE = "(pipeline)"
+
+
+class Profiler:
+    """
+    Collects the cost of each check: wall / CPU time per phase and I/O counters.
+
+    The work is attributed to the check running on the current thread (checks may run
+    in parallel, on a thread pool), or to PROFILE_PIPELINE outside of the checks.
+    Nested phases (e.g., FileBaseCheck.pre_check() called from an override) are counted
+    once, by the outermost phase.
+    """
+
+    def __init__(self):
+        # Check name -> {phase: [wall seconds, CPU seconds], counter: value}.
+        self.checks = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _entry(self, check_name):
+        entry = self.checks.get(check_name)
+        if entry is None:
+            entry = self.checks[check_name] = {
+                **{phase: [0.0, 0.0] for phase in PROFILE_PHASES},
+                **{counter: 0 for counter in PROFILE_COUNTERS},
+            }
+        return entry
+
+    @contextlib.contextmanager
+    def phase(self, check_name, phase):
+        """
+        Measure a phase of a check - e.g., with profiler.phase("readme.title", "check"): ...
+        """
+        if getattr(self._local, "check_name", None) is not None:
+            # Nested phase: already measured by the outer one.
+            yield
+            return
+
+        self._local.check_name = check_name
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.thread_time() - cpu_start
+            self._local.check_name = None
+            with self._lock:
+                times = self._entry(check_name)[phase]
+                times[0] += wall
+                times[1] += cpu
+
+    def count(self, counter, amount=1):
+        """
+        Add to an I/O counter of the current check.
+        """
+        check_name = getattr(self._local, "check_name", None) or PROFILE_PIPELINE
+        with self._lock:
+            self._entry(check_name)[counter] += amount
+
+    def report(self):
+        """
+        Returns the cost of each check, sorted by decreasing wall time:
+        [{"name": ..., "wall_ms": ..., "cpu_ms": ..., "should_skip_ms": ..., ..., "stats": ..., ...}].
+        """
+        rows = []
+        with self._lock:
+            for check_name, entry in self.checks.items():
+                row = {
+                    "name": check_name,
+                    "wall_ms": sum(entry[phase][0] for phase in PROFILE_PHASES) * 1000,
+                    "cpu_ms": sum(entry[phase][1] for phase in PROFILE_PHASES) * 1000,
+                }
+                for phase in PROFILE_PHASES:
+                    row[f"{phase}_ms"] = entry[phase][0] * 1000
+                for counter in PROFILE_COUNTERS:
+                    row[counter] = entry[counter]
+                rows.append(row)
+        return sorted(rows, key=lambda row: (-row["wall_ms"], row["name"]))
+
+    def print_report(self):
+        """
+        Print the cost table, most expensive checks first.
+        """
+        rows = self.report()
+        name_width = max([len("Check")] + [len(row["name"]) for row in rows])
+        columns = [
+            ("wall_ms", "Wall ms"),
+            ("cpu_ms", "CPU ms"),
+            *((f"{phase}_ms", phase) for phase in PROFILE_PHASES),
+        ]
+        counters = [
+            ("stats", "Stats"),
+            ("opens", "Opens"),
+            ("bytes_read", "Bytes read"),
+            ("dirs_walked", "Dirs"),
+            ("git_subprocesses", "Git"),
+        ]
+
+        print(
+            f"\n{'Check':<{name_width}} | "
+            + " | ".join(f"{title:>11}" for _, title in columns + counters)
+        )
+        print(f"{'-' * name_width}-|" + "|".join("-" * 13 for _ in columns + counters))
+        for row in rows:
+            print(
+                f"{row['name']:<{name_width}} | "
+                + " | ".join(f"{row[key]:11.2f}" for key, _ in columns)
+                + " | "
+                + " | ".join(f"{row[key]:11}" for key, _ in counters)
+            )
+
+
+class Tracer:
+    """
+    Records spans in the Chrome trace event format, for chrome://tracing or https://ui.perfetto.dev.
+    e.g., with tracer.span("readme.title.check", "check"): ...
+
+    Each thread (e.g., each worker of the checks thread pool) gets its own lane (tid).
+    """
+
+    def __init__(self):
+        self.events = []
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        # Thread ident -> lane (tid).
+        self._lanes = {}
+
+    def _lane(self):
+        ident = threading.get_ident()
+        lane = self._lanes.get(ident)
+        if lane is None:
+            lane = self._lanes[ident] = len(self._lanes)
+            self.events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": os.getpid(),
+                    "tid": lane,
+                    "args": {"name": threading.current_thread().name},
+                }
+            )
+        return lane
+
+    @contextlib.contextmanager
+    def span(self, name, category, **args):
+        """
+        Record a complete event ("X") for the duration of the block.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            with self._lock:
+                self.events.append(
+                    {
+                        "name": name,
+                        "cat": category,
+                        "ph": "X",
+                        "ts": (start - self._start) * 1e6,
+                        "dur": (end - start) * 1e6,
+                        "pid": os.getpid(),
+                        "tid": self._lane(),
+                        "args": args,
+                    }
+                )
+
+    def write(self, path):
+        """
+        Write the trace file (JSON object format).
+        """
+        with self._lock:
+            events = list(self.events)
+        with open(path, "w") as file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+
+
+# Profiler for the current run (None: profiling disabled).
+_profiler = None
+
+# Tracer for the current process (None: tracing disabled).
+_tracer = None
+
+
+def enable_profiler():
+    """
+    Start profiling - e.g., for --profile. Returns the new profiler.
+    """
+    global _profiler
+    _profiler = Profiler()
+    return _profiler
+
+
+def disable_profiler():
+    """
+    Stop profiling.
+    """
+    global _profiler
+    _profiler = None
+
+
+def get_profiler():
+    """
+    Get the profiler for the current run, or None if profiling is disabled.
+    """
+    return _profiler
+
+
+def enable_tracer():
+    """
+    Start tracing - e.g., for --trace. Returns the new tracer.
+    """
+    global _tracer
+    _tracer = Tracer()
+    return _tracer
+
+
+def disable_tracer():
+    """
+    Stop tracing.
+    """
+    global _tracer
+    _tracer = None
+
+
+def get_tracer():
+    """
+    Get the tracer for the current process, or None if tracing is disabled.
+    """
+    return _tracer
+
+
+def count(counter, amount=1):
+    """
+    Add to an I/O counter of the current check (no-op if profiling is disabled).
+    e.g., count("opens"), count("bytes_read", size)
+    """
+    profiler = _profiler
+    if profiler is not None:
+        profiler.count(counter, amount)
+
+
+def trace_span(name, category, **args):
+    """
+    Record a span if tracing is enabled - e.g., with trace_span("git status", "git"): ...
+    """
+    tracer = _tracer
+    if tracer is None:
+        return contextlib.nullcontext()
+    return tracer.span(name, category, **args)
+
+
+def profile_phase(phase, method):
+    """
+    Wrap a check method, so the phase is measured when profiling (or tracing) is enabled.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        profiler = _profiler
+        tracer = _tracer
+        if profiler is None and tracer is None:
+            return method(self, *args, **kwargs)
+        with (
+            profiler.phase(self.name, phase)
+            if profiler is not None
+            else contextlib.nullcontext()
+        ):
+            with trace_span(f"{self.name}.{phase}", "check", check=self.name):
+                return method(self, *args, **kwargs)
+
+    return wrapper
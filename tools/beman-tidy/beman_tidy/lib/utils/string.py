@@ -38,102 +38,107 @@ def match_badges(string):
     ]
 
 
-def match_apache_license_v2_with_llvm_exceptions(content):
-    # beman/LICENSE contains the following text (multiple lines)
-    # - Apache License
-    # - Version 2.0
-    # - LLVM Exceptions to the Apache 2.0 License
-    #
-    # We also check for variations.
-    #
-    license_regex = [
-        rf"Apache License",  # noqa: F541
-        rf"Apache License 2\.0 with LLVM Exceptions",  # noqa: F541
-        rf"Apache License v2\.0 with LLVM Exceptions",  # noqa: F541,
-    ]
-    if not any(
-        re.search(regex, content, re.IGNORECASE) is not None for regex in license_regex
-    ):
-        return False
-
-    version_regex = [
-        rf"Version 2\.0",  # noqa: F541,
-        rf"Version v2\.0",  # noqa: F541,
-        rf"Version 2\.0 with LLVM Exceptions",  # noqa: F541,
-        rf"Version v2\.0 with LLVM Exceptions",  # noqa: F541,
-        rf"Apache License 2\.0 with LLVM Exceptions",  # noqa: F541
-        rf"Apache License v2\.0 with LLVM Exceptions",  # noqa: F541,
-        rf"Apache 2\.0",  # noqa: F541,
-        rf"Apache v2\.0",  # noqa: F541,
-    ]
-    if not any(
-        re.search(regex, content, re.IGNORECASE) is not None for regex in version_regex
-    ):
-        return False
-
-    llvm_exceptions_regex = [
-        rf"LLVM Exceptions",  # noqa: F541,
-        rf"Apache License 2\.0 with LLVM Exceptions",  # noqa: F541,
-        rf"Apache License v2\.0 with LLVM Exceptions",  # noqa: F541,
-        rf"LLVM Exceptions to the Apache 2\.0 License",  # noqa: F541,
-    ]
-    if not any(
-        re.search(regex, content, re.IGNORECASE) is not None
-        for regex in llvm_exceptions_regex
-    ):
-        return False
-
-    return True
-
-
-def match_boost_software_license_v1_0(content):
-    # beman/LICENSE contains the following text (multiple lines)
-    # - Boost Software License
-    # - Version 1.0
-    #
-    # We also check for variations.
-    #
-    license_regex = [
-        rf"Boost Software License",  # noqa: F541
-        rf"Boost License",  # noqa: F541
-        rf"Boost Software License 1\.0",  # noqa: F541,
-        rf"Boost Software License Version 1\.0",  # noqa: F541,
-    ]
-    if not any(
-        re.search(regex, content, re.IGNORECASE) is not None for regex in license_regex
-    ):
-        return False
-
-    version_regex = [
-        rf"Version 1\.0",  # noqa: F541,
-        rf"V1\.0",  # noqa: F541,
-        rf"Boost Software License 1\.0",  # noqa: F541,
-        rf"Boost Software License Version 1\.0",  # noqa: F541,
-    ]
-    if not any(
-        re.search(regex, content, re.IGNORECASE) is not None for regex in version_regex
-    ):
-        return False
-
-    return True
-
-
-def match_the_mit_license(content):
-    # beman/LICENSE contains the following text (multiple lines)
-    # - The MIT License
-    #
-    # We also check for variations.
-    #
-    license_regex = [
-        rf"The MIT License",  # noqa: F541
-        rf"MIT License",  # noqa: F541
-    ]
-    if not any(
-        re.search(regex, content, re.IGNORECASE) is not None for regex in license_regex
-    ):
-        return False
+class LiteralMatcher:
+    """
+    Multi-literal matcher (Aho-Corasick automaton).
+    Finds all the given literals in a single linear pass over the text,
+    however many literals there are - e.g., all the badges from the Beman Standard.
+
+    Literals are grouped by category - e.g., {"library_status": [...], "standard_target": [...]}.
+    """
 
-    return True
+    def __init__(self, literals_by_category):
+        self.categories = list(literals_by_category.keys())
+        # (category, literal) for each pattern.
+        self.literals = [
+            (category, literal)
+            for category, literals in literals_by_category.items()
+            for literal in literals
+        ]
+
+        # Trie transitions, failure links and output pattern indices for each state.
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        for index, (_, literal) in enumerate(self.literals):
+            state = 0
+            for char in literal:
+                if char not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                    self._goto[state][char] = len(self._goto) - 1
+                state = self._goto[state][char]
+            self._output[state].append(index)
+
+        # Breadth-first construction of the failure links.
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = (
+                    self._goto[fail][char] if char in self._goto[fail] else 0
+                )
+                self._output[next_state] += self._output[self._fail[next_state]]
+
+        # From the root state, jump directly to the next possible start of a literal.
+        first_chars = "".join(sorted(self._goto[0].keys()))
+        self._skip = re.compile(f"[{re.escape(first_chars)}]") if first_chars else None
+
+    @classmethod
+    def from_values(cls, values, default_category="values"):
+        """
+        Build a matcher from a Beman Standard "values" entry:
+        - a list of strings - e.g., readme.library_status
+        - a list of {category: [strings]} - e.g., readme.badges
+        """
+        literals_by_category = {}
+        for value in values:
+            if isinstance(value, dict):
+                for category, literals in value.items():
+                    literals_by_category.setdefault(category, []).extend(literals)
+            else:
+                literals_by_category.setdefault(default_category, []).append(value)
+        return cls(literals_by_category)
+
+    def find(self, text):
+        """
+        Returns the set of (category, literal) found in the text.
+        """
+        found = set()
+        if not text or self._skip is None:
+            return found
+
+        goto, fail, output = self._goto, self._fail, self._output
+        state, i, n = 0, 0, len(text)
+        while i < n:
+            if state == 0:
+                match = self._skip.search(text, i)
+                if match is None:
+                    break
+                i = match.start()
+
+            char = text[i]
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for index in output[state]:
+                found.add(self.literals[index])
+            i += 1
+
+        return found
+
+    def count(self, text):
+        """
+        Returns the number of distinct literals found in the text, for each category.
+        """
+        counts = {category: 0 for category in self.categories}
+        for category, _ in self.find(text):
+            counts[category] += 1
+        return counts
 
 
 def skip_lines(lines, n):
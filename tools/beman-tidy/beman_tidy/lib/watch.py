@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import errno
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+
+from .pipeline import run_checks_pipeline
+from .utils.cache import get_file_content_cache
+from .utils.filesystem import (
+    REPOSITORY_CONFIG_FILE,
+    ExcludeRules,
+    get_repository_snapshot,
+    load_repository_config,
+)
+from .utils.git import list_git_ignored_directories
+
+# Directories never watched - e.g., git internals change on every git command.
+WATCH_IGNORED_DIRECTORIES = [".git"]
+
+# Time to wait for more events after the first one, so a save touching many files triggers a single run (seconds).
+WATCH_DEBOUNCE_DELAY = 0.05
+
+# Interval between two scans of the polling watcher (seconds).
+WATCH_POLLING_INTERVAL = 0.5
+
+# inotify constants - see <sys/inotify.h>.
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0x00000800
+IN_CLOEXEC = 0x00080000
+INOTIFY_EVENT_HEADER = struct.Struct("iIII")
+INOTIFY_WATCH_MASK = (
+    IN_MODIFY
+    | IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+)
+
+
+def _is_ignored(root, path):
+    """
+    Check if the path is inside one of the ignored directories (e.g., .git).
+    """
+    return any(
+        part in WATCH_IGNORED_DIRECTORIES for part in Path(path).relative_to(root).parts
+    )
+
+
+class WatchedDirectories:
+    """
+    The directories of the tree worth watching: not the ignored directories (e.g., .git), not the directories
+    excluded by the repository config (exclude_dirs) and - if only tracked files are checked - not the directories
+    ignored by git (e.g., build/ trees), whose changes never reach the repository snapshot.
+    """
+
+    def __init__(self, root, tracked_only=True):
+        self.root = root
+        self.tracked_only = tracked_only
+        self.reload()
+
+    def reload(self):
+        """
+        Load the rules again - e.g., after a change of the repository config or of a .gitignore.
+        """
+        self._exclude = ExcludeRules(
+            load_repository_config(self.root).get("exclude_dirs", [])
+        )
+        self._git_ignored = (
+            list_git_ignored_directories(self.root) if self.tracked_only else None
+        ) or set()
+
+    def includes(self, directory):
+        """
+        Check if the given directory (absolute) is watched.
+        """
+        relative_dir = Path(directory).relative_to(self.root).as_posix()
+        if relative_dir == ".":
+            return True
+        return not (
+            any(part in WATCH_IGNORED_DIRECTORIES for part in relative_dir.split("/"))
+            or self._exclude.excludes(relative_dir)
+            or relative_dir in self._git_ignored
+        )
+
+    def affected_by(self, path):
+        """
+        Check if a change of the given path may change the rules.
+        """
+        path = Path(path)
+        return path.name == ".gitignore" or path == self.root / REPOSITORY_CONFIG_FILE
+
+
+class InotifyWatcher:
+    """
+    Filesystem watcher based on Linux inotify (through ctypes, no extra dependency).
+    Every watched directory of the tree has its own watch; new directories are watched as soon as they are created.
+    Raises OSError if a watch cannot be added (e.g., ENOSPC: the inotify watch limit is reached),
+    so the caller can fall back to a PollingWatcher.
+    """
+
+    def __init__(self, root, tracked_only=True):
+        import ctypes
+        import ctypes.util
+
+        self.root = Path(os.path.abspath(root))
+        self.tracked_only = tracked_only
+        self._directories = WatchedDirectories(self.root, tracked_only)
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._get_errno = ctypes.get_errno
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1() failed")
+        # Watch descriptor -> watched directory.
+        self._watches = {}
+        try:
+            self._watch_tree(self.root)
+        except OSError:
+            self.close()
+            raise
+
+    @staticmethod
+    def is_available():
+        """
+        Check if inotify can be used on this platform.
+        """
+        return sys.platform.startswith("linux")
+
+    def _watch_tree(self, directory):
+        """
+        Watch the directory and all its subdirectories, except the unwatched ones (see WatchedDirectories).
+        Returns the paths found inside (e.g., files created before the watch was added).
+        Raises OSError if a watch cannot be added.
+        """
+        found = []
+        if not self._directories.includes(directory):
+            return found
+        for current, subdirectories, files in os.walk(directory):
+            subdirectories[:] = [
+                d
+                for d in subdirectories
+                if self._directories.includes(os.path.join(current, d))
+            ]
+            wd = self._libc.inotify_add_watch(
+                self._fd, os.fsencode(current), INOTIFY_WATCH_MASK
+            )
+            if wd < 0:
+                error = self._get_errno()
+                if error in (errno.ENOENT, errno.ENOTDIR):
+                    # Removed (or replaced) since the walk listed it: its deletion is reported by its parent.
+                    continue
+                raise OSError(error, f"inotify_add_watch() failed for {current}")
+            self._watches[wd] = Path(current)
+            found.extend(Path(current) / name for name in subdirectories + files)
+        return found
+
+    def read(self, timeout=None):
+        """
+        Wait for changes (up to timeout seconds, forever if None) and return the changed paths.
+        Raises OSError if a new directory cannot be watched.
+        """
+        changed_paths = {}
+        deadline = None
+        while True:
+            wait = timeout
+            if deadline is not None:
+                wait = max(0, deadline - time.monotonic())
+            readable, _, _ = select.select([self._fd], [], [], wait)
+            if not readable:
+                break
+
+            for path in self._read_events():
+                changed_paths[path] = None
+            if changed_paths and deadline is None:
+                # Debounce: collect the events of the same save.
+                deadline = time.monotonic() + WATCH_DEBOUNCE_DELAY
+            timeout = 0 if deadline is None else timeout
+
+        return [p for p in changed_paths if not _is_ignored(self.root, p)]
+
+    def _read_events(self):
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        paths = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = INOTIFY_EVENT_HEADER.unpack_from(data, offset)
+            offset += INOTIFY_EVENT_HEADER.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                # Events were lost: report the whole tree as changed.
+                paths.append(self.root)
+                continue
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+
+            directory = self._watches.get(wd)
+            if directory is None:
+                continue
+            path = directory / os.fsdecode(name) if name else directory
+            paths.append(path)
+            if self._directories.affected_by(path):
+                self._directories.reload()
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                # e.g., a new build/ tree: ignored by git only once it exists.
+                self._directories.reload()
+                paths.extend(self._watch_tree(path))
+        return paths
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class PollingWatcher:
+    """
+    Portable filesystem watcher: scans the watched directories of the tree (stat only, no reads)
+    every WATCH_POLLING_INTERVAL seconds.
+    """
+
+    def __init__(self, root, tracked_only=True):
+        self.root = Path(os.path.abspath(root))
+        self.tracked_only = tracked_only
+        self._directories = WatchedDirectories(self.root, tracked_only)
+        self._signatures = self._scan()
+
+    def _scan(self):
+        """
+        Returns {path: (is_dir, mtime_ns, size)} for all the entries in the tree.
+        """
+        signatures = {}
+        stack = [self.root]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                    stat = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                if is_dir and not self._directories.includes(entry.path):
+                    continue
+                signatures[Path(entry.path)] = (
+                    is_dir,
+                    0 if is_dir else stat.st_mtime_ns,
+                    0 if is_dir else stat.st_size,
+                )
+                if is_dir:
+                    stack.append(Path(entry.path))
+        return signatures
+
+    def poll(self):
+        """
+        Scan the tree once and return the paths changed since the previous scan.
+        """
+        signatures = self._scan()
+        if any(
+            self._directories.affected_by(path)
+            or (is_dir and path not in self._signatures)
+            for path, (is_dir, _, _) in signatures.items()
+            if signatures[path] != self._signatures.get(path)
+        ):
+            # The rules may have changed (e.g., a new build/ tree, ignored by git only once it exists): scan again.
+            self._directories.reload()
+            signatures = self._scan()
+        changed_paths = [
+            path
+            for path in signatures.keys() | self._signatures.keys()
+            if signatures.get(path) != self._signatures.get(path)
+        ]
+        self._signatures = signatures
+        return sorted(changed_paths)
+
+    def read(self, timeout=None):
+        """
+        Wait for changes (up to timeout seconds, forever if None) and return the changed paths.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed_paths = self.poll()
+            if changed_paths or (deadline is not None and time.monotonic() >= deadline):
+                return changed_paths
+            time.sleep(WATCH_POLLING_INTERVAL)
+
+    def close(self):
+        pass
+
+
+def create_watcher(root, tracked_only=True):
+    """
+    Create the best filesystem watcher for the platform: inotify on Linux, polling otherwise
+    (or if the tree cannot be watched with inotify - e.g., the watch limit is reached).
+    """
+    if InotifyWatcher.is_available():
+        try:
+            return InotifyWatcher(root, tracked_only)
+        except OSError:
+            pass
+    return PollingWatcher(root, tracked_only)
+
+
+def read_changes(watcher, timeout=None):
+    """
+    Read the changes from the watcher. If the watcher fails (e.g., a new directory cannot be watched with inotify),
+    it is replaced by a PollingWatcher and the whole tree is reported as changed.
+
+    @return: (watcher, changed paths)
+    """
+    try:
+        return watcher, watcher.read(timeout)
+    except OSError:
+        watcher.close()
+        return PollingWatcher(watcher.root, watcher.tracked_only), [watcher.root]
+
+
+def run_watch(checks_to_run, args, beman_standard_check_config, watcher=None):
+    """
+    Run the checks pipeline, then re-run it on every filesystem change until interrupted (Ctrl+C).
+
+    The process, the config, the repository snapshot and the file content cache stay warm:
+    the snapshot is updated only for the changed paths, and only the checks whose inputs
+    were touched are evaluated again - the other results are reused from the previous run.
+
+    @return: The number of failed checks in the last run.
+    """
+    top_level = args.repo_info["top_level"]
+    # Watch before the first run, so changes made while it runs are not missed.
+    watcher = (
+        watcher
+        if watcher is not None
+        else create_watcher(top_level, args.tracked_files)
+    )
+    try:
+        previous_results = {}
+        failed_checks = run_checks_pipeline(
+            checks_to_run,
+            args,
+            beman_standard_check_config,
+            previous_results=previous_results,
+        )
+
+        print(f"\nWatching {top_level} for changes (Ctrl+C to stop) ...")
+        sys.stdout.flush()
+        try:
+            while True:
+                watcher, changed_paths = read_changes(watcher)
+                if not changed_paths:
+                    continue
+
+                get_repository_snapshot(top_level).refresh(*changed_paths)
+                if Path(top_level) in changed_paths:
+                    # The whole tree changed (e.g., lost inotify events).
+                    get_file_content_cache().clear()
+                for path in changed_paths:
+                    get_file_content_cache().invalidate(path)
+
+                print(
+                    f"\nbeman-tidy: {len(changed_paths)} path(s) changed, re-running ..."
+                )
+                failed_checks = run_checks_pipeline(
+                    checks_to_run,
+                    args,
+                    beman_standard_check_config,
+                    changed_paths=changed_paths,
+                    previous_results=previous_results,
+                )
+        except KeyboardInterrupt:
+            pass
+    finally:
+        watcher.close()
+
+    return failed_checks
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from beman_tidy.lib.utils.cache import get_cache_dir
+
+from .compare import DEFAULT_REGRESSION_THRESHOLD, compare_results, print_comparison
+from .generator import BENCHMARK_SCALES, generate_repository, parse_scale
+from .runner import run_benchmarks
+
+
+def parse_args():
+    """
+    Parse the CLI arguments.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="beman-tidy benchmarks on synthetic Beman-shaped repositories",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    generate = subparsers.add_parser("generate", help="generate a synthetic repository")
+    generate.add_argument(
+        "--scale",
+        help=f"number of files: {', '.join(BENCHMARK_SCALES)} or a number (default: 1k)",
+        default="1k",
+    )
+    generate.add_argument("directory", help="directory to generate the repository in")
+
+    run = subparsers.add_parser(
+        "run", help="run the benchmarks and write the results as JSON"
+    )
+    run.add_argument(
+        "--scales",
+        help="comma-separated list of scales (default: 1k,10k)",
+        default="1k,10k",
+    )
+    run.add_argument(
+        "--repeat",
+        help="number of runs per timing, the best one is kept (default: 3)",
+        type=int,
+        default=3,
+    )
+    run.add_argument(
+        "--work-dir",
+        help="directory of the generated repositories, reused between runs (default: in the beman-tidy cache directory)",
+        type=Path,
+        default=None,
+    )
+    run.add_argument(
+        "--output",
+        help="path of the JSON results (default: stdout)",
+        type=Path,
+        default=None,
+    )
+
+    compare = subparsers.add_parser(
+        "compare", help="compare results with a baseline and report regressions"
+    )
+    compare.add_argument("baseline", help="baseline JSON results", type=Path)
+    compare.add_argument("current", help="current JSON results", type=Path)
+    compare.add_argument(
+        "--threshold",
+        help=f"relative slowdown reported as a regression (default: {DEFAULT_REGRESSION_THRESHOLD})",
+        type=float,
+        default=DEFAULT_REGRESSION_THRESHOLD,
+    )
+
+    return parser.parse_args()
+
+
+def main():
+    """
+    The benchmarks entry point.
+    """
+    args = parse_args()
+
+    if args.command == "generate":
+        repo_path = generate_repository(Path(args.directory), parse_scale(args.scale))
+        print(repo_path)
+        return 0
+
+    if args.command == "run":
+        work_dir = (
+            args.work_dir
+            if args.work_dir is not None
+            else get_cache_dir() / "benchmarks"
+        )
+        results = run_benchmarks(
+            args.scales.split(","),
+            work_dir,
+            args.repeat,
+            log=lambda msg: print(msg, file=sys.stderr),
+        )
+        if args.output is None:
+            print(json.dumps(results, indent=2))
+        else:
+            args.output.write_text(json.dumps(results, indent=2) + "\n")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text())
+    current = json.loads(args.current.read_text())
+    print_comparison(baseline, current)
+    regressions = compare_results(baseline, current, args.threshold)
+    for regression in regressions:
+        print(
+            f"REGRESSION [{regression.scale}] {regression.name}: "
+            f"{regression.baseline * 1000:.3f} ms -> {regression.current * 1000:.3f} ms "
+            f"({(regression.ratio - 1) * 100:+.1f}%)"
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+from typing import NamedTuple
+
+# Default tolerance before a slowdown is reported as a regression - e.g., 0.20 is 20% slower.
+DEFAULT_REGRESSION_THRESHOLD = 0.20
+
+# Slowdowns below this absolute delta (seconds) are ignored as timer noise.
+MIN_REGRESSION_DELTA = 0.001
+
+
+class Regression(NamedTuple):
+    """
+    A timing slower than its baseline - e.g., Regression("10k", "checks.readme.title", 0.002, 0.003).
+    """
+
+    scale: str
+    name: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self):
+        return self.current / self.baseline if self.baseline > 0 else float("inf")
+
+
+def flatten_results(scale_results):
+    """
+    Flatten the results of a scale: {"walk": s, "checks.readme.title": s, "run_checks_pipeline": s, ...}.
+    """
+    timings = {
+        "walk": scale_results["walk"],
+        "run_checks_pipeline": scale_results["run_checks_pipeline"],
+    }
+    for check_name, seconds in scale_results["checks"].items():
+        timings[f"checks.{check_name}"] = seconds
+    return timings
+
+
+def compare_results(
+    baseline,
+    current,
+    threshold=DEFAULT_REGRESSION_THRESHOLD,
+    min_delta=MIN_REGRESSION_DELTA,
+):
+    """
+    Compare the current benchmark results with the baseline (same scales and timings only).
+
+    @return: The regressions, worst first.
+    """
+    if baseline.get("format") != current.get("format"):
+        raise ValueError(
+            f"Cannot compare results of different formats: {baseline.get('format')} vs {current.get('format')}."
+        )
+
+    regressions = []
+    for scale, current_results in current["scales"].items():
+        if scale not in baseline["scales"]:
+            continue
+        baseline_timings = flatten_results(baseline["scales"][scale])
+        for name, seconds in flatten_results(current_results).items():
+            if name not in baseline_timings:
+                continue
+            base = baseline_timings[name]
+            if seconds > base * (1 + threshold) and seconds - base > min_delta:
+                regressions.append(Regression(scale, name, base, seconds))
+
+    return sorted(regressions, key=lambda regression: -regression.ratio)
+
+
+def print_comparison(baseline, current):
+    """
+    Print the timings of the current results next to the baseline.
+    """
+    for scale, current_results in current["scales"].items():
+        if scale not in baseline["scales"]:
+            print(f"[{scale}] no baseline")
+            continue
+        baseline_timings = flatten_results(baseline["scales"][scale])
+        print(f"[{scale}]")
+        for name, seconds in flatten_results(current_results).items():
+            if name not in baseline_timings:
+                continue
+            base = baseline_timings[name]
+            change = (seconds / base - 1) * 100 if base > 0 else 0
+            print(
+                f"  {name:<45} {base * 1000:10.3f} ms -> {seconds * 1000:10.3f} ms ({change:+7.1f}%)"
+            )
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import json
+import os
+import random
+import shutil
+import subprocess
+from pathlib import Path
+
+from beman_tidy.lib.utils.git import get_beman_recommendated_license_path
+
+# Benchmark scales: name -> number of generated files.
+BENCHMARK_SCALES = {
+    "1k": 1_000,
+    "10k": 10_000,
+    "100k": 100_000,
+    "1m": 1_000_000,
+}
+
+# Version of the generator. Bump it when the generated layout changes, to regenerate the cached repositories.
+GENERATOR_VERSION = 1
+
+# Share of the generated files for each area of the repository.
+# e.g., build trees and vendored dependencies dominate real-world checkouts.
+GENERATOR_LAYOUT = {
+    "build": 0.40,
+    "infra": 0.05,
+    "tests": 0.15,
+    "docs": 0.10,
+    "papers": 0.05,
+    "sources": 0.15,
+    "examples": 0.05,
+    "misc": 0.05,
+}
+
+# Maximum number of files per generated directory.
+GENERATOR_FANOUT = 50
+
+# Marker file with the generator parameters - e.g., to reuse an already generated repository.
+GENERATOR_MARKER = ".beman-tidy-benchmark.json"
+
+
+def parse_scale(scale):
+    """
+    Get the number of files for a scale: a name (e.g., "10k") or a number (e.g., "2500").
+    """
+    if scale in BENCHMARK_SCALES:
+        return BENCHMARK_SCALES[scale]
+    return int(scale)
+
+
+def _fan_out(prefix, names):
+    """
+    Spread the names over nested directories of at most GENERATOR_FANOUT entries each.
+    e.g., tests/beman/exemplar/d0003/identity_test_3.cpp
+    """
+    if len(names) <= GENERATOR_FANOUT:
+        return [f"{prefix}/{name}" for name in names]
+    return [
+        f"{prefix}/d{index // GENERATOR_FANOUT:04}/{name}"
+        for index, name in enumerate(names)
+    ]
+
+
+def generate_layout(n_files, name="exemplar", seed=0):
+    """
+    Compute the relative paths of a Beman-shaped repository with about n_files files.
+    The layout is deterministic for the same (n_files, name, seed).
+    """
+    rng = random.Random(seed)
+    counts = {
+        area: max(1, int(n_files * share)) for area, share in GENERATOR_LAYOUT.items()
+    }
+    paths = [
+        "README.md",
+        "LICENSE",
+        "CMakeLists.txt",
+        ".gitignore",
+        ".github/CODEOWNERS",
+    ]
+
+    # Nested build trees: CMake object directories and FetchContent checkouts.
+    build = []
+    for index in range(counts["build"]):
+        if rng.random() < 0.5:
+            build.append(
+                f"build/{rng.choice(['Debug', 'Release'])}/CMakeFiles/target{index % 97}.dir/object{index}.o"
+            )
+        else:
+            build.append(
+                f"build/_deps/dep{index % 13}-src/tests/dep_test{index}.cpp"
+                if index % 5 == 0
+                else f"build/_deps/dep{index % 13}-src/docs/page{index}.md"
+            )
+    paths += build
+
+    # Vendored infrastructure - e.g., the beman infra repository.
+    paths += _fan_out(
+        "infra/cmake",
+        [f"module{index}.cmake" for index in range(counts["infra"])],
+    )
+
+    paths += _fan_out(
+        f"tests/beman/{name}",
+        [f"feature{index}_test.cpp" for index in range(counts["tests"])],
+    )
+    paths += _fan_out(
+        "docs",
+        [f"topic{index}.md" for index in range(counts["docs"])],
+    )
+    paths += _fan_out(
+        "papers",
+        [
+            f"P{1000 + index}R{index % 4}.{rng.choice(['md', 'bib', 'tex'])}"
+            for index in range(counts["papers"])
+        ],
+    )
+    sources = [f"feature{index}.hpp" for index in range(counts["sources"] // 2)]
+    paths += _fan_out(f"include/beman/{name}", sources)
+    paths += _fan_out(
+        f"src/beman/{name}",
+        [f"feature{index}.cpp" for index in range(counts["sources"] - len(sources))],
+    )
+    paths += _fan_out(
+        "examples",
+        [f"example{index}.cpp" for index in range(counts["examples"])],
+    )
+    # Markdown files scattered everywhere - e.g., READMEs of subdirectories.
+    areas = ["docs", "examples", f"include/beman/{name}", "infra", "tests"]
+    paths += [
+        f"{rng.choice(areas)}/notes{index}/README.md" for index in range(counts["misc"])
+    ]
+
+    return paths
+
+
+def _readme(name, size):
+    """
+    A valid README.md of (at least) the given size - i.e., large READMEs with many sections.
+    """
+    lines = [
+        f"# beman.{name}: A Beman Library Benchmark",
+        "",
+        "![Library Status](https://raw.githubusercontent.com/bemanproject/beman/refs/heads/main/images/badges/beman_badge-beman_library_under_development.svg)",
+        "",
+        f"`beman.{name}` is a synthetic library, generated to benchmark beman-tidy.",
+        "",
+        "**Implements**: `std::identity` proposed in [Standard Library Concepts (P0898R3)](https://wg21.link/P0898R3).",
+        "",
+        "**Status**: [Under development and not yet ready for production use.](https://github.com/bemanproject/beman/blob/main/docs/beman_library_maturity_model.md#under-development-and-not-yet-ready-for-production-use)",
+        "",
+    ]
+    section = 0
+    while sum(len(line) + 1 for line in lines) < size:
+        lines += [
+            f"## Section {section}",
+            "",
+            "Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor. "
+            * 8,
+            "",
+        ]
+        section += 1
+    lines += [
+        "## License",
+        "",
+        f"`beman.{name}` is licensed under the Apache License v2.0 with LLVM Exceptions.",
+        "",
+    ]
+    return "\n".join(lines)
+
+
+def generate_repository(root, n_files, name="exemplar", seed=0):
+    """
+    Generate (or reuse, if already generated with the same parameters) a Beman-shaped git repository
+    with about n_files files at root/name. The files are not committed: checks only need a .git directory.
+
+    @return: The repository path.
+    """
+    repo_path = Path(root) / name
+    parameters = {
+        "version": GENERATOR_VERSION,
+        "n_files": n_files,
+        "name": name,
+        "seed": seed,
+    }
+    marker = repo_path / ".git" / GENERATOR_MARKER
+    if marker.exists() and json.loads(marker.read_text()) == parameters:
+        return repo_path
+
+    if repo_path.exists():
+        shutil.rmtree(repo_path)
+    repo_path.mkdir(parents=True)
+
+    license_text = get_beman_recommendated_license_path().read_text()
+    contents = {
+        "README.md": _readme(name, max(4 * 1024, n_files * 16)),
+        "LICENSE": license_text,
+        "CMakeLists.txt": f"cmake_minimum_required(VERSION 3.25)\nproject(beman.{name} LANGUAGES CXX)\n",
+        ".gitignore": "build/\n",
+        ".github/CODEOWNERS": "* @bemanproject/core-reviewers\n",
+    }
+    directories = set()
+    for path in generate_layout(n_files, name, seed):
+        parent = os.path.dirname(path)
+        if parent and parent not in directories:
+            os.makedirs(repo_path / parent, exist_ok=True)
+            directories.add(parent)
+        with open(repo_path / path, "w") as file:
+            file.write(contents.get(path, f"// {path}\n"))
+
+    subprocess.run(
+        ["git", "init", "-q", "-b", "main", str(repo_path)],
+        check=True,
+        capture_output=True,
+    )
+    marker.write_text(json.dumps(parameters))
+    return repo_path
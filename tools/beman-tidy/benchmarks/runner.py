@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import contextlib
+import io
+import platform
+import sys
+import time
+
+from beman_tidy.lib.checks.system.registry import (
+    get_all_beman_standard_check_names,
+    get_beman_standard_check_by_name,
+)
+from beman_tidy.lib.pipeline import get_pipeline_args, run_checks_pipeline
+from beman_tidy.lib.utils.cache import clear_file_content_cache
+from beman_tidy.lib.utils.filesystem import (
+    clear_repository_snapshots,
+    get_repository_snapshot,
+)
+from beman_tidy.lib.utils.git import get_repo_info, load_beman_standard_config
+
+from .generator import generate_repository, parse_scale
+
+# Version of the results format. Bump it on incompatible changes, compare refuses mixed versions.
+BENCHMARK_RESULTS_FORMAT = 1
+
+
+def best_time(function, repeat):
+    """
+    Run the function repeat times and return the best wall time (seconds).
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_check_once(check_class, repo_info, beman_standard_check_config):
+    """
+    Run a check like the pipeline does (without logs), with a cold file content cache.
+    """
+    clear_file_content_cache()
+    check_instance = check_class(repo_info, beman_standard_check_config)
+    if not check_instance.should_skip():
+        check_instance.pre_check() and check_instance.check()
+
+
+def benchmark_repository(repo_path, repeat=3):
+    """
+    Time the repository walk, every registered check and the full pipeline on the given repository.
+    Checks are timed on a warm repository snapshot (walked once, like in the pipeline - its cost is the "walk"
+    timing), each with a cold file content cache.
+
+    @return: {"walk": seconds, "checks": {check name: seconds}, "run_checks_pipeline": seconds}.
+    """
+    beman_standard_check_config = load_beman_standard_config()
+    repo_info = get_repo_info(repo_path)
+    top_level = repo_info["top_level"]
+
+    def walk():
+        clear_repository_snapshots()
+        get_repository_snapshot(top_level)
+
+    results = {"walk": best_time(walk, repeat), "checks": {}}
+
+    # Checks share the snapshot, like in the pipeline: walk it here, so no check timing includes the walk
+    # (whatever the order of the checks).
+    walk()
+    for check_name in get_all_beman_standard_check_names():
+        check_class = get_beman_standard_check_by_name(check_name)
+        results["checks"][check_name] = best_time(
+            lambda check_class=check_class: run_check_once(
+                check_class, repo_info, beman_standard_check_config
+            ),
+            repeat,
+        )
+
+    args = get_pipeline_args(repo_info, cache=False)
+
+    def pipeline():
+        with contextlib.redirect_stdout(io.StringIO()):
+            run_checks_pipeline(
+                list(beman_standard_check_config), args, beman_standard_check_config
+            )
+
+    results["run_checks_pipeline"] = best_time(pipeline, repeat)
+    return results
+
+
+def run_benchmarks(scales, work_dir, repeat=3, log=print):
+    """
+    Generate the repositories for the given scales (e.g., ["1k", "10k"]) and benchmark them.
+
+    @return: The results (JSON-serializable).
+    """
+    results = {
+        "format": BENCHMARK_RESULTS_FORMAT,
+        "python": platform.python_version(),
+        "platform": sys.platform,
+        "repeat": repeat,
+        "scales": {},
+    }
+    for scale in scales:
+        n_files = parse_scale(scale)
+        log(f"[{scale}] generating a repository with {n_files} files ...")
+        repo_path = generate_repository(work_dir / scale, n_files)
+        log(f"[{scale}] running the benchmarks (best of {repeat}) ...")
+        results["scales"][scale] = {
+            "files": n_files,
+            **benchmark_repository(repo_path, repeat),
+        }
+        log(
+            f"[{scale}] walk: {results['scales'][scale]['walk'] * 1000:.2f} ms, "
+            f"run_checks_pipeline: {results['scales'][scale]['run_checks_pipeline'] * 1000:.2f} ms"
+        )
+    return results
@@ -16,11 +16,14 @@ def pytest_configure(config):
 
 
 @pytest.fixture(autouse=True)
-def _setup_test_environment():
+def _setup_test_environment(tmp_path, monkeypatch):
     """
     Setup test environment variables and paths.
     This runs automatically for all tests.
     """
+    # Do not read or write the user's on-disk cache.
+    monkeypatch.setenv("BEMAN_TIDY_CACHE_DIR", str(tmp_path / "cache"))
+
     # Get the root directory of the project
     root_dir = Path(__file__).parent.parent
 
@@ -5,6 +5,8 @@ import inspect
 from pathlib import Path
 
 from beman_tidy.lib.checks.system.registry import (
+    generate_beman_standard_check_manifest,
+    get_beman_standard_check_manifest_path,
     get_registered_beman_standard_checks,
 )
 from tests.utils.registry import (
@@ -155,3 +157,14 @@ def test__registry_no_duplicates__check():
             duplicates.append((check_class.__name__, check_names))
 
     assert len(duplicates) == 0, f"Found duplicate registrations: {duplicates}"
+
+
+def test__registry_manifest__up_to_date():
+    """
+    Test that the generated manifest matches the registered checks.
+    Regenerate it with `python -m beman_tidy.lib.checks.system.generate_manifest`.
+    """
+    assert (
+        get_beman_standard_check_manifest_path().read_text()
+        == generate_beman_standard_check_manifest()
+    ), "The check manifest is out of date."
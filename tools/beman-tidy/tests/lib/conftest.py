@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import pytest
+
+from beman_tidy.lib.pipeline import get_pipeline_args
+from tests.utils.conftest import mock_repo_info, mock_beman_standard_check_config  # noqa: F401
+
+
+@pytest.fixture(autouse=True)
+def repo_info(mock_repo_info):  # noqa: F811
+    return mock_repo_info
+
+
+@pytest.fixture(autouse=True)
+def beman_standard_check_config(mock_beman_standard_check_config):  # noqa: F811
+    return mock_beman_standard_check_config
+
+
+@pytest.fixture
+def pipeline_args(repo_info):
+    """
+    Factory of run_checks_pipeline() options for the mock repository: the CLI defaults, with --require-all,
+    without the result cache, and with the given overrides - e.g., pipeline_args(jobs=2, output="ndjson").
+    """
+
+    def make_pipeline_args(**overrides):
+        return get_pipeline_args(
+            **{"repo_info": repo_info, "require_all": True, "cache": False, **overrides}
+        )
+
+    return make_pipeline_args
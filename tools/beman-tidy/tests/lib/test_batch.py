@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+from beman_tidy.lib.batch import (
+    find_repositories,
+    lint_repository,
+    print_compliance_table,
+)
+
+
+def test__find_repositories__valid(tmp_path):
+    """
+    Test that only direct subdirectories with a .git entry are found, in sorted order.
+    """
+    (tmp_path / "optional" / ".git").mkdir(parents=True)
+    (tmp_path / "exemplar" / ".git").mkdir(parents=True)
+    (tmp_path / "worktree").mkdir()
+    (tmp_path / "worktree" / ".git").write_text("gitdir: ../exemplar/.git")
+    (tmp_path / "not-a-repo").mkdir()
+    (tmp_path / "file.txt").write_text("")
+
+    assert find_repositories(tmp_path) == [
+        tmp_path / "exemplar",
+        tmp_path / "optional",
+        tmp_path / "worktree",
+    ]
+
+
+def test__lint_repository__invalid(
+    tmp_path, beman_standard_check_config, pipeline_args
+):
+    """
+    Test that an invalid repository gets its own failed exit status, without stopping the batch.
+    """
+    args = pipeline_args(require_all=False)
+    result = lint_repository(
+        tmp_path, ["readme.title"], args, beman_standard_check_config
+    )
+
+    assert result["exit_status"] == 1
+    assert result["summary"] == {}
+    assert "is not inside a valid Git repository" in result["output"]
+
+
+def test__print_compliance_table__partial(capsys):
+    """
+    Test that a partial run (e.g., --since) has no coverage and is left out of the organization coverage.
+    """
+    summary = {"total_passed": 3, "total_implemented": 4, "total_failed": 1}
+    results = [
+        {
+            "name": "exemplar",
+            "exit_status": 1,
+            "summary": {
+                **summary,
+                "partial": False,
+                "coverage": {"Requirement": 75.0, "Recommendation": 0, "TOTAL": 75.0},
+            },
+        },
+        {
+            "name": "optional",
+            "exit_status": 1,
+            "summary": {**summary, "total_passed": 1, "partial": True},
+        },
+    ]
+    print_compliance_table(results)
+    output = capsys.readouterr().out
+
+    assert (
+        "optional   | failed |     partial |        partial | partial |      1"
+        in output
+    )
+    assert "Coverage ORGANIZATION:  75.00% (3/4 checks passed" in output
+    assert "1 partial repositories excluded" in output
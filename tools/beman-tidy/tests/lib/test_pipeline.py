@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import argparse
+import json
+import pytest
+import subprocess
+import threading
+import time
+
+from beman_tidy.lib.checks.beman_standard.readme import (
+    ReadmeBadgesCheck,
+    ReadmeTitleCheck,
+)
+from beman_tidy.lib.pipeline import (
+    dependency_lanes,
+    order_by_dependencies,
+    run_checks_concurrently,
+    run_checks_pipeline,
+)
+from beman_tidy.lib.utils.git import get_repo_info
+
+
+def test__run_checks_concurrently__keeps_serial_order():
+    """
+    Test that results are yielded in the original order, regardless of the completion order.
+    """
+    check_instances = list(range(8))
+
+    def run_check(index):
+        # Later checks finish first.
+        time.sleep(0.01 * (len(check_instances) - index))
+        return index
+
+    for jobs in [1, 2, 8]:
+        assert list(run_checks_concurrently(check_instances, run_check, jobs)) == (
+            check_instances
+        )
+
+
+def test__run_checks_concurrently__serializes_lanes():
+    """
+    Test that checks from the same lane never overlap and keep their relative order.
+    """
+    check_instances = [("README.md", i) for i in range(4)] + [
+        ("LICENSE", i) for i in range(4)
+    ]
+    active = {"README.md": 0, "LICENSE": 0}
+    order = {"README.md": [], "LICENSE": []}
+    lock = threading.Lock()
+
+    def run_check(check_instance):
+        lane, index = check_instance
+        with lock:
+            active[lane] += 1
+            assert active[lane] == 1
+        time.sleep(0.005)
+        with lock:
+            active[lane] -= 1
+            order[lane].append(index)
+        return check_instance
+
+    results = list(
+        run_checks_concurrently(
+            check_instances, run_check, jobs=4, lane=lambda check: check[0]
+        )
+    )
+    assert results == check_instances
+    assert order == {"README.md": [0, 1, 2, 3], "LICENSE": [0, 1, 2, 3]}
+
+
+def test__run_checks_concurrently__stop():
+    """
+    Test that no check starts once stop is set: None is yielded for each cancelled check.
+    """
+    for jobs in [1, 4]:
+        stop = threading.Event()
+
+        def run_check(index):
+            if index == 2:
+                stop.set()
+            return index
+
+        assert list(
+            run_checks_concurrently(
+                list(range(6)), run_check, jobs, lane=lambda check: 0, stop=stop
+            )
+        ) == [0, 1, 2, None, None, None]
+
+
+def test__run_checks_pipeline__fail_fast(
+    tmp_path, capsys, repo_info, beman_standard_check_config, pipeline_args
+):
+    """
+    Test that --fail-fast stops after the first failed requirement, with a partial summary.
+    """
+    (tmp_path / "README.md").write_text("# Invalid title\n")
+    (tmp_path / "LICENSE").write_text("MIT License\n")
+    repo_info["top_level"] = tmp_path
+    args = pipeline_args(fail_fast=True)
+    summary = {}
+    assert (
+        run_checks_pipeline(
+            ["directory.papers", "readme.title"],
+            args,
+            beman_standard_check_config,
+            summary,
+        )
+        == 1
+    )
+    output = capsys.readouterr().out
+
+    # readme.title (one file) runs before directory.papers (globs over the whole repository).
+    assert summary["failed"]["Requirement"] == 1
+    assert summary["passed"]["Requirement"] == 0
+    assert summary["cancelled"]["Requirement"] == 1
+    assert "1 checks cancelled" in output
+    assert "Coverage" not in output
+    assert summary["partial"]
+    assert "coverage" not in summary
+
+    # The summary record of --output ndjson does not publish the coverage either.
+    args = pipeline_args(fail_fast=True, output="ndjson")
+    run_checks_pipeline(
+        ["directory.papers", "readme.title"], args, beman_standard_check_config
+    )
+    record = json.loads(capsys.readouterr().out.splitlines()[-1])
+    assert record["record"] == "summary"
+    assert record["partial"]
+    assert "coverage" not in record
+
+
+def test__order_by_dependencies():
+    """
+    Test that prerequisites are ordered first, sharing the lane of their dependents,
+    and that prerequisites outside of the run are ignored.
+    """
+    checks = {
+        name: argparse.Namespace(name=name, depends_on=depends_on)
+        for name, depends_on in [
+            ("readme.title", ("toplevel.readme",)),
+            ("license.approved", ("toplevel.license",)),
+            ("toplevel.readme", ()),
+            ("readme.badges", ("toplevel.readme",)),
+        ]
+    }
+    ordered = order_by_dependencies(list(checks.values()))
+    assert [check.name for check in ordered] == [
+        "toplevel.readme",
+        "readme.title",
+        "license.approved",
+        "readme.badges",
+    ]
+
+    lane = dependency_lanes(ordered)
+    assert lane(checks["readme.title"]) == lane(checks["toplevel.readme"])
+    assert lane(checks["readme.badges"]) == lane(checks["toplevel.readme"])
+    assert lane(checks["license.approved"]) != lane(checks["toplevel.readme"])
+
+    checks["toplevel.readme"].depends_on = ("readme.badges",)
+    with pytest.raises(ValueError, match="Dependency cycle"):
+        order_by_dependencies(list(checks.values()))
+
+
+def test__run_checks_pipeline__failed_prerequisite(
+    tmp_path, capsys, monkeypatch, repo_info, beman_standard_check_config, pipeline_args
+):
+    """
+    Test that the dependents of a failed prerequisite fail without running.
+    """
+    repo_info["top_level"] = tmp_path
+    args = pipeline_args(verbose=True, jobs=2)
+    # No README.md: readme.title and readme.badges must not check it again.
+    monkeypatch.setattr(ReadmeTitleCheck, "pre_check", None)
+    monkeypatch.setattr(ReadmeBadgesCheck, "pre_check", None)
+
+    summary = {}
+    assert (
+        run_checks_pipeline(
+            ["readme.title", "readme.badges", "toplevel.readme"],
+            args,
+            beman_standard_check_config,
+            summary,
+        )
+        == 3
+    )
+    output = capsys.readouterr().out
+    assert output.index("[toplevel.readme]") < output.index("[readme.title]")
+    assert output.count("does not exist") == 1
+    assert output.count("Prerequisite check(s) failed: toplevel.readme.") == 2
+
+
+def test__run_checks_pipeline__result_cache(
+    tmp_path, capsys, monkeypatch, repo_info, beman_standard_check_config, pipeline_args
+):
+    """
+    Test that results are reused while the check inputs do not change.
+    """
+    (tmp_path / "README.md").write_text("# beman.exemplar: A Beman Library Exemplar\n")
+    repo_info["top_level"] = tmp_path
+    args = pipeline_args(verbose=True, cache=True)
+
+    assert run_checks_pipeline(["readme.title"], args, beman_standard_check_config) == 0
+    first_output = capsys.readouterr().out
+
+    # Cached: the check is not evaluated again, the output is the same.
+    monkeypatch.setattr(ReadmeTitleCheck, "check", None)
+    assert run_checks_pipeline(["readme.title"], args, beman_standard_check_config) == 0
+    assert capsys.readouterr().out == first_output
+
+    # The input changed: the check is evaluated again.
+    monkeypatch.undo()
+    (tmp_path / "README.md").write_text("# Invalid title\n")
+    assert run_checks_pipeline(["readme.title"], args, beman_standard_check_config) == 1
+
+
+def test__run_checks_pipeline__since(
+    tmp_path, capsys, beman_standard_check_config, pipeline_args
+):
+    """
+    Test that with --since only the checks affected by the changed paths run,
+    and that the coverage of the partial run is not reported.
+    """
+    repo_path = tmp_path / "exemplar"
+    repo_path.mkdir()
+    (repo_path / "README.md").write_text("# beman.exemplar: A Beman Library Exemplar\n")
+    (repo_path / "LICENSE").write_text("MIT License\n")
+    for args in [["init", "-b", "main"], ["add", "."], ["commit", "-m", "init"]]:
+        subprocess.run(
+            ["git", "-c", "user.name=beman", "-c", "user.email=beman@beman", *args],
+            cwd=repo_path,
+            check=True,
+            capture_output=True,
+        )
+
+    (repo_path / "README.md").write_text("# Invalid title\n")
+    (repo_path / "docs").mkdir()
+    (repo_path / "docs" / "intro.md").write_text("# Intro\n")
+
+    args = pipeline_args(repo_info=get_repo_info(repo_path), since="HEAD")
+    summary = {}
+    run_checks_pipeline(
+        ["readme.title", "license.approved", "directory.docs", "directory.papers"],
+        args,
+        beman_standard_check_config,
+        summary,
+    )
+
+    # readme.title: README.md, directory.docs / directory.papers: *.md anywhere.
+    assert summary["failed"]["Requirement"] == 1
+    assert summary["passed"]["Requirement"] == 2
+    # license.approved: LICENSE did not change.
+    assert summary["unchanged"]["Requirement"] == 1
+    assert summary["partial"]
+    assert "coverage" not in summary
+
+    output = capsys.readouterr().out
+    assert "Coverage" not in output
+    assert "Partial run (--since): 1 checks unchanged, coverage not computed." in output
+
+
+def test__run_checks_pipeline__ndjson(
+    tmp_path, capsys, repo_info, beman_standard_check_config, pipeline_args
+):
+    """
+    Test that --output ndjson writes one record per check, then one summary record (and no text).
+    """
+    (tmp_path / "README.md").write_text("# Invalid title\n")
+    (tmp_path / "LICENSE").write_text("MIT License\n")
+    repo_info["top_level"] = tmp_path
+    args = pipeline_args(jobs=2, output="ndjson")
+
+    assert (
+        run_checks_pipeline(
+            ["readme.title", "license.approved"], args, beman_standard_check_config
+        )
+        == 1
+    )
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+    checks = {record["name"]: record for record in records[:-1]}
+    assert [record["record"] for record in records] == ["check", "check", "summary"]
+    assert checks["readme.title"]["status"] == "failed"
+    assert checks["readme.title"]["type"] == "Requirement"
+    assert checks["readme.title"]["messages"][0]["level"] == "error"
+    assert checks["readme.title"]["duration_ms"] >= 0
+    assert checks["license.approved"]["status"] == "passed"
+    assert records[-1]["failed"]["Requirement"] == 1
+    assert records[-1]["coverage"]["TOTAL"] > 0
+
+
+def test__run_checks_pipeline__fix_dry_run(
+    tmp_path, capsys, repo_info, beman_standard_check_config, pipeline_args
+):
+    """
+    Test that --fix-dry-run prints the fixes as a unified diff without writing them,
+    and that --fix-inplace writes them once, atomically.
+    """
+    (tmp_path / "README.md").write_text("# Invalid title\nSome text.\n")
+    repo_info["top_level"] = tmp_path
+    args = pipeline_args(fix_dry_run=True, jobs=2, verbose=True)
+    summary = {}
+    failed_checks = run_checks_pipeline(
+        ["readme.title", "readme.badges"], args, beman_standard_check_config, summary
+    )
+    output = capsys.readouterr().out
+
+    # The files on disk are not fixed: the fixable checks still fail.
+    assert failed_checks == 2
+    assert summary["failed"]["Requirement"] == 2
+    assert summary["passed"]["Requirement"] == 0
+    assert "[readme.title] ... \033[91mfailed (fixable)" in output
+    assert (
+        "--- a/README.md\n+++ b/README.md\n@@ -1,2 +1,2 @@\n"
+        "-# Invalid title\n+# beman.exemplar: TODO Short Description\n Some text.\n"
+    ) in output
+    assert (tmp_path / "README.md").read_text() == "# Invalid title\nSome text.\n"
+
+    args.fix_dry_run = False
+    args.fix_inplace = True
+    run_checks_pipeline(["readme.title"], args, beman_standard_check_config)
+    assert "--- a/README.md" not in capsys.readouterr().out
+    assert (
+        tmp_path / "README.md"
+    ).read_text() == "# beman.exemplar: TODO Short Description\nSome text.\n"
+    assert list(tmp_path.glob(".*.tmp")) == []
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import threading
+import time
+
+import pytest
+
+from beman_tidy.lib import server
+from beman_tidy.lib.checks.beman_standard.license import LicenseApprovedCheck
+from beman_tidy.lib.checks.beman_standard.readme import ReadmeTitleCheck
+from beman_tidy.lib.server import BemanTidyServer, send_request
+from beman_tidy.lib.utils.cache import get_file_content_cache
+from beman_tidy.lib.utils.filesystem import get_repository_snapshot
+from beman_tidy.lib.watch import PollingWatcher
+
+
+@pytest.fixture
+def lint_request(tmp_path, monkeypatch, repo_info):
+    """
+    A lint request for a small repository (the git metadata is mocked).
+    """
+    (tmp_path / "README.md").write_text("# beman.exemplar: A Beman Library Exemplar\n")
+    (tmp_path / "LICENSE").write_text("MIT License\n")
+    repo_info["top_level"] = tmp_path
+    monkeypatch.setattr(server, "get_repo_info", lambda repo_path: repo_info)
+    monkeypatch.setattr(server, "create_watcher", PollingWatcher)
+    return {
+        "command": "lint",
+        "repo_path": str(tmp_path),
+        "checks": ["readme.title", "license.approved"],
+        "require_all": True,
+    }
+
+
+def test__server__lint_is_incremental(
+    tmp_path, monkeypatch, lint_request, beman_standard_check_config
+):
+    """
+    Test that warm requests evaluate only the checks affected by the changes since the previous request.
+    """
+    evaluated = []
+    check = ReadmeTitleCheck.check
+    monkeypatch.setattr(
+        ReadmeTitleCheck, "check", lambda self: evaluated.append(1) or check(self)
+    )
+    beman_tidy_server = BemanTidyServer(
+        tmp_path / "beman-tidy.sock", beman_standard_check_config
+    )
+
+    response = beman_tidy_server.handle(lint_request)
+    assert response["status"] == "ok"
+    assert response["exit_status"] == 0
+    assert [check["status"] for check in response["checks"]] == ["passed", "passed"]
+    assert len(evaluated) == 1
+
+    # license.approved is not affected: it must not run again.
+    monkeypatch.setattr(LicenseApprovedCheck, "check", None)
+    (tmp_path / "README.md").write_text("# Invalid title\n")
+    response = beman_tidy_server.handle(lint_request)
+    assert response["exit_status"] == 1
+    assert [check["status"] for check in response["checks"]] == ["failed", "passed"]
+    assert len(evaluated) == 2
+
+    # Nothing changed: nothing runs.
+    response = beman_tidy_server.handle(lint_request)
+    assert response["exit_status"] == 1
+    assert len(evaluated) == 2
+
+
+def test__server__socket(tmp_path, lint_request, beman_standard_check_config):
+    """
+    Test the protocol over the Unix domain socket: ping, lint and shutdown.
+    """
+    socket_path = tmp_path / "beman-tidy.sock"
+    beman_tidy_server = BemanTidyServer(socket_path, beman_standard_check_config)
+    thread = threading.Thread(target=beman_tidy_server.serve_forever)
+    thread.start()
+    try:
+        for _ in range(100):
+            if socket_path.exists():
+                break
+            time.sleep(0.01)
+
+        assert send_request(socket_path, {"command": "ping"}) == {
+            "status": "ok",
+            "protocol_version": server.PROTOCOL_VERSION,
+        }
+        response = send_request(socket_path, lint_request)
+        assert response["status"] == "ok"
+        assert "2 checks passed" in response["output"]
+        assert send_request(socket_path, {"command": "unknown"})["status"] == "error"
+    finally:
+        send_request(socket_path, {"command": "shutdown"})
+        thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert not socket_path.exists()
+
+
+def test__server__lint_fix_with_unstaged_changes(
+    tmp_path, lint_request, repo_info, beman_standard_check_config
+):
+    """
+    Test that a fix request for a dirty tree is answered with an error, without stopping the daemon.
+    """
+    repo_info["unstaged_changes"] = " README.md | 2 +-"
+    beman_tidy_server = BemanTidyServer(
+        tmp_path / "beman-tidy.sock", beman_standard_check_config
+    )
+
+    response = beman_tidy_server.handle({**lint_request, "fix_inplace": True})
+    assert response["status"] == "error"
+    assert "requires no unstaged changes" in response["error"]
+
+    # The daemon still answers (and did not keep the fixes of the stopped run).
+    response = beman_tidy_server.handle(lint_request)
+    assert response["status"] == "ok"
+    assert response["exit_status"] == 0
+
+
+def test__server__lint_keeps_other_repositories_warm(
+    tmp_path, monkeypatch, lint_request, repo_info, beman_standard_check_config
+):
+    """
+    Test that the cold request of a repository keeps the snapshot and the file contents of the other ones.
+    """
+    repo_infos = {}
+    for name in ["exemplar", "optional"]:
+        repo_path = tmp_path / "org" / name
+        repo_path.mkdir(parents=True)
+        (repo_path / "README.md").write_text(
+            f"# beman.{name}: A Beman Library {name.title()}\n"
+        )
+        (repo_path / "LICENSE").write_text("MIT License\n")
+        repo_infos[str(repo_path)] = {**repo_info, "top_level": repo_path, "name": name}
+    monkeypatch.setattr(
+        server, "get_repo_info", lambda repo_path: repo_infos[repo_path]
+    )
+    exemplar, optional = repo_infos
+    beman_tidy_server = BemanTidyServer(
+        tmp_path / "beman-tidy.sock", beman_standard_check_config
+    )
+
+    assert (
+        beman_tidy_server.handle({**lint_request, "repo_path": exemplar})["exit_status"]
+        == 0
+    )
+    snapshot = get_repository_snapshot(exemplar)
+
+    # Cold request for optional, then warm requests for both.
+    for repo_path in [optional, exemplar, optional]:
+        response = beman_tidy_server.handle({**lint_request, "repo_path": repo_path})
+        assert response["exit_status"] == 0
+    assert get_repository_snapshot(exemplar) is snapshot
+    assert get_repository_snapshot(optional) is not snapshot
+
+    # The file contents of exemplar are still cached.
+    hits = get_file_content_cache().hits
+    get_file_content_cache().read(f"{exemplar}/README.md")
+    assert get_file_content_cache().hits == hits + 1
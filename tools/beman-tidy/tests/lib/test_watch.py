@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import errno
+import subprocess
+
+import pytest
+
+from beman_tidy.lib import watch
+from beman_tidy.lib.checks.beman_standard.license import LicenseApprovedCheck
+from beman_tidy.lib.checks.beman_standard.readme import ReadmeTitleCheck
+from beman_tidy.lib.watch import (
+    InotifyWatcher,
+    PollingWatcher,
+    create_watcher,
+    read_changes,
+    run_watch,
+)
+
+
+def test__polling_watcher__changes(tmp_path):
+    """
+    Test that the polling watcher reports created, modified and deleted paths (and ignores .git).
+    """
+    (tmp_path / "README.md").write_text("v1")
+    (tmp_path / ".git").mkdir()
+    watcher = PollingWatcher(tmp_path)
+    assert watcher.poll() == []
+
+    (tmp_path / "README.md").write_text("v2 - modified")
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "intro.md").write_text("# Intro")
+    (tmp_path / ".git" / "index").write_text("ignored")
+    assert watcher.poll() == [
+        tmp_path / "README.md",
+        tmp_path / "docs",
+        tmp_path / "docs" / "intro.md",
+    ]
+
+    (tmp_path / "README.md").unlink()
+    assert watcher.poll() == [tmp_path / "README.md"]
+
+
+@pytest.mark.skipif(
+    not InotifyWatcher.is_available(), reason="inotify is available only on Linux"
+)
+def test__inotify_watcher__changes(tmp_path):
+    """
+    Test that the inotify watcher reports changes, including inside new directories.
+    """
+    watcher = InotifyWatcher(tmp_path)
+    try:
+        assert watcher.read(timeout=0) == []
+
+        (tmp_path / "README.md").write_text("v1")
+        assert tmp_path / "README.md" in watcher.read(timeout=1)
+
+        (tmp_path / "docs").mkdir()
+        assert tmp_path / "docs" in watcher.read(timeout=1)
+        (tmp_path / "docs" / "intro.md").write_text("# Intro")
+        assert tmp_path / "docs" / "intro.md" in watcher.read(timeout=1)
+    finally:
+        watcher.close()
+
+
+def test__polling_watcher__unwatched_directories(tmp_path):
+    """
+    Test that directories excluded by the repository config or ignored by git are not watched.
+    """
+    subprocess.run(["git", "init"], cwd=tmp_path, check=True, capture_output=True)
+    (tmp_path / ".gitignore").write_text("build/\n")
+    (tmp_path / ".beman-tidy.yml").write_text("exclude_dirs:\n  - third_party\n")
+    (tmp_path / "build").mkdir()
+    (tmp_path / "third_party").mkdir()
+    watcher = PollingWatcher(tmp_path)
+
+    (tmp_path / "build" / "CMakeCache.txt").write_text("")
+    (tmp_path / "third_party" / "lib.hpp").write_text("")
+    (tmp_path / "README.md").write_text("# README")
+    assert watcher.poll() == [tmp_path / "README.md"]
+
+    # A new ignored directory is not watched either, once created.
+    (tmp_path / "build-debug").mkdir()
+    (tmp_path / ".gitignore").write_text("build*/\n")
+    assert watcher.poll() == [tmp_path / ".gitignore"]
+    (tmp_path / "build-debug" / "CMakeCache.txt").write_text("")
+    assert watcher.poll() == []
+
+
+@pytest.mark.skipif(
+    not InotifyWatcher.is_available(), reason="inotify is available only on Linux"
+)
+def test__inotify_watcher__unwatched_directories(tmp_path):
+    """
+    Test that the inotify watcher adds no watch for the directories ignored by git.
+    """
+    repo_path = tmp_path / "exemplar"
+    repo_path.mkdir()
+    subprocess.run(["git", "init"], cwd=repo_path, check=True, capture_output=True)
+    (repo_path / ".gitignore").write_text("build/\n")
+    (repo_path / "build" / "_deps").mkdir(parents=True)
+    (repo_path / "docs").mkdir()
+    watcher = InotifyWatcher(repo_path)
+    try:
+        assert sorted(watcher._watches.values()) == [repo_path, repo_path / "docs"]
+    finally:
+        watcher.close()
+
+
+@pytest.mark.skipif(
+    not InotifyWatcher.is_available(), reason="inotify is available only on Linux"
+)
+def test__inotify_watcher__watch_failure(tmp_path, monkeypatch):
+    """
+    Test that a failed inotify watch (e.g., ENOSPC: watch limit reached) falls back to polling.
+    """
+
+    class NoWatchLibc:
+        def __init__(self, libc):
+            self.inotify_init1 = libc.inotify_init1
+
+        def inotify_add_watch(self, fd, path, mask):
+            return -1
+
+    # At startup: create_watcher() returns a polling watcher.
+    def watch_tree(self, directory):
+        raise OSError(errno.ENOSPC, "inotify_add_watch() failed")
+
+    monkeypatch.setattr(InotifyWatcher, "_watch_tree", watch_tree)
+    assert isinstance(create_watcher(tmp_path), PollingWatcher)
+    monkeypatch.undo()
+
+    # For a new directory: the whole tree is reported as changed, then polled.
+    watcher = InotifyWatcher(tmp_path)
+    watcher._libc = NoWatchLibc(watcher._libc)
+    watcher._get_errno = lambda: errno.ENOSPC
+    (tmp_path / "docs").mkdir()
+    with pytest.raises(OSError):
+        watcher.read(timeout=1)
+
+    (tmp_path / "src").mkdir()
+    watcher, changed_paths = read_changes(watcher, timeout=1)
+    assert isinstance(watcher, PollingWatcher)
+    assert changed_paths == [tmp_path]
+
+
+class FakeWatcher:
+    """
+    Reports the given batches of changes, then stops the watch loop (like Ctrl+C).
+    """
+
+    def __init__(self, batches):
+        self.batches = list(batches)
+
+    def read(self, timeout=None):
+        if not self.batches:
+            raise KeyboardInterrupt
+        return self.batches.pop(0)()
+
+    def close(self):
+        pass
+
+
+def test__run_watch__reruns_affected_checks(
+    tmp_path, capsys, monkeypatch, repo_info, beman_standard_check_config, pipeline_args
+):
+    """
+    Test that only the checks affected by a change are evaluated again.
+    """
+    (tmp_path / "README.md").write_text("# beman.exemplar: A Beman Library Exemplar\n")
+    (tmp_path / "LICENSE").write_text("MIT License\n")
+    repo_info["top_level"] = tmp_path
+    args = pipeline_args()
+
+    def change_readme():
+        # license.approved is not affected: it must not run again.
+        monkeypatch.setattr(LicenseApprovedCheck, "check", None)
+        (tmp_path / "README.md").write_text("# Invalid title\n")
+        return [tmp_path / "README.md"]
+
+    evaluated = []
+    check = ReadmeTitleCheck.check
+    monkeypatch.setattr(
+        ReadmeTitleCheck, "check", lambda self: evaluated.append(1) or check(self)
+    )
+
+    failed_checks = run_watch(
+        ["readme.title", "license.approved"],
+        args,
+        beman_standard_check_config,
+        watcher=FakeWatcher([change_readme]),
+    )
+
+    assert failed_checks == 1
+    assert len(evaluated) == 2
+    assert "1 path(s) changed" in capsys.readouterr().out
+
+
+def test__run_watch__watches_before_first_run(
+    tmp_path, monkeypatch, repo_info, beman_standard_check_config, pipeline_args
+):
+    """
+    Test that the watcher is created before the first run, so changes made while it runs are not missed.
+    """
+    (tmp_path / "README.md").write_text("# beman.exemplar: A Beman Library Exemplar\n")
+    repo_info["top_level"] = tmp_path
+    args = pipeline_args()
+
+    evaluated = []
+    check = ReadmeTitleCheck.check
+    monkeypatch.setattr(
+        ReadmeTitleCheck, "check", lambda self: evaluated.append(1) or check(self)
+    )
+
+    def create_watcher(root, tracked_only=True):
+        assert evaluated == []
+        return FakeWatcher([])
+
+    monkeypatch.setattr(watch, "create_watcher", create_watcher)
+    assert run_watch(["readme.title"], args, beman_standard_check_config) == 0
+    assert evaluated == [1]
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import os
+
+from beman_tidy.lib.utils.cache import DiskCache, FileContentCache, get_cache_dir
+
+
+def test__file_content_cache__hits(tmp_path):
+    """
+    Test that a file is read once and then served from the cache.
+    """
+    path = tmp_path / "README.md"
+    path.write_text("# beman.exemplar: A Beman Library Exemplar\n")
+
+    cache = FileContentCache()
+    for _ in range(3):
+        assert cache.read(path) == "# beman.exemplar: A Beman Library Exemplar\n"
+    assert (cache.misses, cache.hits) == (1, 2)
+
+
+def test__file_content_cache__stat_signature(tmp_path):
+    """
+    Test that a file changed on disk is read again, and that invalidate() drops the entry.
+    """
+    path = tmp_path / "README.md"
+    path.write_text("v1")
+
+    cache = FileContentCache()
+    assert cache.read(path) == "v1"
+
+    path.write_text("v2 - different size")
+    assert cache.read(path) == "v2 - different size"
+
+    # Same size and same mtime: only invalidate() can tell the difference.
+    stat = os.stat(path)
+    path.write_text("v3 - different text")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    cache.invalidate(path)
+    assert cache.read(path) == "v3 - different text"
+    assert cache.misses == 3
+
+
+def test__file_content_cache__lru_budget(tmp_path):
+    """
+    Test that the least recently used entries are evicted to stay within the byte budget.
+    """
+    paths = [tmp_path / f"file{i}.md" for i in range(3)]
+    for path in paths:
+        path.write_text("x" * 10)
+
+    cache = FileContentCache(budget=25)
+    cache.read(paths[0])
+    cache.read(paths[1])
+    cache.read(paths[0])  # file0 becomes the most recently used entry.
+    cache.read(paths[2])  # evicts file1.
+    assert cache.size == 20
+
+    cache.read(paths[0])
+    cache.read(paths[2])
+    assert cache.hits == 3
+    cache.read(paths[1])
+    assert cache.misses == 4
+
+    # Files larger than the budget are never cached.
+    large_path = tmp_path / "large.md"
+    large_path.write_text("x" * 100)
+    cache.read(large_path)
+    cache.read(large_path)
+    assert cache.size <= 25
+    assert cache.misses == 6
+
+
+def test__file_content_cache__invalidate_tree(tmp_path):
+    """
+    Test that only the files under the given directory are dropped (not those of a sibling sharing its prefix).
+    """
+    paths = [
+        tmp_path / "exemplar" / "README.md",
+        tmp_path / "exemplar-v2" / "README.md",
+    ]
+    cache = FileContentCache()
+    for path in paths:
+        path.parent.mkdir()
+        path.write_text("# README\n")
+        cache.read(path)
+
+    cache.invalidate_tree(tmp_path / "exemplar")
+    for path in paths:
+        cache.read(path)
+    assert (cache.misses, cache.hits) == (3, 1)
+
+
+def test__disk_cache__roundtrip(tmp_path, monkeypatch):
+    """
+    Test that values stored on disk are found by later runs, and that corrupted entries are misses.
+    """
+    monkeypatch.setenv("BEMAN_TIDY_CACHE_DIR", str(tmp_path))
+    assert get_cache_dir() == tmp_path
+
+    cache = DiskCache("config")
+    assert cache.get("key") is None
+    assert cache.put("key", {"readme.title": {"type": "Recommendation"}})
+    assert DiskCache("config").get("key") == {
+        "readme.title": {"type": "Recommendation"}
+    }
+
+    (tmp_path / "config" / "key.pickle").write_bytes(b"corrupted")
+    assert cache.get("key") is None
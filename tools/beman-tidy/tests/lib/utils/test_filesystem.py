@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from beman_tidy.lib.utils.filesystem import (
+    ExcludeRules,
+    RepositorySnapshot,
+    RevisionSnapshot,
+    clear_repository_snapshots,
+    get_repository_snapshot,
+)
+
+test_data_prefix = "tests/lib/checks/beman_standard/directory/data"
+repo_paths = [
+    Path(f"{test_data_prefix}/valid/repo-exemplar-v1"),
+    Path(f"{test_data_prefix}/invalid/repo-exemplar-v3"),
+    Path(f"{test_data_prefix}/invalid/repo-exemplar-v4"),
+]
+
+
+def test__repository_snapshot__matches_rglob():
+    """
+    Test that the snapshot queries return the same entries as Path.rglob().
+    """
+    for repo_path in repo_paths:
+        snapshot = RepositorySnapshot(repo_path)
+
+        assert sorted(snapshot.walk()) == sorted(repo_path.rglob("*"))
+        for pattern in ["*test*", "*.test.*", "*.cpp", "CMakeLists.txt"]:
+            assert sorted(snapshot.glob(pattern)) == sorted(repo_path.rglob(pattern))
+        for extension in [".md", ".tex", ".bst", ".pdf"]:
+            assert sorted(snapshot.find_by_extension(extension)) == sorted(
+                repo_path.rglob(f"*{extension}")
+            )
+        for subtree in ["tests", "examples", "src/beman"]:
+            assert sorted(snapshot.glob("*", subtree=repo_path / subtree)) == sorted(
+                (repo_path / subtree).rglob("*")
+            )
+
+
+def test__repository_snapshot__exists():
+    """
+    Test that the snapshot answers existence queries for files, directories and outside paths.
+    """
+    repo_path = repo_paths[0]
+    snapshot = RepositorySnapshot(repo_path)
+
+    assert snapshot.exists(repo_path)
+    assert snapshot.is_dir(repo_path / "tests/beman/exemplar")
+    assert snapshot.is_file(repo_path / "examples/dummy.cpp")
+    assert not snapshot.exists(repo_path / "docs")
+    assert not snapshot.is_dir(repo_path / "examples/dummy.cpp")
+    assert sorted(snapshot.iterdir(repo_path / "examples")) == sorted(
+        (repo_path / "examples").iterdir()
+    )
+
+    # Paths outside of the snapshot are answered from the filesystem.
+    assert snapshot.exists(Path(__file__))
+    assert not snapshot.exists(Path(__file__).parent / "missing.file")
+
+
+def test__repository_snapshot__add_file(tmp_path):
+    """
+    Test that files created during the run are visible in the snapshot.
+    """
+    snapshot = RepositorySnapshot(tmp_path)
+    assert not snapshot.exists(tmp_path / "docs/README.md")
+
+    snapshot.add_file(tmp_path / "docs/README.md")
+    assert snapshot.is_dir(tmp_path / "docs")
+    assert snapshot.is_file(tmp_path / "docs/README.md")
+    assert snapshot.find_by_extension(".md") == [tmp_path / "docs/README.md"]
+
+
+def test__repository_snapshot__shared_per_run():
+    """
+    Test that the snapshot is walked once per run and shared by all callers.
+    """
+    clear_repository_snapshots()
+    snapshot = get_repository_snapshot(repo_paths[0])
+    assert get_repository_snapshot(repo_paths[0].absolute()) is snapshot
+
+    clear_repository_snapshots()
+    assert get_repository_snapshot(repo_paths[0]) is not snapshot
+
+
+def test__repository_snapshot__refresh(tmp_path):
+    """
+    Test that refresh() updates only the changed paths - e.g., in watch mode.
+    """
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "intro.md").write_text("# Intro")
+    snapshot = RepositorySnapshot(tmp_path)
+
+    (tmp_path / "docs" / "intro.md").unlink()
+    (tmp_path / "docs" / "usage.md").write_text("# Usage")
+    (tmp_path / "papers" / "P2988").mkdir(parents=True)
+    (tmp_path / "papers" / "P2988" / "abstract.tex").write_text("")
+    for path in ["docs/intro.md", "docs/usage.md", "papers"]:
+        snapshot.refresh(tmp_path / path)
+
+    assert sorted(snapshot.walk()) == sorted(tmp_path.rglob("*"))
+    assert snapshot.find_by_extension(".md") == [tmp_path / "docs/usage.md"]
+    assert snapshot.find_by_extension(".tex") == [
+        tmp_path / "papers/P2988/abstract.tex"
+    ]
+
+    shutil.rmtree(tmp_path / "papers")
+    snapshot.refresh(tmp_path / "papers")
+    assert sorted(snapshot.walk()) == sorted(tmp_path.rglob("*"))
+    assert snapshot.find_by_extension(".tex") == []
+
+    # The root itself (e.g., lost watch events): the whole tree is read again.
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "main.cpp").write_text("")
+    snapshot.refresh(tmp_path)
+    assert sorted(snapshot.walk()) == sorted(tmp_path.rglob("*"))
+
+
+def test__repository_snapshot__tracked_only(tmp_path):
+    """
+    Test that the tracked-only snapshot lists the files git tracks or would track:
+    no .git directory, no ignored build tree, no deleted files.
+    """
+    repo_path = tmp_path / "repo"
+    (repo_path / "build" / "_deps" / "dep-src" / "tests").mkdir(parents=True)
+    (repo_path / "build" / "_deps" / "dep-src" / "tests" / "dep_test.cpp").write_text(
+        ""
+    )
+    (repo_path / ".gitignore").write_text("build/\n")
+    (repo_path / "README.md").write_text("# README")
+    (repo_path / "removed.md").write_text("")
+    subprocess.run(["git", "init", "-q", str(repo_path)], check=True)
+    subprocess.run(
+        ["git", "-C", str(repo_path), "add", ".gitignore", "README.md", "removed.md"],
+        check=True,
+    )
+    (repo_path / "removed.md").unlink()
+    (repo_path / "docs").mkdir()
+    (repo_path / "docs" / "intro.md").write_text("# Intro")
+
+    snapshot = RepositorySnapshot(repo_path)
+    assert snapshot.tracked_only
+    assert sorted(snapshot.walk()) == sorted(
+        repo_path / path
+        for path in [".gitignore", "README.md", "docs", "docs/intro.md"]
+    )
+    assert snapshot.glob("*test*") == []
+    assert not snapshot.exists(repo_path / ".git")
+
+    # Ignored paths stay out of the snapshot after a refresh.
+    (repo_path / "build" / "tests_build.cpp").write_text("")
+    (repo_path / "docs" / "usage.md").write_text("# Usage")
+    snapshot.refresh(repo_path / "build/tests_build.cpp", repo_path / "docs/usage.md")
+    assert sorted(snapshot.find_by_extension(".md")) == [
+        repo_path / "README.md",
+        repo_path / "docs/intro.md",
+        repo_path / "docs/usage.md",
+    ]
+    assert snapshot.glob("*test*") == []
+
+    # The full walk sees everything on disk.
+    snapshot = RepositorySnapshot(repo_path, tracked_only=False)
+    assert not snapshot.tracked_only
+    assert sorted(snapshot.walk()) == sorted(repo_path.rglob("*"))
+
+
+def test__exclude_rules__path_components():
+    """
+    Test that exclusion rules match whole path components, at any depth or anchored at the root.
+    """
+    exclude = ExcludeRules(["tests", "build/_deps", "/infra"])
+
+    assert exclude.excludes("tests")
+    assert exclude.excludes("src/tests")
+    assert exclude.excludes("tests/beman/exemplar")
+    assert not exclude.excludes("mytests")
+    assert not exclude.excludes("tests_data")
+
+    assert exclude.excludes("build/_deps")
+    assert exclude.excludes("out/build/_deps/dep-src")
+    assert not exclude.excludes("build")
+    assert not exclude.excludes("_deps")
+
+    assert exclude.excludes("infra/cmake")
+    assert not exclude.excludes("docs/infra")
+
+    assert not ExcludeRules()
+
+
+def test__repository_snapshot__exclude(tmp_path):
+    """
+    Test that the directories excluded by the repository config are never entered,
+    and that queries filter the directories excluded by a check.
+    """
+    for path in [
+        "third_party/lib/lib_test.cpp",
+        "generated/docs/api.md",
+        "docs/generated/intro.md",
+        "mytests/foo_test.cpp",
+        "tests/beman/exemplar/foo.test.cpp",
+    ]:
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text("")
+    (tmp_path / ".beman-tidy.yml").write_text(
+        "exclude_dirs:\n  - third_party\n  - /generated\n"
+    )
+
+    snapshot = RepositorySnapshot(tmp_path, tracked_only=False)
+    assert not snapshot.exists(tmp_path / "third_party")
+    assert not snapshot.exists(tmp_path / "generated")
+    assert snapshot.find_by_extension(".md") == [tmp_path / "docs/generated/intro.md"]
+
+    exclude = ExcludeRules(["tests", ".github"])
+    assert snapshot.glob("*test*", exclude=exclude) == [
+        tmp_path / "mytests",
+        tmp_path / "mytests/foo_test.cpp",
+    ]
+
+    # Changes in excluded directories are ignored, a config change reloads the rules.
+    (tmp_path / "third_party" / "README.md").write_text("")
+    snapshot.refresh(tmp_path / "third_party/README.md")
+    assert not snapshot.exists(tmp_path / "third_party")
+
+    (tmp_path / ".beman-tidy.yml").write_text("exclude_dirs: []\n")
+    snapshot.refresh(tmp_path / ".beman-tidy.yml")
+    assert snapshot.exists(tmp_path / "third_party/README.md")
+    assert snapshot.exists(tmp_path / "generated/docs/api.md")
+
+
+def test__revision_snapshot(tmp_path):
+    """
+    Test that the revision snapshot lists and reads the tree of a commit, not the working tree.
+    """
+    repo_path = tmp_path / "repo"
+    (repo_path / "docs").mkdir(parents=True)
+    (repo_path / "third_party" / "dep").mkdir(parents=True)
+    (repo_path / "README.md").write_text("# README\r\nv1\n")
+    (repo_path / "docs" / "intro.md").write_text("# Intro")
+    (repo_path / "third_party" / "dep" / "dep.md").write_text("")
+    (repo_path / ".beman-tidy.yml").write_text("exclude_dirs:\n  - third_party\n")
+    subprocess.run(["git", "init", "-q", str(repo_path)], check=True)
+    subprocess.run(["git", "-C", str(repo_path), "add", "."], check=True)
+    subprocess.run(
+        [
+            "git",
+            "-c",
+            "user.name=beman",
+            "-c",
+            "user.email=beman@beman",
+            "-C",
+            str(repo_path),
+            "commit",
+            "-q",
+            "-m",
+            "v1",
+        ],
+        check=True,
+    )
+    # Changes in the working tree are not part of the commit.
+    (repo_path / "README.md").write_text("# README\nv2\n")
+    (repo_path / "docs" / "intro.md").unlink()
+    (repo_path / "docs" / "usage.md").write_text("# Usage")
+
+    snapshot = RevisionSnapshot(repo_path, "HEAD")
+    assert sorted(snapshot.walk()) == sorted(
+        repo_path / path
+        for path in [".beman-tidy.yml", "README.md", "docs", "docs/intro.md"]
+    )
+    assert snapshot.is_dir(repo_path / "docs")
+    assert not snapshot.exists(repo_path / "third_party")
+    assert not snapshot.exists(repo_path / ".git")
+
+    # Text reads translate newlines, like open().read().
+    assert snapshot.read_text(repo_path / "README.md") == "# README\nv1\n"
+    assert snapshot.read_bytes(repo_path / "README.md") == b"# README\r\nv1\n"
+    assert snapshot.size(repo_path / "docs/intro.md") == len("# Intro")
+    assert snapshot.signature(repo_path / "docs")[0] == "dir"
+    assert snapshot.signature(repo_path / "docs/usage.md") == ("missing",)
+    assert snapshot.signature(repo_path / "README.md")[0] == "blob"
+    with pytest.raises(FileNotFoundError):
+        snapshot.read_text(repo_path / "docs/usage.md")
+
+    # A commit never changes.
+    snapshot.refresh(repo_path / "docs/usage.md")
+    assert not snapshot.exists(repo_path / "docs/usage.md")
+    snapshot.close()
+
+    clear_repository_snapshots()
+    assert isinstance(
+        get_repository_snapshot(repo_path, commit="HEAD"), RevisionSnapshot
+    )
+    clear_repository_snapshots()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import subprocess
+
+import pytest
+
+from beman_tidy.lib.utils.git import (
+    GitObjectReader,
+    RepositoryInfo,
+    get_beman_standard_config_path,
+    get_repo_info,
+    list_git_tree,
+    load_beman_standard_config,
+)
+
+
+@pytest.fixture
+def git_repo(tmp_path):
+    """
+    Create a git repository named "exemplar", with one commit on main.
+    """
+    repo_path = tmp_path / "exemplar"
+    repo_path.mkdir()
+
+    def git(*args):
+        subprocess.run(
+            ["git", "-c", "user.name=beman", "-c", "user.email=beman@beman", *args],
+            cwd=repo_path,
+            check=True,
+            capture_output=True,
+        )
+
+    git("init", "-b", "main")
+    (repo_path / "README.md").write_text("# beman.exemplar: A Beman Library Exemplar\n")
+    git("add", "README.md")
+    git("commit", "-m", "init")
+    return repo_path
+
+
+def test__get_repo_info__lazy_fields(git_repo):
+    """
+    Test that the repository fields are computed only when read, and memoized.
+    """
+    repo_info = get_repo_info(git_repo / "README.md")
+
+    assert repo_info["name"] == "exemplar"
+    assert repo_info["top_level"].resolve() == git_repo.resolve()
+    assert "unstaged_changes" in repo_info
+    assert set(repo_info.costs) == {"top_level", "name"}
+
+    assert repo_info["current_branch"] == "main"
+    assert repo_info["unstaged_changes"] == ""
+    assert set(repo_info.costs) == {
+        "top_level",
+        "name",
+        "current_branch",
+        "unstaged_changes",
+    }
+
+    (git_repo / "README.md").write_text("# beman.exemplar: Changed\n")
+    # Memoized: the value computed on the first read is kept for the whole run.
+    assert repo_info["unstaged_changes"] == ""
+
+
+def test__repository_info__validate(git_repo, tmp_path, monkeypatch):
+    """
+    Test that validate() accepts a repository, found natively or by GitPython, and rejects other paths.
+    """
+    assert RepositoryInfo(git_repo).validate()
+    assert not RepositoryInfo(tmp_path).validate()
+
+    # e.g., unsupported .git layout: GitPython opens the repository.
+    monkeypatch.setattr("beman_tidy.lib.utils.git.GitDirectory.find", lambda path: None)
+    assert RepositoryInfo(git_repo).validate()
+    assert not RepositoryInfo(tmp_path).validate()
+
+
+def test__get_repo_info__missing_fields(git_repo):
+    """
+    Test that fields that cannot be computed are None (e.g., no origin remote).
+    """
+    repo_info = get_repo_info(git_repo)
+
+    assert repo_info["remote_url"] is None
+    assert repo_info["default_branch"] is None
+    with pytest.raises(KeyError):
+        repo_info["unknown_field"]
+
+    # Fields can be overridden, like in a dictionary.
+    repo_info["default_branch"] = "main"
+    assert repo_info["default_branch"] == "main"
+
+
+def test__get_repo_info__rev_bare_mirror(git_repo, tmp_path):
+    """
+    Test that a bare mirror can be inspected at a revision, read from the object database.
+    """
+    commit_hash = subprocess.run(
+        ["git", "-C", str(git_repo), "rev-parse", "HEAD"],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+    mirror_path = tmp_path / "mirrors" / "exemplar.git"
+    subprocess.run(
+        ["git", "clone", "-q", "--mirror", str(git_repo), str(mirror_path)],
+        check=True,
+    )
+
+    repo_info = get_repo_info(mirror_path, "main")
+    assert repo_info["name"] == "exemplar"
+    assert repo_info["top_level"].resolve() == mirror_path.resolve()
+    assert repo_info["commit_hash"] == commit_hash
+    assert repo_info["default_branch"] == "main"
+
+    tree = list_git_tree(mirror_path, commit_hash)
+    assert [(path, object_type) for path, object_type, _, _ in tree] == [
+        ("README.md", "blob")
+    ]
+    _, _, object_id, size = tree[0]
+
+    reader = GitObjectReader(mirror_path)
+    content = reader.read(object_id)
+    assert content == b"# beman.exemplar: A Beman Library Exemplar\n"
+    assert len(content) == size
+    # The same process serves all the reads.
+    assert reader.read(object_id) == content
+    with pytest.raises(FileNotFoundError):
+        reader.read("0" * 40)
+    reader.close()
+
+    with pytest.raises(SystemExit):
+        get_repo_info(mirror_path, "no-such-branch")
+    with pytest.raises(SystemExit):
+        # Bare repositories are only supported at a revision.
+        get_repo_info(mirror_path)
+
+
+def test__load_beman_standard_config__cached(tmp_path, monkeypatch):
+    """
+    Test that the compiled config is cached on disk, keyed by the content of the YAML file.
+    """
+    monkeypatch.setenv("BEMAN_TIDY_CACHE_DIR", str(tmp_path / "cache"))
+    config_path = tmp_path / ".beman-standard.yml"
+    config_path.write_text(get_beman_standard_config_path().read_text())
+
+    config = load_beman_standard_config(config_path)
+    assert len(list((tmp_path / "cache" / "config").iterdir())) == 1
+
+    # Served from the cache - e.g., the matchers are already compiled.
+    monkeypatch.setattr("yaml.safe_load", None)
+    cached_config = load_beman_standard_config(config_path)
+    assert cached_config.keys() == config.keys()
+    assert cached_config["readme.badges"]["matcher"].count(
+        config["readme.badges"]["values"][0]["library_status"][0]
+    ) == config["readme.badges"]["matcher"].count(
+        config["readme.badges"]["values"][0]["library_status"][0]
+    )
+
+    # A different content is a different key.
+    config_path.write_text("readme.title:\n    - type: Recommendation\n")
+    with pytest.raises(TypeError):
+        load_beman_standard_config(config_path)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import subprocess
+
+import pytest
+
+from beman_tidy.lib.utils.gitdir import GitDirectory, parse_git_config
+
+
+def run_git(repo_path, *args):
+    return subprocess.run(
+        ["git", "-c", "user.name=beman", "-c", "user.email=beman@beman", *args],
+        cwd=repo_path,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+
+
+@pytest.fixture
+def git_clone(tmp_path):
+    """
+    Create an "upstream" repository and clone it as "exemplar" (with origin/HEAD -> origin/main).
+    """
+    upstream = tmp_path / "upstream"
+    upstream.mkdir()
+    run_git(upstream, "init", "-b", "main")
+    (upstream / "README.md").write_text("# beman.exemplar: A Beman Library Exemplar\n")
+    run_git(upstream, "add", "README.md")
+    run_git(upstream, "commit", "-m", "init")
+
+    run_git(tmp_path, "clone", "-q", str(upstream), "exemplar")
+    return tmp_path / "exemplar"
+
+
+def assert_same_as_git(git_directory, repo_path):
+    """
+    Check the native reader against the git CLI.
+    """
+    assert git_directory.commit_hash() == run_git(repo_path, "rev-parse", "HEAD")
+    assert git_directory.current_branch() == run_git(
+        repo_path, "branch", "--show-current"
+    )
+    assert git_directory.remote_url() == run_git(
+        repo_path, "config", "remote.origin.url"
+    )
+    assert (
+        git_directory.default_branch()
+        == run_git(repo_path, "symbolic-ref", "refs/remotes/origin/HEAD").split("/")[-1]
+    )
+
+
+def test__git_directory__loose_and_packed_refs(git_clone):
+    """
+    Test that HEAD, loose refs, packed-refs and remotes are read like git does.
+    """
+    git_directory = GitDirectory.find(git_clone / "README.md")
+    assert git_directory.top_level == git_clone
+    assert_same_as_git(git_directory, git_clone)
+
+    run_git(git_clone, "checkout", "-q", "-b", "feature/new")
+    run_git(git_clone, "commit", "-q", "--allow-empty", "-m", "feature")
+    assert_same_as_git(GitDirectory.find(git_clone), git_clone)
+
+    run_git(git_clone, "pack-refs", "--all")
+    assert not (git_clone / ".git/refs/heads/feature/new").exists()
+    assert_same_as_git(GitDirectory.find(git_clone), git_clone)
+
+
+def test__git_directory__detached_head_and_worktree(git_clone, tmp_path):
+    """
+    Test detached HEADs and linked worktrees (.git file).
+    """
+    run_git(git_clone, "checkout", "-q", "--detach")
+    git_directory = GitDirectory.find(git_clone)
+    assert git_directory.current_branch() is None
+    assert git_directory.commit_hash() == run_git(git_clone, "rev-parse", "HEAD")
+
+    worktree = tmp_path / "worktree"
+    run_git(git_clone, "worktree", "add", "-q", "-b", "wt", str(worktree))
+    git_directory = GitDirectory.find(worktree)
+    assert git_directory.top_level == worktree
+    assert git_directory.common_dir == (git_clone / ".git").resolve()
+    assert_same_as_git(git_directory, worktree)
+
+
+def test__git_directory__unsupported(git_clone, tmp_path):
+    """
+    Test that unknown directories and unsupported layouts are not read natively.
+    """
+    assert GitDirectory.find(tmp_path) is None
+
+    run_git(git_clone, "config", "include.path", "extra.config")
+    assert GitDirectory.find(git_clone) is None
+
+
+def test__parse_git_config():
+    """
+    Test the git config parser on sections, subsections, quotes and comments.
+    """
+    config = parse_git_config(
+        "\n".join(
+            [
+                "# comment",
+                "[core]",
+                "\tbare = false ; comment",
+                "\tfilemode",
+                '[remote "origin"]',
+                '\turl = "https://github.com/bemanproject/exemplar.git" # comment',
+                "[branch.main]",
+                "\tremote = origin",
+            ]
+        )
+    )
+
+    assert config["core"] == {"bare": "false", "filemode": "true"}
+    assert (
+        config['remote "origin"']["url"]
+        == "https://github.com/bemanproject/exemplar.git"
+    )
+    assert config['branch "main"'] == {"remote": "origin"}
+    assert "include" not in config
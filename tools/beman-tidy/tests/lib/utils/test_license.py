@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+from pathlib import Path
+
+from beman_tidy.lib.utils.git import get_beman_recommendated_license_path
+from beman_tidy.lib.utils.license import (
+    classify_license,
+    find_licenses,
+    is_beman_recommended_license,
+)
+
+test_data_prefix = "tests/lib/checks/beman_standard/license/data"
+valid_prefix = f"{test_data_prefix}/valid"
+
+
+def test__classify_license__valid():
+    """
+    Test that each approved license is classified with its family and evidence.
+    """
+    expected_families = {
+        f"{valid_prefix}/valid-LICENSE-v1": "apache_v2_llvm",
+        f"{valid_prefix}/valid-LICENSE-v2": "boost_v1",
+        f"{valid_prefix}/valid-LICENSE-v3": "mit",
+    }
+    for path, family in expected_families.items():
+        license = classify_license(Path(path).read_text())
+        assert license is not None and license.family == family, path
+        assert all(len(phrases) > 0 for phrases in license.evidence.values())
+
+    license = classify_license(get_beman_recommendated_license_path().read_text())
+    assert license.family == "apache_v2_llvm"
+    assert "llvm exceptions" in license.evidence["llvm_exceptions"]
+
+
+def test__classify_license__variations():
+    """
+    Test the case-insensitive and whitespace-insensitive matching of license phrases.
+    """
+    assert classify_license("apache LICENSE v2.0 with llvm exceptions").family == (
+        "apache_v2_llvm"
+    )
+    assert classify_license("Boost Software\n  License Version 1.0").family == (
+        "boost_v1"
+    )
+    assert classify_license("Licensed under the mit license.").family == "mit"
+
+    # All requirements of a family must be found.
+    assert classify_license("Apache License, Version 2.0") is None
+    assert classify_license("Boost Software License") is None
+    assert classify_license("GNU General Public License v3.0") is None
+    assert classify_license("") is None
+
+    # All families are reported, in priority order.
+    assert [
+        license.family
+        for license in find_licenses(
+            "MIT License or Apache License 2.0 with LLVM Exceptions"
+        )
+    ] == ["apache_v2_llvm", "mit"]
+
+
+def test__is_beman_recommended_license__valid(tmp_path):
+    """
+    Test the comparison with the precomputed digest of the Beman recommended LICENSE file.
+    """
+    reference = get_beman_recommendated_license_path().read_bytes()
+    assert is_beman_recommended_license(get_beman_recommendated_license_path())
+
+    same_size = tmp_path / "LICENSE-same-size"
+    same_size.write_bytes(reference[:-1] + b"X")
+    assert not is_beman_recommended_license(same_size)
+
+    assert not is_beman_recommended_license(f"{valid_prefix}/valid-LICENSE-v3")
+    assert not is_beman_recommended_license(tmp_path / "missing")
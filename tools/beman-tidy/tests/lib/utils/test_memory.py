@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+from beman_tidy.lib.pipeline import run_checks_pipeline
+from beman_tidy.lib.utils import memory
+from beman_tidy.lib.utils.memory import MemoryProfiler
+
+
+def test__memory_profiler__peak_and_retained():
+    """
+    Test that the peak, the retained memory and the allocation sites are measured.
+    """
+    memory_profiler = MemoryProfiler()
+    memory_profiler.start()
+    try:
+        retained = []
+        with memory_profiler.measure("readme.title"):
+            temporary = bytearray(1024 * 1024)
+            del temporary
+            retained.append(bytearray(64 * 1024))
+    finally:
+        memory_profiler.stop()
+
+    (row,) = memory_profiler.report()
+    assert row["name"] == "readme.title"
+    assert row["peak_bytes"] >= 1024 * 1024
+    assert 64 * 1024 <= row["retained_bytes"] < 1024 * 1024
+    assert row["sites"][0]["site"].startswith(__file__)
+
+
+def test__memory_profiler__sites_after_freed_memory(monkeypatch):
+    """
+    Test that memory freed by a check does not hide the sites retaining memory.
+    """
+    monkeypatch.setattr(memory, "MEMORY_PROFILE_TOP_SITES", 1)
+    memory_profiler = MemoryProfiler()
+    memory_profiler.start()
+    try:
+        freed = [bytearray(1024 * 1024)]
+        retained = []
+        with memory_profiler.measure("readme.title"):
+            freed.clear()
+            retained.append(bytearray(64 * 1024))
+    finally:
+        memory_profiler.stop()
+
+    (row,) = memory_profiler.report()
+    assert len(row["sites"]) == 1
+    assert row["sites"][0]["bytes"] >= 64 * 1024
+
+
+def test__run_checks_pipeline__memory_profile(
+    tmp_path, capsys, repo_info, beman_standard_check_config, pipeline_args
+):
+    """
+    Test that --memory-profile prints the memory table after the summary.
+    """
+    (tmp_path / "README.md").write_text("# beman.exemplar: A Beman Library Exemplar\n")
+    repo_info["top_level"] = tmp_path
+    args = pipeline_args(jobs=4, memory_profile=True)
+
+    run_checks_pipeline(
+        ["readme.title", "license.approved"], args, beman_standard_check_config
+    )
+    output = capsys.readouterr().out
+
+    assert output.index("Coverage          TOTAL") < output.index("Peak KiB")
+    assert "Top allocation sites:" in output
+    assert "readme.title" in output
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import os
+
+import pytest
+
+from beman_tidy.lib.utils import overlay
+from beman_tidy.lib.utils.filesystem import clear_repository_snapshots
+from beman_tidy.lib.utils.overlay import FixOverlay, write_file_atomically
+
+
+@pytest.fixture
+def repo_path(tmp_path):
+    """
+    A plain directory (no git), with a fresh snapshot.
+    """
+    clear_repository_snapshots()
+    (tmp_path / "README.md").write_text("# Title\nline 1\nline 2")
+    (tmp_path / "LICENSE").write_text("License\n")
+    yield tmp_path
+    clear_repository_snapshots()
+
+
+def test__fix_overlay__edits_and_diff(repo_path):
+    """
+    Test that edits are applied on top of each other in memory, and reported as a unified diff.
+    """
+    fix_overlay = FixOverlay(repo_path)
+    assert fix_overlay.read(repo_path / "README.md") is None
+
+    fix_overlay.edit(repo_path / "README.md", lambda content: content.upper())
+    fix_overlay.edit(
+        repo_path / "README.md", lambda content: content.replace("TITLE", "Title")
+    )
+    fix_overlay.edit(repo_path / "docs/new.md", lambda content: content + "new\n")
+    fix_overlay.edit(repo_path / "LICENSE", lambda content: content)
+
+    assert repo_path / "README.md" in fix_overlay
+    assert fix_overlay.read(repo_path / "README.md") == "# Title\nLINE 1\nLINE 2"
+    # Nothing is written to disk.
+    assert (repo_path / "README.md").read_text() == "# Title\nline 1\nline 2"
+    assert not (repo_path / "docs").exists()
+
+    # Unchanged files are not part of the diff.
+    assert fix_overlay.diff() == (
+        "--- a/README.md\n"
+        "+++ b/README.md\n"
+        "@@ -1,3 +1,3 @@\n"
+        " # Title\n"
+        "-line 1\n"
+        "-line 2\n"
+        "\\ No newline at end of file\n"
+        "+LINE 1\n"
+        "+LINE 2\n"
+        "\\ No newline at end of file\n"
+        "--- /dev/null\n"
+        "+++ b/docs/new.md\n"
+        "@@ -0,0 +1 @@\n"
+        "+new\n"
+    )
+
+
+def test__fix_overlay__flush(repo_path, monkeypatch):
+    """
+    Test that the edited files are written all at once (with their permissions), or not at all.
+    """
+    os.chmod(repo_path / "README.md", 0o755)
+    fix_overlay = FixOverlay(repo_path)
+    fix_overlay.edit(repo_path / "README.md", lambda content: content + "\nline 3")
+    fix_overlay.edit(repo_path / "LICENSE", lambda content: "New license\n")
+
+    # A failed write leaves all the files unchanged, without temporary files.
+    write_temporary_file = overlay.write_temporary_file
+    written = []
+
+    def failing_write_temporary_file(path, content):
+        if written:
+            raise OSError("No space left on device")
+        written.append(path)
+        return write_temporary_file(path, content)
+
+    monkeypatch.setattr(overlay, "write_temporary_file", failing_write_temporary_file)
+    with pytest.raises(OSError):
+        fix_overlay.flush()
+    assert (repo_path / "LICENSE").read_text() == "License\n"
+    assert (repo_path / "README.md").read_text() == "# Title\nline 1\nline 2"
+    assert list(repo_path.glob(".*.tmp")) == []
+
+    monkeypatch.setattr(overlay, "write_temporary_file", write_temporary_file)
+    assert fix_overlay.flush() == [
+        str(repo_path / "LICENSE"),
+        str(repo_path / "README.md"),
+    ]
+    assert (repo_path / "LICENSE").read_text() == "New license\n"
+    assert (repo_path / "README.md").read_text() == "# Title\nline 1\nline 2\nline 3"
+    assert os.stat(repo_path / "README.md").st_mode & 0o777 == 0o755
+    assert list(repo_path.glob(".*.tmp")) == []
+
+
+def test__write_file_atomically(tmp_path):
+    """
+    Test that files are replaced (or created) without leaving temporary files.
+    """
+    write_file_atomically(tmp_path / "README.md", "# Title\n")
+    write_file_atomically(tmp_path / "README.md", "# New title\n")
+    assert (tmp_path / "README.md").read_text() == "# New title\n"
+    assert list(tmp_path.glob(".*.tmp")) == []
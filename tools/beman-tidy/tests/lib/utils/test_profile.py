@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import json
+
+from beman_tidy.lib.pipeline import run_checks_pipeline
+from beman_tidy.lib.utils.profile import (
+    PROFILE_PIPELINE,
+    Profiler,
+    disable_profiler,
+    disable_tracer,
+    enable_profiler,
+    enable_tracer,
+)
+
+
+def test__profiler__phases_and_counters():
+    """
+    Test that the work is attributed to the current check, and nested phases are counted once.
+    """
+    profiler = Profiler()
+    with profiler.phase("readme.title", "pre_check"):
+        with profiler.phase("readme.title", "should_skip"):
+            profiler.count("opens")
+        profiler.count("bytes_read", 42)
+    profiler.count("dirs_walked", 3)
+
+    rows = {row["name"]: row for row in profiler.report()}
+    assert rows["readme.title"]["opens"] == 1
+    assert rows["readme.title"]["bytes_read"] == 42
+    assert rows["readme.title"]["pre_check_ms"] > 0
+    assert rows["readme.title"]["should_skip_ms"] == 0
+    assert rows[PROFILE_PIPELINE]["dirs_walked"] == 3
+
+
+def test__profiler__check_hooks(
+    tmp_path, repo_info, beman_standard_check_config, pipeline_args
+):
+    """
+    Test that the phases and the I/O of the checks are measured, without any change in the checks.
+    """
+    repo_path = tmp_path / "exemplar"
+    (repo_path / "docs").mkdir(parents=True)
+    (repo_path / "README.md").write_text("# beman.exemplar: A Beman Library Exemplar\n")
+    repo_info["top_level"] = repo_path
+    args = pipeline_args()
+
+    profiler = enable_profiler()
+    try:
+        run_checks_pipeline(["readme.title"], args, beman_standard_check_config)
+    finally:
+        disable_profiler()
+
+    rows = {row["name"]: row for row in profiler.report()}
+    assert rows["readme.title"]["check_ms"] > 0
+    assert rows["readme.title"]["opens"] == 1
+    assert rows["readme.title"]["bytes_read"] == len(
+        "# beman.exemplar: A Beman Library Exemplar\n"
+    )
+    assert rows[PROFILE_PIPELINE]["dirs_walked"] == 2
+
+
+def test__run_checks_pipeline__profile(
+    tmp_path, capsys, repo_info, beman_standard_check_config, pipeline_args
+):
+    """
+    Test that --profile prints the cost table after the summary.
+    """
+    (tmp_path / "README.md").write_text("# beman.exemplar: A Beman Library Exemplar\n")
+    repo_info["top_level"] = tmp_path
+    args = pipeline_args(profile=True)
+
+    run_checks_pipeline(["readme.title"], args, beman_standard_check_config)
+    output = capsys.readouterr().out
+
+    assert output.index("Coverage          TOTAL") < output.index("Wall ms")
+    assert "readme.title" in output
+
+
+def test__tracer__chrome_trace(
+    tmp_path, repo_info, beman_standard_check_config, pipeline_args
+):
+    """
+    Test that the trace has spans for the walk and the check phases, with one lane per worker.
+    """
+    repo_path = tmp_path / "exemplar"
+    repo_path.mkdir()
+    (repo_path / "README.md").write_text("# beman.exemplar: A Beman Library Exemplar\n")
+    repo_info["top_level"] = repo_path
+    args = pipeline_args(jobs=2)
+
+    tracer = enable_tracer()
+    try:
+        run_checks_pipeline(
+            ["readme.title", "license.approved"], args, beman_standard_check_config
+        )
+    finally:
+        disable_tracer()
+    tracer.write(tmp_path / "trace.json")
+
+    events = json.loads((tmp_path / "trace.json").read_text())["traceEvents"]
+    spans = {event["name"]: event for event in events if event["ph"] == "X"}
+    assert spans["walk"]["cat"] == "filesystem"
+    assert spans["readme.title.check"]["cat"] == "check"
+    assert spans["run_checks_pipeline"]["dur"] >= spans["readme.title"]["dur"]
+    # The pipeline runs on the main thread, the checks on the workers.
+    assert spans["readme.title"]["tid"] != spans["run_checks_pipeline"]["tid"]
+    assert len([event for event in events if event["ph"] == "M"]) >= 2
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import random
+
+from beman_tidy.lib.utils.string import LiteralMatcher
+
+
+def test__literal_matcher__overlapping_literals():
+    """
+    Test that overlapping literals (prefixes, suffixes, nested) are all found in one pass.
+    """
+    matcher = LiteralMatcher(
+        {"words": ["he", "she", "his", "hers"], "letters": ["s", "xyz"]}
+    )
+
+    assert matcher.find("ushers") == {
+        ("words", "he"),
+        ("words", "she"),
+        ("words", "hers"),
+        ("letters", "s"),
+    }
+    assert matcher.count("ushers xyz") == {"words": 3, "letters": 2}
+    assert matcher.count("") == {"words": 0, "letters": 0}
+
+
+def test__literal_matcher__from_values(beman_standard_check_config):
+    """
+    Test that the matchers compiled with the Beman Standard config count badges and statuses by category.
+    """
+    badges_config = beman_standard_check_config["readme.badges"]
+    badges = {
+        category: literals
+        for value in badges_config["values"]
+        for category, literals in value.items()
+    }
+    content = (
+        f"# Title\n\n{badges['library_status'][1]} {badges['standard_target'][0]}\n"
+    )
+    assert badges_config["matcher"].count(content) == {
+        "library_status": 1,
+        "standard_target": 1,
+    }
+
+    statuses_config = beman_standard_check_config["readme.library_status"]
+    content = "\n".join(statuses_config["values"][:2])
+    assert statuses_config["matcher"].count(content) == {"values": 2}
+
+
+def test__literal_matcher__same_as_naive_search():
+    """
+    Test that the matcher finds exactly the same literals as one search per literal.
+    """
+    rng = random.Random(42)
+    alphabet = "ab!*[]()"
+    for _ in range(200):
+        literals = {
+            "x": [
+                "".join(rng.choices(alphabet, k=rng.randint(1, 4))) for _ in range(4)
+            ],
+            "y": [
+                "".join(rng.choices(alphabet, k=rng.randint(1, 4))) for _ in range(4)
+            ],
+        }
+        text = "".join(rng.choices(alphabet + "cd", k=rng.randint(0, 40)))
+
+        expected = {
+            (category, literal)
+            for category, category_literals in literals.items()
+            for literal in category_literals
+            if literal in text
+        }
+        assert LiteralMatcher(literals).find(text) == expected
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import copy
+
+from benchmarks.compare import compare_results
+from benchmarks.generator import generate_layout, generate_repository
+from benchmarks.runner import run_benchmarks
+
+
+def test__generate_layout__deterministic():
+    """
+    Test that the generated layout is deterministic and Beman-shaped.
+    """
+    layout = generate_layout(1000)
+    assert layout == generate_layout(1000)
+    assert layout != generate_layout(1000, seed=1)
+    assert len(layout) >= 1000
+    assert any(path.startswith("build/_deps/") for path in layout)
+    assert any(path.startswith("infra/") for path in layout)
+    assert len([path for path in layout if "test" in path]) >= 150
+
+
+def test__run_benchmarks__small_scale(tmp_path):
+    """
+    Test the benchmarks end to end on a small repository, then the regression report.
+    """
+    repo_path = generate_repository(tmp_path / "200", 200)
+    assert (repo_path / ".git").is_dir()
+    assert (repo_path / "README.md").read_text().startswith("# beman.exemplar: ")
+
+    results = run_benchmarks(["200"], tmp_path, repeat=1, log=lambda msg: None)
+    timings = results["scales"]["200"]
+    assert timings["files"] == 200
+    assert timings["run_checks_pipeline"] > 0
+    assert "readme.title" in timings["checks"]
+
+    assert compare_results(results, results) == []
+    slower = copy.deepcopy(results)
+    slower["scales"]["200"]["run_checks_pipeline"] += 1
+    (regression,) = compare_results(results, slower)
+    assert regression.name == "run_checks_pipeline"
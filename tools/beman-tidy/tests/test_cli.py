@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+
+def run_python(code):
+    """
+    Run the code in a fresh interpreter (cold imports) and return its JSON output.
+    """
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=Path(__file__).parent.parent,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(result.stdout)
+
+
+def test__cli__startup_imports():
+    """
+    Test that importing the CLI is cheap: no heavy dependency and no check module is imported.
+    """
+    code = """
+import json, sys
+import beman_tidy.cli
+print(json.dumps({"modules": list(sys.modules)}))
+"""
+    modules = set(run_python(code)["modules"])
+
+    assert "git" not in modules
+    assert "yaml" not in modules
+    assert not [
+        m for m in modules if m.startswith("beman_tidy.lib.checks.beman_standard.")
+    ]
+
+
+def test__cli__imports_only_selected_checks():
+    """
+    Test that only the modules of the selected checks are imported.
+    """
+    code = """
+import json, sys
+from beman_tidy.lib.checks.system.registry import get_beman_standard_check_by_name
+get_beman_standard_check_by_name("library.name")
+print(json.dumps({"modules": list(sys.modules)}))
+"""
+    modules = set(run_python(code)["modules"])
+
+    assert "beman_tidy.lib.checks.beman_standard.general" in modules
+    assert "beman_tidy.lib.checks.beman_standard.readme" not in modules
+    assert "beman_tidy.lib.checks.beman_standard.directory" not in modules
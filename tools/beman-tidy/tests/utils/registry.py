@@ -86,9 +86,9 @@ def find_filename_for_check(check_name):
         )
         return None
 
-    # Find @register_beman_standard_check("{check_name}") inside the file
+    # Find @register_beman_standard_check("{check_name}"[, depends_on=...]) inside the file
     for file in beman_standard_lib_dir.glob("*.py"):
-        regex = r"@register_beman_standard_check\(\"{check_name}\"\)".format(
+        regex = r"@register_beman_standard_check\(\s*\"{check_name}\"[,)]".format(
             check_name=check_name
         )
         with open(file, "r") as f: